@@ -3,9 +3,9 @@
 QuestionGenerator 배치 생성 테스트 스크립트
 """
 
+import asyncio
 import sys
 import os
-import json
 from pathlib import Path
 
 # 현재 디렉토리를 Python 경로에 추가
@@ -13,14 +13,52 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, parent_dir)
 
-from unittest.mock import Mock
-from src.models.question_generator import QuestionGenerator
-from src.models.llm_client import LLMClient
-from src.rag.retriever import RAGRetriever
+from types import MappingProxyType
+from unittest.mock import AsyncMock, Mock
+
+
+# 배치 생성 데모용 LLM 응답 (모듈 로드 시 한 번만 생성, 읽기 전용)
+_SAMPLE_RESPONSES = tuple(MappingProxyType(d) for d in [
+    {
+        "question": "이차함수 y = x² - 4x + 3에서 꼭짓점의 x좌표는?",
+        "options": ["1", "2", "3", "4", "-2"],
+        "correct_answer": 2,
+        "explanation": "이차함수의 꼭짓점의 x좌표는 -b/2a로 구할 수 있습니다. -(-4)/(2×1) = 2",
+        "hint": "이차함수의 꼭짓점 공식 x = -b/2a를 사용하세요.",
+        "difficulty": "medium",
+        "subject": "수학",
+        "unit": "이차함수"
+    },
+    {
+        "question": "이차함수 y = 2x² + 8x + 6의 최솟값은?",
+        "options": ["-2", "-4", "2", "6", "0"],
+        "correct_answer": 1,
+        "explanation": "완전제곱식으로 만들면 y = 2(x+2)² - 2이므로 최솟값은 -2입니다.",
+        "hint": "완전제곱식으로 변형해보세요.",
+        "difficulty": "medium",
+        "subject": "수학",
+        "unit": "이차함수"
+    },
+    {
+        "question": "포물선 y = -x² + 6x - 5의 대칭축의 방정식은?",
+        "options": ["x = 2", "x = 3", "x = -3", "x = 5", "x = 1"],
+        "correct_answer": 2,
+        "explanation": "대칭축의 방정식은 x = -b/2a = -6/(2×(-1)) = 3입니다.",
+        "hint": "대칭축은 x = -b/2a 공식으로 구할 수 있습니다.",
+        "difficulty": "medium",
+        "subject": "수학",
+        "unit": "이차함수"
+    }
+])
 
 
 def test_batch_generation():
     """배치 문제 생성 테스트"""
+    # openai/chromadb 등을 끌어오는 무거운 모듈은 실제로 사용할 때만 import
+    from src.models.question_generator import QuestionGenerator
+    from src.models.llm_client import LLMClient
+    from src.rag.retriever import RAGRetriever
+
     print("🔄 배치 문제 생성 테스트 시작...")
     
     # Mock 객체들 생성
@@ -39,53 +77,19 @@ def test_batch_generation():
         "포물선의 꼭짓점과 대칭축을 구할 수 있습니다."
     ]
     
-    # 다양한 문제 응답 준비
-    sample_responses = [
-        {
-            "question": "이차함수 y = x² - 4x + 3에서 꼭짓점의 x좌표는?",
-            "options": ["1", "2", "3", "4", "-2"],
-            "correct_answer": 2,
-            "explanation": "이차함수의 꼭짓점의 x좌표는 -b/2a로 구할 수 있습니다. -(-4)/(2×1) = 2",
-            "hint": "이차함수의 꼭짓점 공식 x = -b/2a를 사용하세요.",
-            "difficulty": "medium",
-            "subject": "수학",
-            "unit": "이차함수"
-        },
-        {
-            "question": "이차함수 y = 2x² + 8x + 6의 최솟값은?",
-            "options": ["-2", "-4", "2", "6", "0"],
-            "correct_answer": 1,
-            "explanation": "완전제곱식으로 만들면 y = 2(x+2)² - 2이므로 최솟값은 -2입니다.",
-            "hint": "완전제곱식으로 변형해보세요.",
-            "difficulty": "medium",
-            "subject": "수학",
-            "unit": "이차함수"
-        },
-        {
-            "question": "포물선 y = -x² + 6x - 5의 대칭축의 방정식은?",
-            "options": ["x = 2", "x = 3", "x = -3", "x = 5", "x = 1"],
-            "correct_answer": 2,
-            "explanation": "대칭축의 방정식은 x = -b/2a = -6/(2×(-1)) = 3입니다.",
-            "hint": "대칭축은 x = -b/2a 공식으로 구할 수 있습니다.",
-            "difficulty": "medium",
-            "subject": "수학",
-            "unit": "이차함수"
-        }
-    ]
-    
-    # Mock에서 순차적으로 다른 응답 반환하도록 설정
-    mock_llm_client.generate_structured_response.side_effect = sample_responses
+    # Mock에서 순차적으로 다른 응답 반환하도록 설정 (비동기 배치 경로)
+    mock_llm_client.generate_structured_response_async = AsyncMock(side_effect=iter(_SAMPLE_RESPONSES))
     
     print(f"📝 3개의 문제를 배치 생성합니다...")
     
     # 배치 문제 생성
     try:
-        results = generator.generate_batch_questions(
+        results = asyncio.run(generator.generate_batch_questions_async(
             subject="수학",
             unit="이차함수",
             count=3,
             difficulty="medium"
-        )
+        ))
         
         print(f"✅ 배치 생성 완료! {len(results)}개 문제 생성됨")
         
@@ -4,54 +4,100 @@
 Educational AI System 초기 설정을 수행합니다.
 """
 
+import asyncio
 import os
+import re
 import sys
+import mmap
+import importlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import subprocess
 import shutil
 from typing import List, Tuple
 
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
 
 from src.utils.logger import setup_application_logger
 
+# .env 파일에서 OPENAI_API_KEY 값을 찾는 패턴 (bytes 대상, 모듈 로드 시 한 번만 컴파일)
+_KEY_RE = re.compile(rb'^OPENAI_API_KEY=(.*)$', re.M)
+_DEFAULT_KEY = b'your_openai_api_key_here'
+
+# 설정 시 생성할 디렉토리 (프로젝트 루트 기준)
+DIRECTORIES = (
+    "data/vector_db",
+    "data/cache",
+    "data/sample_textbooks",
+    "logs",
+    "test_data/vector_db",
+    "test_data/cache",
+)
+
+
+def _try_import(package: str) -> Tuple[str, bool]:
+    """패키지 import 시도 결과를 (패키지명, 성공 여부)로 반환"""
+    try:
+        importlib.import_module(package)
+        return package, True
+    except ImportError:
+        return package, False
+
+
+def _try_import_parallel(package: str) -> Tuple[str, bool]:
+    """
+    다른 스레드와 동시에 import를 시도할 때 사용하는 _try_import
+
+    부분 초기화된 공통 의존성 때문에 ImportError 외에 AttributeError나
+    _DeadlockError(RuntimeError)가 날 수도 있으므로 모든 예외를 실패로 보고,
+    순차 재시도에서 최종 판단하도록 합니다.
+    """
+    try:
+        return _try_import(package)
+    except Exception:
+        return package, False
+
 
 class EnvironmentSetup:
     """환경 설정 클래스"""
 
     def __init__(self):
         self.logger = setup_application_logger("setup")
-        self.project_root = Path(__file__).parent.parent
+        self.project_root = PROJECT_ROOT
+        self._dir_paths = [PROJECT_ROOT / d for d in DIRECTORIES]
         self.errors = []
         self.warnings = []
+        # 병렬 작업에서 errors/warnings를 갱신할 때 사용
+        self._results_lock = threading.Lock()
 
     def run_setup(self) -> bool:
-        """전체 설정 프로세스 실행"""
+        """전체 설정 프로세스 실행 (run_setup_async의 동기 버전)"""
+        return asyncio.run(self.run_setup_async())
+
+    async def run_setup_async(self) -> bool:
+        """
+        전체 설정 프로세스 실행 (독립적인 단계들을 스레드에서 동시에 수행)
+
+        Returns:
+            bool: 오류 없이 완료되었는지 여부
+        """
         self.logger.info("Educational AI System 환경 설정을 시작합니다...")
 
         try:
-            # 1. Python 버전 확인
+            # 1. Python 버전 확인 (이후 단계의 전제 조건)
             self.check_python_version()
 
-            # 2. 필요한 디렉토리 생성
-            self.create_directories()
-
-            # 3. .env 파일 생성
-            self.setup_env_file()
-
-            # 4. 의존성 확인
-            self.check_dependencies()
-
-            # 5. ChromaDB 초기화 테스트
-            self.test_chromadb()
-
-            # 6. 샘플 데이터 확인
-            self.verify_sample_data()
-
-            # 7. 권한 설정
-            self.set_permissions()
+            # 2~7. 서로의 결과에 의존하지 않는 단계들을 동시에 실행
+            await asyncio.gather(
+                asyncio.to_thread(self.create_directories),
+                asyncio.to_thread(self.setup_env_file),
+                self._check_packages_async(),
+                asyncio.to_thread(self.verify_sample_data),
+                asyncio.to_thread(self.set_permissions)
+            )
 
             # 결과 출력
             self.print_summary()
@@ -60,9 +106,25 @@ class EnvironmentSetup:
 
         except Exception as e:
             self.logger.error(f"설정 중 오류 발생: {str(e)}")
-            self.errors.append(f"Setup failed: {str(e)}")
+            self._add_error(f"Setup failed: {str(e)}")
             return False
 
+    async def _check_packages_async(self):
+        """의존성 확인 후 ChromaDB 테스트 실행"""
+        # 두 단계 모두 chromadb/numpy를 import하므로 동시에 import하지 않도록 순서대로 실행
+        await asyncio.to_thread(self.check_dependencies)
+        await asyncio.to_thread(self.test_chromadb)
+
+    def _add_error(self, message: str):
+        """오류 메시지 기록 (스레드 안전)"""
+        with self._results_lock:
+            self.errors.append(message)
+
+    def _add_warning(self, message: str):
+        """경고 메시지 기록 (스레드 안전)"""
+        with self._results_lock:
+            self.warnings.append(message)
+
     def check_python_version(self):
         """Python 버전 확인"""
         self.logger.info("Python 버전 확인 중...")
@@ -70,7 +132,7 @@ class EnvironmentSetup:
         version = sys.version_info
         if version.major < 3 or (version.major == 3 and version.minor < 8):
             error_msg = f"Python 3.8 이상이 필요합니다. 현재 버전: {version.major}.{version.minor}"
-            self.errors.append(error_msg)
+            self._add_error(error_msg)
             self.logger.error(error_msg)
         else:
             self.logger.info(f"Python 버전 확인 완료: {version.major}.{version.minor}.{version.micro}")
@@ -79,25 +141,19 @@ class EnvironmentSetup:
         """필요한 디렉토리 생성"""
         self.logger.info("필요한 디렉토리 생성 중...")
 
-        directories = [
-            "data/vector_db",
-            "data/cache",
-            "data/sample_textbooks",
-            "logs",
-            "test_data/vector_db",
-            "test_data/cache"
-        ]
-
-        for dir_path in directories:
-            full_path = self.project_root / dir_path
+        def make_directory(full_path: Path):
             try:
                 full_path.mkdir(parents=True, exist_ok=True)
                 self.logger.info(f"디렉토리 생성: {full_path}")
             except Exception as e:
                 error_msg = f"디렉토리 생성 실패 {full_path}: {str(e)}"
-                self.errors.append(error_msg)
+                self._add_error(error_msg)
                 self.logger.error(error_msg)
 
+        # 서로 독립적인 경로이므로 동시에 생성 (네트워크 파일시스템에서 왕복 시간 절약)
+        with ThreadPoolExecutor(max_workers=len(self._dir_paths)) as executor:
+            list(executor.map(make_directory, self._dir_paths))
+
     def setup_env_file(self):
         """환경 설정 파일 생성"""
         self.logger.info("환경 설정 파일 확인 중...")
@@ -110,14 +166,14 @@ class EnvironmentSetup:
                 try:
                     shutil.copy2(env_example, env_file)
                     self.logger.info(".env 파일이 생성되었습니다.")
-                    self.warnings.append("⚠️  .env 파일에서 OPENAI_API_KEY를 설정해주세요!")
+                    self._add_warning("⚠️  .env 파일에서 OPENAI_API_KEY를 설정해주세요!")
                 except Exception as e:
                     error_msg = f".env 파일 생성 실패: {str(e)}"
-                    self.errors.append(error_msg)
+                    self._add_error(error_msg)
                     self.logger.error(error_msg)
             else:
                 error_msg = ".env.example 파일이 없습니다."
-                self.errors.append(error_msg)
+                self._add_error(error_msg)
                 self.logger.error(error_msg)
         else:
             self.logger.info(".env 파일이 이미 존재합니다.")
@@ -129,26 +185,30 @@ class EnvironmentSetup:
     def check_openai_api_key(self, env_file: Path):
         """OpenAI API 키 확인"""
         try:
-            with open(env_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            if "OPENAI_API_KEY=your_openai_api_key_here" in content:
-                self.warnings.append("⚠️  OpenAI API 키가 기본값으로 설정되어 있습니다. 실제 키로 변경해주세요!")
-            elif "OPENAI_API_KEY=" in content:
-                # 간단한 형식 검사
-                for line in content.split('\n'):
-                    if line.startswith('OPENAI_API_KEY='):
-                        key = line.split('=', 1)[1].strip()
-                        if key and key.startswith('sk-') and len(key) > 20:
-                            self.logger.info("OpenAI API 키가 올바른 형식으로 설정되어 있습니다.")
-                        elif key:
-                            self.warnings.append("⚠️  OpenAI API 키 형식을 확인해주세요!")
-                        break
+            key_bytes = None
+            # 빈 파일은 mmap할 수 없으므로 크기를 먼저 확인
+            if env_file.stat().st_size > 0:
+                # 줄 단위로 나누거나 디코딩하지 않고 C 정규식 엔진으로 바로 검색
+                with open(env_file, 'rb') as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    match = _KEY_RE.search(mm)
+                    if match:
+                        key_bytes = match.group(1).rstrip(b'\r')
+
+            if key_bytes is None:
+                self._add_warning("⚠️  .env 파일에 OPENAI_API_KEY가 설정되지 않았습니다!")
+            elif key_bytes == _DEFAULT_KEY:
+                self._add_warning("⚠️  OpenAI API 키가 기본값으로 설정되어 있습니다. 실제 키로 변경해주세요!")
             else:
-                self.warnings.append("⚠️  .env 파일에 OPENAI_API_KEY가 설정되지 않았습니다!")
+                # 간단한 형식 검사
+                key = key_bytes.decode('utf-8').strip()
+                if key and key.startswith('sk-') and len(key) > 20:
+                    self.logger.info("OpenAI API 키가 올바른 형식으로 설정되어 있습니다.")
+                elif key:
+                    self._add_warning("⚠️  OpenAI API 키 형식을 확인해주세요!")
 
         except Exception as e:
-            self.warnings.append(f"⚠️  .env 파일 읽기 실패: {str(e)}")
+            self._add_warning(f"⚠️  .env 파일 읽기 실패: {str(e)}")
 
     def check_dependencies(self):
         """의존성 패키지 확인"""
@@ -164,18 +224,27 @@ class EnvironmentSetup:
             'pytest'
         ]
 
-        missing_packages = []
+        # import는 대부분 파일 I/O와 동적 로딩 대기이므로 스레드로 병렬 처리
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(_try_import_parallel, required_packages))
 
-        for package in required_packages:
-            try:
-                __import__(package)
+        # 공통 의존성(numpy 등)을 동시에 import하면 부분 초기화 모듈 때문에
+        # 실패할 수 있으므로, 실패한 패키지는 순차적으로 한 번 더 확인
+        results = [
+            (package, ok) if ok else _try_import(package)
+            for package, ok in results
+        ]
+
+        for package, ok in results:
+            if ok:
                 self.logger.info(f"✓ {package}")
-            except ImportError:
-                missing_packages.append(package)
+            else:
                 self.logger.warning(f"✗ {package} (누락)")
 
+        missing_packages = [package for package, ok in results if not ok]
+
         if missing_packages:
-            self.warnings.append(
+            self._add_warning(
                 f"⚠️  누락된 패키지가 있습니다: {', '.join(missing_packages)}\n"
                 f"   다음 명령어로 설치하세요: pip install -r requirements.txt"
             )
@@ -186,19 +255,19 @@ class EnvironmentSetup:
 
         try:
             import chromadb
+            import numpy as np
             from chromadb.config import Settings
 
-            # 테스트용 클라이언트 생성
-            test_db_path = self.project_root / "test_data" / "setup_test_db"
-            test_db_path.mkdir(parents=True, exist_ok=True)
+            # add/query에 같은 float32 벡터를 재사용
+            test_embedding = np.full((1, 1536), 0.1, dtype=np.float32)
 
-            client = chromadb.PersistentClient(
-                path=str(test_db_path),
+            # 테스트용 인메모리 클라이언트 생성 (디스크/SQLite I/O 없음)
+            client = chromadb.EphemeralClient(
                 settings=Settings(anonymized_telemetry=False)
             )
 
-            # 테스트 컬렉션 생성
-            collection = client.create_collection(
+            # 테스트 컬렉션 생성 (같은 프로세스에서 재실행해도 안전하도록 get_or_create)
+            collection = client.get_or_create_collection(
                 name="setup_test",
                 metadata={"description": "Setup test collection"}
             )
@@ -206,54 +275,59 @@ class EnvironmentSetup:
             # 간단한 데이터 추가 테스트
             collection.add(
                 ids=["test1"],
-                embeddings=[[0.1] * 1536],
+                embeddings=test_embedding,
                 documents=["테스트 문서"],
                 metadatas=[{"test": True}]
             )
 
             # 검색 테스트
             results = collection.query(
-                query_embeddings=[[0.1] * 1536],
+                query_embeddings=test_embedding,
                 n_results=1
             )
 
             if results['documents'] and results['documents'][0]:
                 self.logger.info("ChromaDB 테스트 성공")
             else:
-                self.warnings.append("⚠️  ChromaDB 검색 테스트 실패")
+                self._add_warning("⚠️  ChromaDB 검색 테스트 실패")
 
             # 테스트 데이터 정리
             client.delete_collection("setup_test")
 
-            # 테스트 디렉토리 정리
-            if test_db_path.exists():
-                shutil.rmtree(test_db_path, ignore_errors=True)
-
         except Exception as e:
             error_msg = f"ChromaDB 테스트 실패: {str(e)}"
-            self.errors.append(error_msg)
+            self._add_error(error_msg)
             self.logger.error(error_msg)
 
     def verify_sample_data(self):
         """샘플 데이터 확인"""
         self.logger.info("샘플 데이터 확인 중...")
 
-        sample_files = [
-            "data/sample_textbooks/math_unit1.txt",
-            "data/sample_textbooks/science_unit1.txt"
-        ]
+        sample_dir = "data/sample_textbooks"
+        expected = ("math_unit1.txt", "science_unit1.txt")
 
-        for file_path in sample_files:
-            full_path = self.project_root / file_path
-            if full_path.exists():
+        # 디렉토리를 한 번만 읽어 DirEntry에 캐시된 정보로 크기 확인
+        try:
+            with os.scandir(self.project_root / sample_dir) as entries:
+                sizes = {
+                    entry.name: entry.stat().st_size
+                    for entry in entries
+                    if entry.name in expected and entry.is_file()
+                }
+        except FileNotFoundError:
+            sizes = {}
+
+        for file_name in expected:
+            file_path = f"{sample_dir}/{file_name}"
+            if file_name in sizes:
                 # 파일 크기 확인
-                size = full_path.stat().st_size
+                size = sizes[file_name]
                 if size > 100:  # 최소 100바이트
                     self.logger.info(f"✓ {file_path} ({size} bytes)")
                 else:
-                    self.warnings.append(f"⚠️  {file_path} 파일이 너무 작습니다 ({size} bytes)")
+                    self._add_warning(f"⚠️  {file_path} 파일이 너무 작습니다 ({size} bytes)")
             else:
-                self.warnings.append(f"⚠️  샘플 파일이 없습니다: {file_path}")
+                self._add_warning(f"⚠️  샘플 파일이 없습니다: {file_path}")
 
     def set_permissions(self):
         """파일 권한 설정 (Unix 시스템만)"""
@@ -270,13 +344,15 @@ class EnvironmentSetup:
 
             # 스크립트 파일들 실행 권한 추가
             scripts_dir = self.project_root / "scripts"
-            for script_file in scripts_dir.glob("*.py"):
-                os.chmod(script_file, 0o755)
+            with os.scandir(scripts_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.py') and entry.is_file(follow_symlinks=False):
+                        os.chmod(entry.path, 0o755)
 
             self.logger.info("파일 권한 설정 완료")
 
         except Exception as e:
-            self.warnings.append(f"⚠️  권한 설정 실패: {str(e)}")
+            self._add_warning(f"⚠️  권한 설정 실패: {str(e)}")
 
     def print_summary(self):
         """설정 결과 요약 출력"""
@@ -319,7 +395,7 @@ class EnvironmentSetup:
 def main():
     """메인 함수"""
     setup = EnvironmentSetup()
-    success = setup.run_setup()
+    success = asyncio.run(setup.run_setup_async())
 
     if success:
         print("🎉 설정이 성공적으로 완료되었습니다!")
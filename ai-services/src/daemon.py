@@ -0,0 +1,180 @@
+"""
+Educational AI System - CLI 데몬
+RAGPipeline을 한 번만 초기화해 두고 Unix 소켓으로 CLI 명령을 받아 처리
+"""
+
+import json
+import os
+import socket
+import socketserver
+import stat
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+# 데몬 소켓 경로를 지정하는 환경 변수 (설정되어 있으면 CLI 명령을 데몬으로 전달)
+SOCKET_ENV_VAR = "EDUBRIDGE_SOCKET"
+# 사용자 전용 런타임 디렉토리를 우선 사용 (없으면 임시 디렉토리에 사용자별 파일명)
+DEFAULT_SOCKET_PATH = (
+    os.path.join(os.environ["XDG_RUNTIME_DIR"], "edubridge.sock")
+    if os.environ.get("XDG_RUNTIME_DIR")
+    else os.path.join(tempfile.gettempdir(), f"edubridge-{os.getuid()}.sock")
+)
+
+# 데몬에서 호출할 수 있는 RAGPipeline 메서드
+REMOTE_METHODS = frozenset({
+    'process_textbook',
+    'generate_questions',
+    'evaluate_questions',
+    'get_status',
+    'test_pipeline'
+})
+
+
+class PipelineRequestHandler(socketserver.StreamRequestHandler):
+    """요청 한 줄(JSON)을 읽어 파이프라인 메서드를 실행하고 결과를 JSON으로 응답"""
+
+    def handle(self):
+        pipeline = self.server.pipeline
+
+        try:
+            request = json.loads(self.rfile.readline())
+            method = request['method']
+            if method not in REMOTE_METHODS:
+                raise ValueError(f"Unsupported method: {method}")
+
+            result = getattr(pipeline, method)(**request.get('params', {}))
+            response = {'ok': True, 'result': result}
+
+        except Exception as e:
+            pipeline.logger.error(f"Error handling daemon request: {str(e)}")
+            response = {'ok': False, 'error': str(e)}
+
+        self.wfile.write(json.dumps(response, ensure_ascii=False, default=str).encode('utf-8'))
+
+
+class PipelineServer(socketserver.ThreadingUnixStreamServer):
+    """초기화된 RAGPipeline을 유지하며 Unix 소켓으로 요청을 받는 서버"""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, pipeline: Any):
+        """
+        PipelineServer 초기화
+
+        Args:
+            socket_path: Unix 소켓 경로
+            pipeline: 요청을 처리할 RAGPipeline 인스턴스
+        """
+        self.pipeline = pipeline
+        self.socket_path = socket_path
+
+        # 이전 실행에서 남은 소켓 파일 정리 (실행 중인 데몬의 소켓은 건드리지 않음)
+        self._remove_stale_socket(socket_path)
+
+        # 소켓 파일이 처음부터 소유자 전용 권한으로 만들어지도록 umask를 좁혀서 bind
+        previous_umask = os.umask(0o077)
+        try:
+            super().__init__(socket_path, PipelineRequestHandler)
+        finally:
+            os.umask(previous_umask)
+
+    @staticmethod
+    def _remove_stale_socket(socket_path: str):
+        """
+        응답하지 않는 이전 소켓 파일 삭제
+
+        Args:
+            socket_path: Unix 소켓 경로
+
+        Raises:
+            RuntimeError: 다른 데몬이 이미 소켓에서 실행 중이거나 경로가 소켓 파일이 아닌 경우
+        """
+        try:
+            mode = os.lstat(socket_path).st_mode
+        except FileNotFoundError:
+            return
+
+        if not stat.S_ISSOCK(mode):
+            raise RuntimeError(f"Socket path exists and is not a socket: {socket_path}")
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(socket_path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                os.unlink(socket_path)
+                return
+
+        raise RuntimeError(f"A daemon is already running on {socket_path}")
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+class RemotePipeline:
+    """실행 중인 데몬에 명령을 전달하는 RAGPipeline 대리 객체"""
+
+    def __init__(self, socket_path: str):
+        """
+        RemotePipeline 초기화
+
+        Args:
+            socket_path: 데몬의 Unix 소켓 경로
+        """
+        self.socket_path = socket_path
+
+    def process_textbook(self, file_path: str, subject: str, unit: str) -> Dict[str, Any]:
+        """교과서 처리 및 벡터 DB 저장"""
+        # 데몬의 작업 디렉토리가 다를 수 있으므로 절대 경로로 전달
+        return self._call('process_textbook', file_path=str(Path(file_path).resolve()), subject=subject, unit=unit)
+
+    def generate_questions(self,
+                           subject: str,
+                           unit: str,
+                           difficulty: str = 'medium',
+                           count: int = 1) -> List[Dict[str, Any]]:
+        """문제 생성"""
+        return self._call('generate_questions', subject=subject, unit=unit, difficulty=difficulty, count=count)
+
+    def evaluate_questions(self, question_file: str, subject: str, unit: str) -> List[Dict[str, Any]]:
+        """생성된 문제 품질 평가"""
+        return self._call(
+            'evaluate_questions', question_file=str(Path(question_file).resolve()), subject=subject, unit=unit
+        )
+
+    def get_status(self) -> Dict[str, Any]:
+        """시스템 상태 확인"""
+        return self._call('get_status')
+
+    def test_pipeline(self) -> Dict[str, Any]:
+        """전체 파이프라인 테스트"""
+        return self._call('test_pipeline')
+
+    def _call(self, method: str, **params) -> Any:
+        """
+        데몬에 요청을 보내고 결과 반환
+
+        Args:
+            method: 호출할 RAGPipeline 메서드명
+            **params: 메서드 인자
+
+        Returns:
+            Any: 메서드 실행 결과
+        """
+        request = json.dumps({'method': method, 'params': params}, ensure_ascii=False).encode('utf-8')
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self.socket_path)
+            sock.sendall(request + b"\n")
+            sock.shutdown(socket.SHUT_WR)
+
+            chunks = []
+            while chunk := sock.recv(65536):
+                chunks.append(chunk)
+
+        response = json.loads(b"".join(chunks))
+        if not response['ok']:
+            raise RuntimeError(response['error'])
+        return response['result']
@@ -1,23 +1,142 @@
 
+import asyncio
+import hashlib
 import json
-from typing import Any, Dict
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder when orjson is unavailable.
+    orjson = None
 
 from ..models.llm_client import LLMClient
 from ..utils.prompts import get_quality_assessment_prompt
 
+class AssessmentCache:
+    """
+    Thread-safe LRU cache with a per-entry TTL for quality assessment results.
+    """
+
+    def __init__(self, maxsize: int = 2048, ttl: float = 600.0):
+        """
+        Initializes the AssessmentCache.
+
+        Args:
+            maxsize: Maximum number of cached assessments.
+            ttl: Seconds an entry stays valid after it is stored.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def make_key(question_json_str: str, source_context: str) -> str:
+        """
+        Builds the cache key for a serialized question and its source context.
+
+        Args:
+            question_json_str: The question data serialized as JSON.
+            source_context: The source text context.
+
+        Returns:
+            A hex digest identifying the pair.
+        """
+        return hashlib.blake2b(
+            question_json_str.encode() + b"|" + source_context.encode(),
+            digest_size=16
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached assessment for key, or None on a miss or expiry.
+
+        Args:
+            key: A key produced by make_key.
+
+        Returns:
+            The cached assessment, or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._evictions += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: str, value: Dict[str, Any]):
+        """
+        Stores an assessment, evicting the least recently used entry when full.
+
+        Args:
+            key: A key produced by make_key.
+            value: The assessment result to cache.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        """Removes all cached assessments."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns cache usage statistics.
+
+        Returns:
+            A dictionary with size, hits, misses, evictions and hit_rate.
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'hit_rate': self._hits / lookups if lookups else 0.0
+            }
+
+
 class QualityAssessor:
     """
     Generates a quality assessment for a given question based on source context.
     """
 
-    def __init__(self, llm_client: LLMClient):
+    def __init__(self, llm_client: LLMClient, cache: Optional[AssessmentCache] = None):
         """
         Initializes the QualityAssessor.
 
         Args:
             llm_client: An instance of LLMClient to interact with the language model.
+            cache: Cache for assessment results. A default AssessmentCache is created if omitted.
         """
         self.llm_client = llm_client
+        self.cache = cache if cache is not None else AssessmentCache()
+        self._prompt_template = get_quality_assessment_prompt()
+        # In-flight async assessments, keyed like the cache, so duplicates share one LLM call.
+        self._inflight: Dict[str, asyncio.Future] = {}
 
     def assess_question(self, question_data: Dict[str, Any], source_context: str) -> Dict[str, Any]:
         """
@@ -30,20 +149,151 @@ class QualityAssessor:
         Returns:
             A dictionary containing the assessment results.
         """
-        prompt = get_quality_assessment_prompt()
-        
-        # We need to serialize the question data to a string to include it in the prompt.
-        question_json_str = json.dumps(question_data, ensure_ascii=False, indent=2)
-        
-        formatted_prompt = prompt.format(
-            source_context=source_context,
-            question_json=question_json_str
-        )
-        
+        question_json_str = self._serialize_question(question_data)
+        cache_key = AssessmentCache.make_key(question_json_str, source_context)
+
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        formatted_prompt = self._format_prompt(question_json_str, source_context)
+
         assessment_result = self.llm_client.generate_structured_response(
             prompt=formatted_prompt,
             response_format="json"
         )
-            
+
+        self.cache.set(cache_key, assessment_result)
+
         return assessment_result
 
+    async def assess_question_async(self, question_data: Dict[str, Any], source_context: str) -> Dict[str, Any]:
+        """
+        Asynchronously assesses the quality of a single question.
+
+        Concurrent calls for the same question and context are coalesced into a
+        single LLM request; later callers await the result of the first one.
+
+        Args:
+            question_data: A dictionary containing the generated question details.
+            source_context: The source text context used to generate the question.
+
+        Returns:
+            A dictionary containing the assessment results.
+        """
+        question_json_str = self._serialize_question(question_data)
+        cache_key = AssessmentCache.make_key(question_json_str, source_context)
+
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            # shield so that a cancelled waiter does not cancel the shared request
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+
+        try:
+            assessment_result = await self.llm_client.generate_structured_response_async(
+                prompt=self._format_prompt(question_json_str, source_context),
+                response_format="json"
+            )
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case no other caller was waiting.
+            future.exception()
+            raise
+        else:
+            self.cache.set(cache_key, assessment_result)
+            future.set_result(assessment_result)
+            return assessment_result
+        finally:
+            self._inflight.pop(cache_key, None)
+
+    def assess_questions(self, items: List[Tuple[Dict[str, Any], str]]) -> List[Dict[str, Any]]:
+        """
+        Assesses the quality of several questions with a single batched LLM call.
+
+        Args:
+            items: A list of (question_data, source_context) pairs.
+
+        Returns:
+            A list of assessment results, in the same order as items.
+        """
+        if not items:
+            return []
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        # Only cache misses are sent to the LLM.
+        missing: List[Tuple[int, str, str]] = []
+
+        for i, (question_data, source_context) in enumerate(items):
+            question_json_str = self._serialize_question(question_data)
+            cache_key = AssessmentCache.make_key(question_json_str, source_context)
+
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                missing.append((i, cache_key, self._format_prompt(question_json_str, source_context)))
+
+        if missing:
+            assessments = self.llm_client.generate_structured_responses_batch(
+                prompts=[prompt for _, _, prompt in missing],
+                response_format="json"
+            )
+            for (i, cache_key, _), assessment in zip(missing, assessments):
+                self.cache.set(cache_key, assessment)
+                results[i] = assessment
+
+        return results
+
+    def refresh_prompt(self):
+        """Reloads the quality assessment prompt template."""
+        self._prompt_template = get_quality_assessment_prompt()
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Returns statistics of the assessment cache.
+
+        Returns:
+            A dictionary with hits, misses and evictions.
+        """
+        return self.cache.get_stats()
+
+    def _serialize_question(self, question_data: Dict[str, Any]) -> str:
+        """
+        Serializes question data for the prompt and the cache key.
+
+        Args:
+            question_data: A dictionary containing the generated question details.
+
+        Returns:
+            The question data as a JSON string.
+        """
+        # Compact JSON: indentation only adds prompt tokens for the LLM.
+        if orjson is not None:
+            return orjson.dumps(question_data, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        return json.dumps(question_data, ensure_ascii=False, separators=(",", ":"))
+
+    def _format_prompt(self, question_json_str: str, source_context: str) -> str:
+        """
+        Builds the assessment prompt for a single question.
+
+        Args:
+            question_json_str: The question data serialized as JSON.
+            source_context: The source text context used to generate the question.
+
+        Returns:
+            The formatted assessment prompt.
+        """
+        return self._prompt_template.format(
+            source_context=source_context,
+            question_json=question_json_str
+        )
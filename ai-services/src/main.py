@@ -4,13 +4,22 @@ Educational AI System - RAG Pipeline
 메인 CLI 애플리케이션
 """
 
+from __future__ import annotations
+
+import asyncio
 import click
 import json
 import sys
 import os
 from pathlib import Path
-from typing import Optional, List, Dict, Any
-import traceback
+from typing import TYPE_CHECKING, Optional, List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json으로 대체
+    orjson = None
 
 # 현재 디렉토리를 Python 경로에 추가
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -18,28 +27,37 @@ parent_dir = os.path.dirname(current_dir)
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
-# 로컬 모듈 임포트
+# 로컬 모듈 임포트 (tiktoken/ChromaDB/OpenAI를 끌어오는 컴포넌트 모듈은 처음 사용할 때 import)
 try:
     from src.utils.config import get_settings, Settings
     from src.utils.logger import setup_application_logger, get_logger
+    from src.daemon import SOCKET_ENV_VAR, DEFAULT_SOCKET_PATH, PipelineServer, RemotePipeline
+except ImportError:
+    # 패키지가 설치된 경우의 import
+    from utils.config import get_settings, Settings
+    from utils.logger import setup_application_logger, get_logger
+    from daemon import SOCKET_ENV_VAR, DEFAULT_SOCKET_PATH, PipelineServer, RemotePipeline
+
+if TYPE_CHECKING:
     from src.rag.document_processor import DocumentProcessor
     from src.rag.embeddings import EmbeddingsManager
-    from src.rag.vector_store import VectorStore
     from src.rag.retriever import RAGRetriever
     from src.models.llm_client import LLMClient
     from src.models.question_generator import QuestionGenerator
     from src.evaluation.quality_assessor import QualityAssessor
-except ImportError:
-    # 패키지가 설치된 경우의 import
-    from utils.config import get_settings, Settings
-    from utils.logger import setup_application_logger, get_logger
-    from rag.document_processor import DocumentProcessor
-    from rag.embeddings import EmbeddingsManager
-    from rag.vector_store import VectorStore
-    from rag.retriever import RAGRetriever
-    from models.llm_client import LLMClient
-    from models.question_generator import QuestionGenerator
-    from evaluation.quality_assessor import QualityAssessor
+
+def _dump_json_bytes(obj: Any) -> bytes:
+    """객체를 들여쓰기된 UTF-8 JSON bytes로 직렬화 (orjson 우선)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def _load_json_bytes(data: bytes) -> Any:
+    """UTF-8 JSON bytes를 텍스트 디코딩 없이 파싱 (orjson 우선)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 class RAGPipeline:
@@ -53,50 +71,127 @@ class RAGPipeline:
         self._initialize_components()
 
     def _initialize_components(self):
-        """RAG 파이프라인 컴포넌트 초기화"""
+        """RAG 파이프라인 초기화 (컴포넌트는 처음 사용할 때 생성)"""
         try:
             # API 키 검증
             if not self.settings.validate_api_key():
                 raise ValueError("Invalid or missing OpenAI API key")
 
-            # 각 컴포넌트 초기화
-            self.document_processor = DocumentProcessor()
-
-            self.embeddings_manager = EmbeddingsManager(
-                model_name=self.settings.openai_embedding_model,
-                api_key=self.settings.openai_api_key
-            )
-
-            self.vector_store = VectorStore(
-                collection_name=self.settings.chroma_collection_name,
-                persist_directory=self.settings.chroma_db_path
-            )
-
-            self.retriever = RAGRetriever(
-                vector_store=self.vector_store,
-                embeddings_manager=self.embeddings_manager
-            )
-
-            self.llm_client = LLMClient(
-                model_name=self.settings.openai_model,
-                api_key=self.settings.openai_api_key,
-                temperature=self.settings.openai_temperature,
-                max_tokens=self.settings.openai_max_tokens
-            )
-
-            self.question_generator = QuestionGenerator(
-                llm_client=self.llm_client,
-                retriever=self.retriever
-            )
-
-            self.quality_assessor = QualityAssessor(llm_client=self.llm_client)
-
             self.logger.info("RAG Pipeline initialized successfully")
 
         except Exception as e:
             self.logger.error(f"Failed to initialize RAG Pipeline: {str(e)}")
             raise
 
+    # 각 컴포넌트는 처음 접근할 때 생성해 하위 명령이 사용하지 않는
+    # ChromaDB 열기, tiktoken 로드, OpenAI 클라이언트 생성 비용을 피함
+    @cached_property
+    def document_processor(self) -> DocumentProcessor:
+        """문서 처리기"""
+        try:
+            from src.rag.document_processor import DocumentProcessor
+        except ImportError:
+            from rag.document_processor import DocumentProcessor
+
+        return DocumentProcessor()
+
+    @cached_property
+    def embeddings_manager(self) -> EmbeddingsManager:
+        """임베딩 관리자"""
+        try:
+            from src.rag.embeddings import EmbeddingCache, EmbeddingsManager
+        except ImportError:
+            from rag.embeddings import EmbeddingCache, EmbeddingsManager
+
+        return EmbeddingsManager(
+            model_name=self.settings.openai_embedding_model,
+            api_key=self.settings.openai_api_key,
+            cache=EmbeddingCache(
+                directory=str(Path(self.settings.cache_dir) / "embeddings")
+            ) if self.settings.enable_cache else None,
+            coalesce_window=self.settings.embedding_coalesce_window_ms / 1000
+        )
+
+    @cached_property
+    def vector_store(self):
+        """벡터 저장소"""
+        # faiss 백엔드는 인덱스를 메모리에 상주시켜 프로세스 내에서 검색 (선택한 백엔드 모듈만 import)
+        if self.settings.vector_backend == "faiss":
+            try:
+                from src.rag.faiss_store import FAISSVectorStore as vector_store_class
+            except ImportError:
+                from rag.faiss_store import FAISSVectorStore as vector_store_class
+        else:
+            try:
+                from src.rag.vector_store import VectorStore as vector_store_class
+            except ImportError:
+                from rag.vector_store import VectorStore as vector_store_class
+
+        return vector_store_class(
+            collection_name=self.settings.chroma_collection_name,
+            persist_directory=self.settings.chroma_db_path
+        )
+
+    @cached_property
+    def retriever(self) -> RAGRetriever:
+        """컨텍스트 검색기"""
+        try:
+            from src.rag.retriever import RAGRetriever
+        except ImportError:
+            from rag.retriever import RAGRetriever
+
+        return RAGRetriever(
+            vector_store=self.vector_store,
+            embeddings_manager=self.embeddings_manager,
+            re_ranker_backend=self.settings.reranker_backend
+        )
+
+    @cached_property
+    def llm_client(self) -> LLMClient:
+        """LLM 클라이언트"""
+        try:
+            from src.models.llm_client import LLMClient
+        except ImportError:
+            from models.llm_client import LLMClient
+
+        return LLMClient(
+            model_name=self.settings.openai_model,
+            api_key=self.settings.openai_api_key,
+            temperature=self.settings.openai_temperature,
+            max_tokens=self.settings.openai_max_tokens,
+            cache_responses=self.settings.llm_cache_enabled,
+            semantic_cache=self.settings.llm_semantic_cache,
+            tau=self.settings.llm_semantic_cache_threshold,
+            cache_max_entries=self.settings.llm_cache_max_entries,
+            # 의미 캐시를 쓸 때만 임베딩 관리자 생성
+            embeddings_manager=self.embeddings_manager if self.settings.llm_semantic_cache else None
+        )
+
+    @cached_property
+    def question_generator(self) -> QuestionGenerator:
+        """문제 생성기"""
+        try:
+            from src.models.question_generator import QuestionGenerator
+        except ImportError:
+            from models.question_generator import QuestionGenerator
+
+        return QuestionGenerator(
+            llm_client=self.llm_client,
+            retriever=self.retriever,
+            question_cache=self.settings.question_cache_enabled,
+            similarity_threshold=self.settings.question_cache_threshold
+        )
+
+    @cached_property
+    def quality_assessor(self) -> QualityAssessor:
+        """문제 품질 평가기"""
+        try:
+            from src.evaluation.quality_assessor import QualityAssessor
+        except ImportError:
+            from evaluation.quality_assessor import QualityAssessor
+
+        return QualityAssessor(llm_client=self.llm_client)
+
     def process_textbook(self, file_path: str, subject: str, unit: str) -> Dict[str, Any]:
         """교과서 처리 및 벡터 DB 저장"""
         try:
@@ -111,12 +206,19 @@ class RAGPipeline:
             cost_info = self.embeddings_manager.estimate_cost(texts)
             self.logger.info(f"Estimated embedding cost: ${cost_info['estimated_cost_usd']:.4f}")
 
-            embeddings = self.embeddings_manager.generate_embeddings(texts)
+            import numpy as np
+
+            # 저장소까지 연속된 float32 배열 하나로 전달 (문서별 float 리스트 재변환 방지)
+            embeddings = np.asarray(self.embeddings_manager.generate_embeddings(texts), dtype=np.float32, order='C')
             self.logger.info(f"Generated {len(embeddings)} embeddings")
 
             # 3. 벡터 저장소에 저장
             success = self.vector_store.add_documents(documents, embeddings)
 
+            # 교과서 데이터가 바뀌었으므로 이미 생성된 문제 생성기의 검색 컨텍스트 캐시 무효화
+            if success and 'question_generator' in self.__dict__:
+                self.question_generator.clear_context_cache()
+
             if success:
                 result = {
                     'status': 'success',
@@ -158,30 +260,66 @@ class RAGPipeline:
             self.logger.error(f"Error generating questions: {str(e)}")
             raise
 
+    async def generate_questions_async(self,
+                                       subject: str,
+                                       unit: str,
+                                       difficulty: str = 'medium',
+                                       count: int = 1) -> List[Dict[str, Any]]:
+        """문제 생성 (비동기, 여러 문제의 LLM 요청을 동시에 전송)"""
+        try:
+            self.logger.info(f"Generating {count} questions for {subject} - {unit} ({difficulty})")
+
+            if count == 1:
+                question = await asyncio.to_thread(
+                    self.question_generator.generate_question, subject, unit, difficulty
+                )
+                return [question]
+            else:
+                return await self.question_generator.generate_batch_questions_async(
+                    subject, unit, count, difficulty
+                )
+
+        except Exception as e:
+            self.logger.error(f"Error generating questions: {str(e)}")
+            raise
+
     def evaluate_questions(self, question_file: str, subject: str, unit: str) -> List[Dict[str, Any]]:
         """생성된 문제 품질 평가"""
         try:
             self.logger.info(f"Evaluating questions from {question_file}")
-            with open(question_file, 'r', encoding='utf-8') as f:
-                questions_data = json.load(f)
-
-            results = []
-            for i, question_data in enumerate(questions_data):
-                self.logger.debug(f"Evaluating question {i+1}")
-                # Retrieve context based on the question text itself to find the most relevant source
-                retrieved_docs = self.retriever.retrieve_documents(
-                    query=question_data['question'],
-                    subject=subject,
-                    unit=unit
-                )
-                source_context = "\n\n".join([doc.content for doc in retrieved_docs])
-
+            questions_data = _load_json_bytes(Path(question_file).read_bytes())
+
+            # 검색 쿼리(문제 본문) 임베딩은 한 번의 배치 요청으로 미리 계산
+            query_embeddings = self.embeddings_manager.generate_embeddings(
+                [question_data['question'] for question_data in questions_data]
+            ) if questions_data else []
+
+            # 컨텍스트 검색은 문제별로 동시에 수행한 뒤, 평가는 한 번의 배치 호출로 수행
+            max_workers = max(1, min(len(questions_data), self.settings.eval_concurrency))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                source_contexts = list(executor.map(
+                    lambda question_data, query_embedding: self._retrieve_source_context(
+                        question_data, subject, unit, query_embedding
+                    ),
+                    questions_data,
+                    query_embeddings
+                ))
+
+            pending = []
+            for i, (question_data, source_context) in enumerate(zip(questions_data, source_contexts)):
                 if not source_context:
                     self.logger.warning(f"Could not retrieve source context for question {i+1}. Skipping assessment.")
                     continue
 
-                assessment = self.quality_assessor.assess_question(question_data, source_context)
-                results.append({"question_id": i + 1, "assessment": assessment, "original_question": question_data})
+                pending.append((i, question_data, source_context))
+
+            assessments = self.quality_assessor.assess_questions(
+                [(question_data, source_context) for _, question_data, source_context in pending]
+            )
+            results = [
+                {"question_id": i + 1, "assessment": assessment, "original_question": question_data}
+                for (i, question_data, _), assessment in zip(pending, assessments)
+            ]
             
             self.logger.info(f"Finished evaluating {len(results)} questions.")
             return results
@@ -189,17 +327,46 @@ class RAGPipeline:
             self.logger.error(f"Error evaluating questions: {str(e)}")
             raise
 
+    def _retrieve_source_context(self,
+                                 question_data: Dict[str, Any],
+                                 subject: str,
+                                 unit: str,
+                                 query_embedding: Optional[List[float]] = None) -> str:
+        """평가할 문제의 원본 컨텍스트 검색"""
+        # Retrieve context based on the question text itself to find the most relevant source
+        retrieved_docs = self.retriever.retrieve_documents(
+            query=question_data['question'],
+            subject=subject,
+            unit=unit,
+            query_embedding=query_embedding
+        )
+        return "\n\n".join([doc.content for doc in retrieved_docs])
+
     def get_status(self) -> Dict[str, Any]:
         """시스템 상태 확인"""
         try:
             # 벡터 DB 정보
             collection_info = self.vector_store.get_collection_info()
 
-            # LLM 사용량
-            llm_usage = self.llm_client.track_usage()
-
-            # 문제 생성 통계
-            question_stats = self.question_generator.get_question_statistics()
+            # LLM 사용량과 문제 생성 통계는 이미 만들어진 구성 요소에서만 읽음
+            # (새로 만들면 임베딩/재순위화 모델까지 불러온 뒤 빈 통계만 반환하게 됨)
+            if 'llm_client' in self.__dict__:
+                llm_usage = self.llm_client.track_usage()
+            else:
+                try:
+                    from src.models.llm_client import LLMClient
+                except ImportError:
+                    from models.llm_client import LLMClient
+                llm_usage = LLMClient.empty_usage(self.settings.openai_model)
+
+            if 'question_generator' in self.__dict__:
+                question_stats = self.question_generator.get_question_statistics()
+            else:
+                try:
+                    from src.models.question_generator import QuestionGenerator
+                except ImportError:
+                    from models.question_generator import QuestionGenerator
+                question_stats = QuestionGenerator.empty_statistics()
 
             status = {
                 'vector_store': collection_info,
@@ -297,11 +464,18 @@ def cli(ctx, config, debug, verbose):
     ctx.obj['settings'] = settings
     ctx.obj['logger'] = logger
 
+    # 데몬 소켓이 지정되어 있으면 파이프라인을 초기화하지 않고 데몬에 명령 전달
+    socket_path = os.environ.get(SOCKET_ENV_VAR)
+    if socket_path and ctx.invoked_subcommand != 'serve':
+        ctx.obj['pipeline'] = RemotePipeline(socket_path)
+        return
+
     try:
         ctx.obj['pipeline'] = RAGPipeline(settings)
     except Exception as e:
         logger.error(f"Failed to initialize pipeline: {str(e)}")
         if debug:
+            import traceback
             traceback.print_exc()
         sys.exit(1)
 
@@ -330,6 +504,7 @@ def process_textbook(ctx, file, subject, unit):
     except Exception as e:
         click.echo(f"❌ 오류: {str(e)}", err=True)
         if ctx.obj['settings'].debug:
+            import traceback
             traceback.print_exc()
         sys.exit(1)
 
@@ -371,15 +546,14 @@ def generate_questions(ctx, subject, unit, difficulty, count, output):
         if output:
             output_path = Path(output)
             output_path.parent.mkdir(parents=True, exist_ok=True)
-
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(questions, f, ensure_ascii=False, indent=2)
+            output_path.write_bytes(_dump_json_bytes(questions))
 
             click.echo(f"💾 결과가 {output}에 저장되었습니다.")
 
     except Exception as e:
         click.echo(f"❌ 오류: {str(e)}", err=True)
         if ctx.obj['settings'].debug:
+            import traceback
             traceback.print_exc()
         sys.exit(1)
 
@@ -419,13 +593,13 @@ def evaluate_questions(ctx, question_file, subject, unit, output):
         if output:
             output_path = Path(output)
             output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(results, f, ensure_ascii=False, indent=2)
+            output_path.write_bytes(_dump_json_bytes(results))
             click.echo(f"💾 평가 결과가 {output}에 저장되었습니다.")
 
     except Exception as e:
         click.echo(f"❌ 오류: {str(e)}", err=True)
         if ctx.obj['settings'].debug:
+            import traceback
             traceback.print_exc()
         sys.exit(1)
 
@@ -471,6 +645,7 @@ def status(ctx):
     except Exception as e:
         click.echo(f"❌ 오류: {str(e)}", err=True)
         if ctx.obj['settings'].debug:
+            import traceback
             traceback.print_exc()
         sys.exit(1)
 
@@ -505,9 +680,39 @@ def test_pipeline(ctx):
     except Exception as e:
         click.echo(f"❌ 테스트 실패: {str(e)}", err=True)
         if ctx.obj['settings'].debug:
+            import traceback
+            traceback.print_exc()
+        sys.exit(1)
+
+
+@cli.command()
+@click.option('--socket', 'socket_path', default=lambda: os.environ.get(SOCKET_ENV_VAR, DEFAULT_SOCKET_PATH),
+              help='데몬 Unix 소켓 경로')
+@click.pass_context
+def serve(ctx, socket_path):
+    """파이프라인을 한 번 초기화해 두고 다른 CLI 호출의 명령을 처리하는 데몬 실행"""
+    pipeline = ctx.obj['pipeline']
+    logger = ctx.obj['logger']
+
+    try:
+        server = PipelineServer(socket_path, pipeline)
+    except Exception as e:
+        click.echo(f"❌ 오류: {str(e)}", err=True)
+        if ctx.obj['settings'].debug:
+            import traceback
             traceback.print_exc()
         sys.exit(1)
 
+    click.echo(f"🚀 데몬 실행 중: {socket_path}")
+    click.echo(f"   다른 터미널에서 {SOCKET_ENV_VAR}={socket_path} 설정 후 CLI 명령을 실행하세요.")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        click.echo("데몬을 종료합니다.")
+    finally:
+        server.server_close()
+
 
 if __name__ == "__main__":
     cli()
\ No newline at end of file
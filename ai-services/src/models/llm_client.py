@@ -1,11 +1,291 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, FrozenSet, Iterator, List, Tuple
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import numpy as np
 import openai
 import tiktoken
 import time
 import logging
-from tenacity import retry, stop_after_attempt, wait_exponential
+import random
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime
 
+from ..utils.http import get_shared_http_client
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json 모듈로 파싱
+    orjson = None
+
+try:
+    import json_repair
+except ImportError:  # json_repair가 없으면 _clean_json_response로 정리 후 재시도
+    json_repair = None
+
+
+# generate_structured_response(response_format="json")용 시스템 메시지
+_JSON_SYSTEM_MESSAGE = (
+    "You must respond with valid JSON only. "
+    "Do not include any explanations or additional text outside the JSON."
+)
+
+# 응답 텍스트 중간의 JSON 객체를 정규식 없이 잘라내 디코딩할 때 사용
+_JSON_DECODER = json.JSONDecoder()
+
+# response_format={"type": "json_object"}를 지원하는 모델명 접두사
+_JSON_MODE_MODEL_PREFIXES = (
+    "gpt-3.5-turbo-1106",
+    "gpt-3.5-turbo-0125",
+    "gpt-4-turbo",
+    "gpt-4-1106",
+    "gpt-4-0125",
+    "gpt-4o",
+    "gpt-4.1",
+    "gpt-5",
+)
+
+
+def _split_paragraphs(text: str, max_chars: int) -> List[str]:
+    """
+    텍스트를 문단 경계("\n\n")에서 약 max_chars 길이의 조각으로 분할
+
+    구분자는 앞 조각 끝에 남겨 두어 조각을 이어 붙이면 원문과 같습니다.
+
+    Args:
+        text: 분할할 텍스트
+        max_chars: 조각의 목표 최대 길이
+
+    Returns:
+        List[str]: 분할된 조각 리스트
+    """
+    pieces = []
+    start = 0
+    while len(text) - start > max_chars:
+        end = text.rfind("\n\n", start, start + max_chars)
+        if end <= start:
+            # 범위 안에 문단 경계가 없으면 다음 경계까지 한 조각으로 사용
+            end = text.find("\n\n", start + max_chars)
+            if end == -1:
+                break
+        pieces.append(text[start:end + 2])
+        start = end + 2
+    pieces.append(text[start:])
+    return pieces
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model_name: str) -> tiktoken.Encoding:
+    """
+    모델별 tiktoken 인코딩 로드 (LLMClient 인스턴스 간 공유)
+
+    Args:
+        model_name: OpenAI 모델명
+
+    Returns:
+        tiktoken.Encoding: 토큰 인코딩
+    """
+    try:
+        return tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")  # GPT-4 기본 인코딩
+
+
+# _count_messages_tokens에서 encode_batch를 사용할 최소 문자열 수
+_BATCH_ENCODE_MIN_TEXTS = 16
+
+# 일시적인 API 오류만 재시도 (그 외 오류는 즉시 전달)
+_TRANSIENT_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError)
+_MAX_ATTEMPTS = 3
+
+
+def _retry_delay(attempt: int) -> float:
+    """재시도 대기 시간 (지수 백오프 4초~10초 + 최대 1초 지터)"""
+    return min(10.0, 4.0 * 2 ** attempt) + random.uniform(0, 1)
+
+
+# 메시지 객체와 토큰 수를 기억해 둘 시스템 메시지 최대 개수
+_MAX_MEMOIZED_SYSTEM_MESSAGES = 32
+
+# estimate_tokens에서 텍스트를 나눠 병렬 인코딩할 최소 길이 (문자 수)
+_PARALLEL_ENCODE_MIN_CHARS = 16_000
+
+# 시간당 요청 수를 보관할 기간 (시간 단위, 7일)
+_HOURLY_WINDOW = 168
+
+
+class _JsonObjectTracker:
+    """스트리밍 응답 조각에서 최상위 JSON 객체가 닫히는 위치를 찾는 추적기"""
+
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, piece: str) -> Optional[int]:
+        """
+        응답 조각을 읽고 최상위 객체가 닫혔으면 조각 내 종료 위치 반환
+
+        Args:
+            piece: 새로 도착한 응답 조각
+
+        Returns:
+            Optional[int]: 닫는 중괄호 다음 인덱스 (아직 닫히지 않았으면 None)
+        """
+        for i, char in enumerate(piece):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                if self.started:
+                    self.in_string = True
+            elif char == '{':
+                self.started = True
+                self.depth += 1
+            elif char == '}' and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    return i + 1
+        return None
+
+
+class SemanticCache:
+    """프롬프트 임베딩의 코사인 유사도로 응답을 찾는 캐시"""
+
+    def __init__(self, threshold: float = 0.92, max_entries: int = 256, min_grounding_overlap: float = 0.0):
+        """
+        SemanticCache 초기화
+
+        Args:
+            threshold: 캐시 적중으로 판단할 최소 코사인 유사도
+            max_entries: 최대 저장 항목 수 (초과 시 가장 오래 사용되지 않은 항목 교체)
+            min_grounding_overlap: 근거 문서 ID 집합이 주어졌을 때 요구하는 최소 Jaccard 유사도
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.min_grounding_overlap = min_grounding_overlap
+        self._sem_M: Optional[np.ndarray] = None  # (max_entries, dim) float32, 행마다 L2 정규화
+        self._contexts: List[str] = []
+        self._groundings: List[Optional[FrozenSet[str]]] = []
+        self._responses: List[Any] = []
+        self._last_used = np.zeros(max_entries, dtype=np.int64)
+        self._tick = 0
+        self._lock = threading.Lock()
+
+    def get(self,
+            embedding: np.ndarray,
+            context_key: str,
+            grounding: Optional[FrozenSet[str]] = None) -> Optional[Any]:
+        """
+        가장 유사한 프롬프트의 응답 조회
+
+        Args:
+            embedding: 프롬프트 임베딩
+            context_key: 시스템 메시지 등 응답에 영향을 주는 나머지 요청 조건
+            grounding: 프롬프트에 사용된 근거 문서 ID 집합 (주어지면 겹치는 정도도 확인)
+
+        Returns:
+            Optional[Any]: 유사도가 임계값을 넘는 응답 (없으면 None)
+        """
+        query = self._normalize(embedding)
+
+        with self._lock:
+            size = len(self._responses)
+            if size == 0 or self._sem_M.shape[1] != query.shape[0]:
+                return None
+
+            scores = self._sem_M[:size] @ query
+            # 요청 조건이 다른 항목은 후보에서 제외
+            for i, context in enumerate(self._contexts):
+                if context != context_key:
+                    scores[i] = -np.inf
+
+            # 유사도가 높은 순으로 근거 문서가 충분히 겹치는 첫 항목 선택
+            for best in np.argsort(-scores):
+                if scores[best] < self.threshold:
+                    return None
+                if grounding is not None and not self._grounding_matches(self._groundings[best], grounding):
+                    continue
+
+                self._tick += 1
+                self._last_used[best] = self._tick
+                return self._responses[best]
+
+            return None
+
+    def set(self,
+            embedding: np.ndarray,
+            context_key: str,
+            response: Any,
+            grounding: Optional[FrozenSet[str]] = None):
+        """
+        응답 저장
+
+        Args:
+            embedding: 프롬프트 임베딩
+            context_key: 시스템 메시지 등 응답에 영향을 주는 나머지 요청 조건
+            response: 저장할 응답
+            grounding: 프롬프트에 사용된 근거 문서 ID 집합
+        """
+        vector = self._normalize(embedding)
+
+        with self._lock:
+            if self._sem_M is None or self._sem_M.shape[1] != vector.shape[0]:
+                self._sem_M = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+                self._contexts = []
+                self._groundings = []
+                self._responses = []
+
+            size = len(self._responses)
+            if size < self.max_entries:
+                row = size
+                self._contexts.append(context_key)
+                self._groundings.append(grounding)
+                self._responses.append(response)
+            else:
+                row = int(np.argmin(self._last_used))
+                self._contexts[row] = context_key
+                self._groundings[row] = grounding
+                self._responses[row] = response
+
+            self._sem_M[row] = vector
+            self._tick += 1
+            self._last_used[row] = self._tick
+
+    def clear(self):
+        """저장된 항목 모두 삭제"""
+        with self._lock:
+            self._sem_M = None
+            self._contexts = []
+            self._groundings = []
+            self._responses = []
+            self._last_used[:] = 0
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def _grounding_matches(self, stored: Optional[FrozenSet[str]], grounding: FrozenSet[str]) -> bool:
+        """저장된 근거 문서 집합과의 Jaccard 유사도가 기준 이상인지 확인"""
+        if stored is None:
+            return False
+        union = len(stored | grounding)
+        return union == 0 or len(stored & grounding) / union >= self.min_grounding_overlap
+
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
 
 class LLMClient:
     """OpenAI API 클라이언트"""
@@ -14,7 +294,12 @@ class LLMClient:
                  model_name: str = "gpt-5-mini",
                  api_key: Optional[str] = None,
                  temperature: float = 1.0,
-                 max_tokens: int = 20000):
+                 max_tokens: int = 20000,
+                 cache_responses: bool = False,
+                 semantic_cache: bool = False,
+                 tau: float = 0.92,
+                 cache_max_entries: int = 1024,
+                 embeddings_manager: Optional[Any] = None):
         """
         LLMClient 초기화
 
@@ -23,28 +308,50 @@ class LLMClient:
             api_key: OpenAI API 키
             temperature: 응답의 창의성 (0.0-2.0)
             max_tokens: 최대 토큰 수
+            cache_responses: 같은 요청의 응답 캐시 사용 여부
+            semantic_cache: 비슷한 프롬프트의 응답도 재사용할지 여부 (embeddings_manager 필요)
+            tau: 의미 캐시 적중으로 판단할 최소 코사인 유사도
+            cache_max_entries: 캐시별 최대 저장 항목 수
+            embeddings_manager: 의미 캐시용 프롬프트 임베딩을 생성할 EmbeddingsManager
         """
         self.model_name = model_name
         self.temperature = temperature
         self.max_tokens = max_tokens
-        self.client = openai.OpenAI(api_key=api_key) if api_key else openai.OpenAI()
+        # 동기 클라이언트는 프로세스 전체의 연결 풀을 공유 (비동기 클라이언트는 이벤트 루프에 묶이므로 인스턴스별로 생성)
+        self.client = openai.OpenAI(api_key=api_key, http_client=get_shared_http_client())
+        self.async_client = openai.AsyncOpenAI(api_key=api_key) if api_key else openai.AsyncOpenAI()
         self.logger = logging.getLogger(__name__)
 
         # 토큰 카운터 초기화
-        try:
-            self.encoding = tiktoken.encoding_for_model(model_name)
-        except KeyError:
-            self.encoding = tiktoken.get_encoding("cl100k_base")  # GPT-4 기본 인코딩
+        self.encoding = _get_encoding(model_name)
 
-        # 사용량 추적
-        self.usage_stats = {
-            'total_requests': 0,
-            'total_prompt_tokens': 0,
-            'total_completion_tokens': 0,
-            'total_cost_usd': 0.0,
-            'requests_by_hour': {},
-            'last_request_time': None
-        }
+        # 고정된 시스템 메시지의 메시지 객체와 토큰 수 (JSON 지시문은 미리 계산)
+        self._system_messages: Dict[str, Dict[str, str]] = {}
+        self._sys_tok_cache: Dict[str, int] = {}
+        self._system_message_tokens(_JSON_SYSTEM_MESSAGE)
+
+        # JSON 모드를 지원하는 모델은 서버에서 올바른 JSON을 보장하므로 응답 복구 생략
+        self.supports_json_mode = model_name.startswith(_JSON_MODE_MODEL_PREFIXES)
+        self._json_response_format = {"type": "json_object"} if self.supports_json_mode else None
+
+        # 응답 캐시: 프롬프트 해시 → 응답 (LRU), 선택적으로 임베딩 기반 의미 캐시
+        if semantic_cache and embeddings_manager is None:
+            raise ValueError("semantic_cache requires an embeddings_manager")
+        self.cache_responses = cache_responses or semantic_cache
+        self.cache_max_entries = cache_max_entries
+        self.embeddings_manager = embeddings_manager
+        self.semantic_cache = SemanticCache(tau, cache_max_entries) if semantic_cache else None
+        self._exact_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_stats = {'exact_hits': 0, 'semantic_hits': 0, 'misses': 0}
+
+        # 사용량 추적 (여러 스레드에서 동시에 요청할 수 있으므로 잠금으로 보호)
+        self._usage_lock = threading.Lock()
+        self.usage_stats = self._new_usage_stats()
+
+        # 시간당 요청 수: 최근 _HOURLY_WINDOW시간을 epoch 시 단위 원형 버퍼로 기록
+        self._hour_buckets = np.zeros(_HOURLY_WINDOW, dtype=np.int64)
+        self._bucket_hours = np.full(_HOURLY_WINDOW, -1, dtype=np.int64)
 
         # 모델별 가격 정보 (per 1K tokens)
         self.pricing = {
@@ -57,15 +364,17 @@ class LLMClient:
             'gpt-5-mini': {'prompt': 0.00025, 'completion': 0.002}
         }
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
-    )
+        # 요청마다 가격표를 조회하지 않도록 토큰당 가격을 미리 계산
+        pricing = self.pricing.get(model_name, self.pricing['gpt-5-mini'])
+        self._prompt_price_per_tok = pricing['prompt'] / 1000.0
+        self._completion_price_per_tok = pricing['completion'] / 1000.0
+
     def generate_response(self,
                          prompt: str,
                          max_tokens: Optional[int] = None,
                          temperature: Optional[float] = None,
-                         system_message: Optional[str] = None) -> str:
+                         system_message: Optional[str] = None,
+                         response_format: Optional[Dict[str, str]] = None) -> str:
         """
         프롬프트에 대한 응답 생성
 
@@ -74,59 +383,210 @@ class LLMClient:
             max_tokens: 최대 토큰 수 (None시 기본값 사용)
             temperature: 창의성 수준 (None시 기본값 사용)
             system_message: 시스템 메시지
+            response_format: API 응답 형식 (예: {"type": "json_object"})
 
         Returns:
             str: 생성된 응답
         """
         try:
-            # 매개변수 설정
             actual_max_tokens = max_tokens or self.max_tokens
             actual_temperature = temperature if temperature is not None else self.temperature
 
-            # 메시지 구성
-            messages = []
-            if system_message:
-                messages.append({"role": "system", "content": system_message})
-            messages.append({"role": "user", "content": prompt})
+            if self.cache_responses:
+                context_key = self._make_context_key(
+                    system_message, actual_max_tokens, actual_temperature, response_format
+                )
+                cached, embedding = self._lookup_cached_response(prompt, context_key)
+                if cached is not None:
+                    return cached
 
-            # 토큰 수 추정
+            messages = self._build_messages(prompt, system_message)
             prompt_tokens = self._count_messages_tokens(messages)
 
             # API 호출
             start_time = time.time()
-            response = self.client.chat.completions.create(
+            response = self._create_completion(
                 model=self.model_name,
                 messages=messages,
                 max_tokens=actual_max_tokens,
                 temperature=actual_temperature,
                 n=1,
-                stop=None
+                stop=None,
+                response_format=response_format or openai.NOT_GIVEN
             )
 
-            # 응답 처리
-            generated_text = response.choices[0].message.content
-            completion_tokens = response.usage.completion_tokens
-            total_tokens = response.usage.total_tokens
+            self._record_completion(response, prompt_tokens, start_time)
+            content = response.choices[0].message.content
 
-            # 사용량 업데이트
-            self._update_usage_stats(prompt_tokens, completion_tokens, total_tokens)
+            if self.cache_responses:
+                self._store_cached_response(prompt, context_key, embedding, content)
+            return content
 
-            response_time = time.time() - start_time
-            self.logger.info(
-                f"Generated response: {prompt_tokens} prompt + {completion_tokens} completion tokens "
-                f"in {response_time:.2f}s"
+        except Exception as e:
+            self.logger.error(f"Error generating response: {str(e)}")
+            raise
+
+    async def generate_response_async(self,
+                                      prompt: str,
+                                      max_tokens: Optional[int] = None,
+                                      temperature: Optional[float] = None,
+                                      system_message: Optional[str] = None,
+                                      response_format: Optional[Dict[str, str]] = None) -> str:
+        """
+        generate_response의 비동기 버전 (AsyncOpenAI 사용)
+
+        Args:
+            prompt: 입력 프롬프트
+            max_tokens: 최대 토큰 수 (None시 기본값 사용)
+            temperature: 창의성 수준 (None시 기본값 사용)
+            system_message: 시스템 메시지
+            response_format: API 응답 형식 (예: {"type": "json_object"})
+
+        Returns:
+            str: 생성된 응답
+        """
+        try:
+            actual_max_tokens = max_tokens or self.max_tokens
+            actual_temperature = temperature if temperature is not None else self.temperature
+
+            if self.cache_responses:
+                context_key = self._make_context_key(
+                    system_message, actual_max_tokens, actual_temperature, response_format
+                )
+                # 의미 캐시 조회는 임베딩 API를 동기 호출하므로 스레드에서 실행
+                cached, embedding = await asyncio.to_thread(
+                    self._lookup_cached_response, prompt, context_key
+                )
+                if cached is not None:
+                    return cached
+
+            messages = self._build_messages(prompt, system_message)
+            prompt_tokens = self._count_messages_tokens(messages)
+
+            # API 호출
+            start_time = time.time()
+            response = await self._create_completion_async(
+                model=self.model_name,
+                messages=messages,
+                max_tokens=actual_max_tokens,
+                temperature=actual_temperature,
+                n=1,
+                stop=None,
+                response_format=response_format or openai.NOT_GIVEN
             )
 
-            return generated_text
+            self._record_completion(response, prompt_tokens, start_time)
+            content = response.choices[0].message.content
+
+            if self.cache_responses:
+                self._store_cached_response(prompt, context_key, embedding, content)
+            return content
 
         except Exception as e:
             self.logger.error(f"Error generating response: {str(e)}")
             raise
 
+    def generate_response_stream(self,
+                                 prompt: str,
+                                 max_tokens: Optional[int] = None,
+                                 temperature: Optional[float] = None,
+                                 system_message: Optional[str] = None) -> Iterator[str]:
+        """
+        프롬프트에 대한 응답을 토큰이 도착하는 대로 스트리밍 생성
+
+        Args:
+            prompt: 입력 프롬프트
+            max_tokens: 최대 토큰 수 (None시 기본값 사용)
+            temperature: 창의성 수준 (None시 기본값 사용)
+            system_message: 시스템 메시지
+
+        Yields:
+            str: 생성된 응답 조각
+        """
+        try:
+            actual_max_tokens = max_tokens or self.max_tokens
+            actual_temperature = temperature if temperature is not None else self.temperature
+
+            messages = self._build_messages(prompt, system_message)
+            prompt_tokens = self._count_messages_tokens(messages)
+
+            # API 호출 (마지막 청크에 사용량 포함 요청)
+            start_time = time.time()
+            stream = self._create_completion(
+                model=self.model_name,
+                messages=messages,
+                max_tokens=actual_max_tokens,
+                temperature=actual_temperature,
+                n=1,
+                stop=None,
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+
+            for chunk in stream:
+                if chunk.choices:
+                    content = chunk.choices[0].delta.content
+                    if content:
+                        yield content
+                if getattr(chunk, 'usage', None) is not None:
+                    self._record_completion(chunk, prompt_tokens, start_time)
+
+        except Exception as e:
+            self.logger.error(f"Error streaming response: {str(e)}")
+            raise
+
+    def generate_responses(self,
+                           prompt: str,
+                           n: int,
+                           max_tokens: Optional[int] = None,
+                           temperature: Optional[float] = None,
+                           system_message: Optional[str] = None,
+                           response_format: Optional[Dict[str, str]] = None) -> List[str]:
+        """
+        하나의 프롬프트에 대해 n개의 응답을 단일 요청으로 생성
+
+        Args:
+            prompt: 입력 프롬프트
+            n: 생성할 응답 수
+            max_tokens: 응답당 최대 토큰 수 (None시 기본값 사용)
+            temperature: 창의성 수준 (None시 기본값 사용)
+            system_message: 시스템 메시지
+            response_format: API 응답 형식 (예: {"type": "json_object"})
+
+        Returns:
+            List[str]: 생성된 응답 리스트
+        """
+        try:
+            actual_max_tokens = max_tokens or self.max_tokens
+            actual_temperature = temperature if temperature is not None else self.temperature
+
+            messages = self._build_messages(prompt, system_message)
+            prompt_tokens = self._count_messages_tokens(messages)
+
+            # API 호출
+            start_time = time.time()
+            response = self._create_completion(
+                model=self.model_name,
+                messages=messages,
+                max_tokens=actual_max_tokens,
+                temperature=actual_temperature,
+                n=n,
+                stop=None,
+                response_format=response_format or openai.NOT_GIVEN
+            )
+
+            self._record_completion(response, prompt_tokens, start_time)
+            return [choice.message.content for choice in response.choices]
+
+        except Exception as e:
+            self.logger.error(f"Error generating responses: {str(e)}")
+            raise
+
     def generate_structured_response(self,
                                    prompt: str,
                                    response_format: str = "json",
-                                   max_tokens: Optional[int] = None) -> Dict[str, Any]:
+                                   max_tokens: Optional[int] = None,
+                                   early_stop: bool = False) -> Dict[str, Any]:
         """
         구조화된 응답 생성 (JSON 등)
 
@@ -134,32 +594,57 @@ class LLMClient:
             prompt: 입력 프롬프트
             response_format: 응답 형식 ("json" 등)
             max_tokens: 최대 토큰 수
+            early_stop: 스트리밍으로 받으며 JSON 객체가 닫힌 뒤의 내용은 버릴지 여부
+                (응답 캐시를 사용할 때는 캐시 경로를 우선하고, JSON 모드 모델은 응답이
+                객체에서 끝나므로 무시)
 
         Returns:
             Dict[str, Any]: 파싱된 구조화된 응답
         """
         try:
+            if response_format == "json" and early_stop and not self.cache_responses and not self.supports_json_mode:
+                return self._generate_json_until_closed(prompt, max_tokens)
+
             if response_format == "json":
-                system_message = (
-                    "You must respond with valid JSON only. "
-                    "Do not include any explanations or additional text outside the JSON."
-                )
                 response_text = self.generate_response(
                     prompt=prompt,
                     max_tokens=max_tokens,
-                    system_message=system_message
+                    system_message=_JSON_SYSTEM_MESSAGE,
+                    response_format=self._json_response_format
                 )
+                return self._parse_json_response(response_text, repair=not self.supports_json_mode)
 
-                # JSON 파싱
-                import json
-                try:
-                    return json.loads(response_text)
-                except json.JSONDecodeError as e:
-                    # JSON 파싱 실패 시 재시도
-                    self.logger.warning(f"JSON parsing failed: {str(e)}")
-                    # 간단한 JSON 수정 시도
-                    cleaned_response = self._clean_json_response(response_text)
-                    return json.loads(cleaned_response)
+            else:
+                raise ValueError(f"Unsupported response format: {response_format}")
+
+        except Exception as e:
+            self.logger.error(f"Error generating structured response: {str(e)}")
+            raise
+
+    async def generate_structured_response_async(self,
+                                                 prompt: str,
+                                                 response_format: str = "json",
+                                                 max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """
+        generate_structured_response의 비동기 버전
+
+        Args:
+            prompt: 입력 프롬프트
+            response_format: 응답 형식 ("json" 등)
+            max_tokens: 최대 토큰 수
+
+        Returns:
+            Dict[str, Any]: 파싱된 구조화된 응답
+        """
+        try:
+            if response_format == "json":
+                response_text = await self.generate_response_async(
+                    prompt=prompt,
+                    max_tokens=max_tokens,
+                    system_message=_JSON_SYSTEM_MESSAGE,
+                    response_format=self._json_response_format
+                )
+                return self._parse_json_response(response_text, repair=not self.supports_json_mode)
 
             else:
                 raise ValueError(f"Unsupported response format: {response_format}")
@@ -168,6 +653,132 @@ class LLMClient:
             self.logger.error(f"Error generating structured response: {str(e)}")
             raise
 
+    def generate_structured_responses_batch(self,
+                                            prompts: List[str],
+                                            response_format: str = "json",
+                                            max_tokens: Optional[int] = None,
+                                            return_exceptions: bool = False) -> List[Any]:
+        """
+        여러 프롬프트에 대한 구조화된 응답을 한 번에 생성
+
+        모든 프롬프트가 같으면 n=len(prompts)인 단일 요청으로 처리하고,
+        서로 다르면 요청들을 스레드 풀에서 동시에 보냅니다.
+        한 프롬프트가 실패해도 나머지 요청은 끝까지 받아 둡니다.
+
+        Args:
+            prompts: 입력 프롬프트 리스트
+            response_format: 응답 형식 ("json" 등)
+            max_tokens: 응답당 최대 토큰 수
+            return_exceptions: True면 실패한 자리에 예외 객체를 넣어 반환하고,
+                False면 모든 요청이 끝난 뒤 첫 번째 예외를 발생
+
+        Returns:
+            List[Any]: 프롬프트 순서대로 파싱된 응답 (또는 예외) 리스트
+        """
+        if not prompts:
+            return []
+
+        try:
+            if response_format != "json":
+                raise ValueError(f"Unsupported response format: {response_format}")
+
+            if len(set(prompts)) == 1:
+                try:
+                    response_texts = self.generate_responses(
+                        prompt=prompts[0],
+                        n=len(prompts),
+                        max_tokens=max_tokens,
+                        system_message=_JSON_SYSTEM_MESSAGE,
+                        response_format=self._json_response_format
+                    )
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    return [e] * len(prompts)
+
+                results = [self._parse_json_response_or_error(text) for text in response_texts]
+            else:
+                def generate_one(prompt: str) -> Any:
+                    try:
+                        return self.generate_structured_response(
+                            prompt=prompt,
+                            response_format=response_format,
+                            max_tokens=max_tokens
+                        )
+                    except Exception as e:
+                        return e
+
+                with ThreadPoolExecutor(max_workers=min(len(prompts), 8)) as executor:
+                    results = list(executor.map(generate_one, prompts))
+
+            return results if return_exceptions else self._raise_first_error(results)
+
+        except Exception as e:
+            self.logger.error(f"Error generating batch structured responses: {str(e)}")
+            raise
+
+    async def generate_structured_responses_batch_async(self,
+                                                        prompts: List[str],
+                                                        response_format: str = "json",
+                                                        max_tokens: Optional[int] = None,
+                                                        concurrency: int = 8,
+                                                        return_exceptions: bool = False) -> List[Any]:
+        """
+        generate_structured_responses_batch의 비동기 버전
+
+        OpenAI에는 다중 프롬프트 동기 엔드포인트가 없으므로 프롬프트별 요청을
+        asyncio.gather로 한 번에 보냅니다 (최대 concurrency개 동시 진행).
+
+        Args:
+            prompts: 입력 프롬프트 리스트
+            response_format: 응답 형식 ("json" 등)
+            max_tokens: 응답당 최대 토큰 수
+            concurrency: 동시에 보낼 최대 요청 수
+            return_exceptions: True면 실패한 자리에 예외 객체를 넣어 반환하고,
+                False면 모든 요청이 끝난 뒤 첫 번째 예외를 발생
+
+        Returns:
+            List[Any]: 프롬프트 순서대로 파싱된 응답 (또는 예외) 리스트
+        """
+        if not prompts:
+            return []
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def generate_one(prompt: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.generate_structured_response_async(
+                    prompt=prompt,
+                    response_format=response_format,
+                    max_tokens=max_tokens
+                )
+
+        try:
+            # 한 요청이 실패해도 이미 보낸 나머지 요청의 결과는 버리지 않음
+            results = list(await asyncio.gather(
+                *(generate_one(prompt) for prompt in prompts), return_exceptions=True
+            ))
+            return results if return_exceptions else self._raise_first_error(results)
+
+        except Exception as e:
+            self.logger.error(f"Error generating batch structured responses: {str(e)}")
+            raise
+
+    def _parse_json_response_or_error(self, text: str) -> Any:
+        """JSON 응답을 파싱하고, 실패하면 예외를 발생시키는 대신 예외 객체 반환"""
+        try:
+            return self._parse_json_response(text, repair=not self.supports_json_mode)
+        except Exception as e:
+            return e
+
+    @staticmethod
+    def _raise_first_error(results: List[Any]) -> List[Any]:
+        """결과 중 예외가 있으면 첫 번째 예외를 발생시키고, 없으면 그대로 반환"""
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
     def estimate_tokens(self, text: str) -> int:
         """
         텍스트의 토큰 수 추정
@@ -179,7 +790,13 @@ class LLMClient:
             int: 추정 토큰 수
         """
         try:
-            return len(self.encoding.encode(text))
+            if len(text) <= _PARALLEL_ENCODE_MIN_CHARS:
+                return len(self.encoding.encode(text))
+
+            # 긴 텍스트는 문단 경계에서 나눠 여러 스레드로 인코딩
+            pieces = _split_paragraphs(text, _PARALLEL_ENCODE_MIN_CHARS)
+            token_lists = self.encoding.encode_batch(pieces, num_threads=min(len(pieces), os.cpu_count() or 1))
+            return sum(map(len, token_lists))
         except Exception as e:
             self.logger.warning(f"Error counting tokens: {str(e)}")
             # 대략적인 추정치 (1 토큰 ≈ 4 문자)
@@ -196,10 +813,10 @@ class LLMClient:
         Returns:
             Dict[str, float]: 비용 정보
         """
-        pricing = self.pricing.get(self.model_name, self.pricing['gpt-5-mini'])
+        prompt_tokens = self.estimate_tokens(prompt)
 
-        prompt_cost = (prompt_tokens / 1000) * pricing['prompt']
-        completion_cost = (estimated_completion_tokens / 1000) * pricing['completion']
+        prompt_cost = prompt_tokens * self._prompt_price_per_tok
+        completion_cost = estimated_completion_tokens * self._completion_price_per_tok
         total_cost = prompt_cost + completion_cost
 
         return {
@@ -211,39 +828,428 @@ class LLMClient:
             'model': self.model_name
         }
 
-    def track_usage(self) -> Dict[str, Any]:
+    def estimate_costs_batch(self, texts: List[str]) -> Dict[str, Any]:
         """
-        사용량 통계 반환
+        여러 프롬프트의 토큰 수와 프롬프트 비용을 한 번에 추정
+
+        Args:
+            texts: 프롬프트 텍스트 리스트
 
         Returns:
-            Dict[str, Any]: 사용량 정보
+            Dict[str, Any]: 총 토큰 수 및 비용 정보
         """
+        if not texts:
+            return {
+                'total_tokens': 0,
+                'estimated_cost_usd': 0.0,
+                'num_texts': 0,
+                'model': self.model_name
+            }
+
+        token_lists = self.encoding.encode_batch(texts, num_threads=min(8, len(texts)))
+        lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(token_lists))
+        total_tokens = int(lengths.sum())
+
         return {
-            'model': self.model_name,
-            'total_requests': self.usage_stats['total_requests'],
-            'total_prompt_tokens': self.usage_stats['total_prompt_tokens'],
-            'total_completion_tokens': self.usage_stats['total_completion_tokens'],
-            'total_tokens': self.usage_stats['total_prompt_tokens'] + self.usage_stats['total_completion_tokens'],
-            'total_cost_usd': round(self.usage_stats['total_cost_usd'], 6),
-            'average_tokens_per_request': (
-                (self.usage_stats['total_prompt_tokens'] + self.usage_stats['total_completion_tokens'])
-                / max(self.usage_stats['total_requests'], 1)
-            ),
-            'last_request_time': self.usage_stats['last_request_time']
+            'total_tokens': total_tokens,
+            'estimated_cost_usd': round(total_tokens * self._prompt_price_per_tok, 6),
+            'num_texts': len(texts),
+            'model': self.model_name
         }
 
-    def reset_usage_stats(self):
-        """사용량 통계 초기화"""
-        self.usage_stats = {
+    @staticmethod
+    def _new_usage_stats() -> Dict[str, Any]:
+        """누적 전의 빈 사용량 카운터 생성"""
+        return {
             'total_requests': 0,
             'total_prompt_tokens': 0,
             'total_completion_tokens': 0,
             'total_cost_usd': 0.0,
-            'requests_by_hour': {},
             'last_request_time': None
         }
+
+    @staticmethod
+    def _summarize_usage(model_name: str, stats: Dict[str, Any]) -> Dict[str, Any]:
+        """누적 카운터를 track_usage() 반환 형식으로 변환"""
+        total_tokens = stats['total_prompt_tokens'] + stats['total_completion_tokens']
+        return {
+            'model': model_name,
+            'total_requests': stats['total_requests'],
+            'total_prompt_tokens': stats['total_prompt_tokens'],
+            'total_completion_tokens': stats['total_completion_tokens'],
+            'total_tokens': total_tokens,
+            'total_cost_usd': round(stats['total_cost_usd'], 6),
+            'average_tokens_per_request': total_tokens / max(stats['total_requests'], 1),
+            'last_request_time': stats['last_request_time']
+        }
+
+    @classmethod
+    def empty_usage(cls, model_name: str) -> Dict[str, Any]:
+        """
+        요청이 한 번도 없었을 때의 사용량 통계 반환
+
+        클라이언트를 만들지 않고도 track_usage()와 같은 키 구성을 얻을 때 사용한다.
+
+        Args:
+            model_name: 통계에 표시할 모델명
+
+        Returns:
+            Dict[str, Any]: 모든 값이 0인 사용량 정보
+        """
+        return cls._summarize_usage(model_name, cls._new_usage_stats())
+
+    def track_usage(self, include_hourly: bool = False) -> Dict[str, Any]:
+        """
+        사용량 통계 반환
+
+        Args:
+            include_hourly: 최근 시간대별 요청 수(requests_by_hour) 포함 여부
+
+        Returns:
+            Dict[str, Any]: 사용량 정보
+        """
+        with self._usage_lock:
+            stats = dict(self.usage_stats)
+            if include_hourly:
+                hour_buckets = self._hour_buckets.copy()
+                bucket_hours = self._bucket_hours.copy()
+
+        usage = self._summarize_usage(self.model_name, stats)
+
+        if include_hourly:
+            # 창을 벗어난 오래된 칸은 제외하고 시간순으로 변환
+            oldest_hour = int(time.time()) // 3600 - _HOURLY_WINDOW + 1
+            usage['requests_by_hour'] = {
+                datetime.fromtimestamp(int(hour) * 3600).strftime('%Y-%m-%d %H'): int(count)
+                for hour, count in sorted(zip(bucket_hours, hour_buckets))
+                if hour >= oldest_hour and count
+            }
+
+        return usage
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        응답 캐시 통계 반환
+
+        Returns:
+            Dict[str, Any]: 캐시 적중/실패 횟수 및 저장 항목 수
+        """
+        with self._cache_lock:
+            return {
+                **self.cache_stats,
+                'exact_entries': len(self._exact_cache),
+                'semantic_entries': len(self.semantic_cache) if self.semantic_cache is not None else 0
+            }
+
+    def clear_cache(self):
+        """응답 캐시 초기화"""
+        with self._cache_lock:
+            self._exact_cache.clear()
+            self.cache_stats = {'exact_hits': 0, 'semantic_hits': 0, 'misses': 0}
+        if self.semantic_cache is not None:
+            self.semantic_cache.clear()
+
+    def reset_usage_stats(self):
+        """사용량 통계 초기화"""
+        with self._usage_lock:
+            self.usage_stats = self._new_usage_stats()
+            self._hour_buckets[:] = 0
+            self._bucket_hours[:] = -1
         self.logger.info("Usage statistics reset")
 
+    def _build_messages(self, prompt: str, system_message: Optional[str]) -> List[Dict[str, str]]:
+        """
+        Chat Completions API용 메시지 리스트 구성
+
+        Args:
+            prompt: 사용자 프롬프트
+            system_message: 시스템 메시지
+
+        Returns:
+            List[Dict[str, str]]: 메시지 리스트
+        """
+        if not system_message:
+            return [{"role": "user", "content": prompt}]
+
+        # 같은 시스템 메시지는 미리 만든 메시지 객체를 재사용
+        system = self._system_messages.get(system_message)
+        if system is None:
+            system = {"role": "system", "content": system_message}
+            if len(self._system_messages) < _MAX_MEMOIZED_SYSTEM_MESSAGES:
+                self._system_messages[system_message] = system
+        return [system, {"role": "user", "content": prompt}]
+
+    def _create_completion(self, **kwargs) -> Any:
+        """
+        Chat Completions API 호출 (일시적인 오류는 지수 백오프로 재시도)
+
+        Args:
+            **kwargs: chat.completions.create 인자
+
+        Returns:
+            Any: Chat Completions API 응답
+        """
+        for attempt in range(_MAX_ATTEMPTS):
+            try:
+                return self.client.chat.completions.create(**kwargs)
+            except _TRANSIENT_ERRORS as e:
+                if attempt == _MAX_ATTEMPTS - 1:
+                    raise
+                delay = _retry_delay(attempt)
+                self.logger.warning(
+                    f"Transient API error (attempt {attempt + 1}/{_MAX_ATTEMPTS}): {str(e)}. "
+                    f"Retrying in {delay:.1f}s"
+                )
+                time.sleep(delay)
+
+    async def _create_completion_async(self, **kwargs) -> Any:
+        """
+        _create_completion의 비동기 버전 (AsyncOpenAI 사용)
+
+        Args:
+            **kwargs: chat.completions.create 인자
+
+        Returns:
+            Any: Chat Completions API 응답
+        """
+        for attempt in range(_MAX_ATTEMPTS):
+            try:
+                return await self.async_client.chat.completions.create(**kwargs)
+            except _TRANSIENT_ERRORS as e:
+                if attempt == _MAX_ATTEMPTS - 1:
+                    raise
+                delay = _retry_delay(attempt)
+                self.logger.warning(
+                    f"Transient API error (attempt {attempt + 1}/{_MAX_ATTEMPTS}): {str(e)}. "
+                    f"Retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+
+    def _make_context_key(self,
+                          system_message: Optional[str],
+                          max_tokens: int,
+                          temperature: float,
+                          response_format: Optional[Dict[str, str]] = None) -> str:
+        """
+        프롬프트 외에 응답에 영향을 주는 요청 조건을 캐시 키로 구성
+
+        Args:
+            system_message: 시스템 메시지
+            max_tokens: 최대 토큰 수
+            temperature: 창의성 수준
+            response_format: API 응답 형식
+
+        Returns:
+            str: 요청 조건 키
+        """
+        format_type = response_format.get('type', '') if response_format else ''
+        return f"{self.model_name}|{max_tokens}|{temperature}|{format_type}|{system_message or ''}"
+
+    def _make_exact_key(self, prompt: str, context_key: str) -> str:
+        """
+        정확 일치 캐시 키 (요청 조건과 프롬프트의 SHA-256 해시) 생성
+
+        Args:
+            prompt: 입력 프롬프트
+            context_key: _make_context_key로 만든 요청 조건 키
+
+        Returns:
+            str: 캐시 키
+        """
+        return hashlib.sha256(f"{context_key}\0{prompt}".encode()).hexdigest()
+
+    def _lookup_cached_response(self, prompt: str, context_key: str) -> Tuple[Optional[str], Optional[np.ndarray]]:
+        """
+        정확 일치 캐시, 의미 캐시 순으로 응답 조회
+
+        Args:
+            prompt: 입력 프롬프트
+            context_key: _make_context_key로 만든 요청 조건 키
+
+        Returns:
+            Tuple[Optional[str], Optional[np.ndarray]]: (캐시된 응답, 저장 시 재사용할 프롬프트 임베딩)
+        """
+        exact_key = self._make_exact_key(prompt, context_key)
+        with self._cache_lock:
+            cached = self._exact_cache.get(exact_key)
+            if cached is not None:
+                self._exact_cache.move_to_end(exact_key)
+                self.cache_stats['exact_hits'] += 1
+                return cached, None
+
+        embedding = None
+        if self.semantic_cache is not None:
+            try:
+                embedding = np.asarray(
+                    self.embeddings_manager.generate_single_embedding(prompt), dtype=np.float32
+                )
+                cached = self.semantic_cache.get(embedding, context_key)
+            except Exception as e:
+                # 의미 캐시 실패는 API 호출로 대체
+                self.logger.warning(f"Semantic cache lookup failed: {str(e)}")
+                cached = None
+
+            if cached is not None:
+                with self._cache_lock:
+                    self.cache_stats['semantic_hits'] += 1
+                return cached, embedding
+
+        with self._cache_lock:
+            self.cache_stats['misses'] += 1
+        return None, embedding
+
+    def _store_cached_response(self,
+                               prompt: str,
+                               context_key: str,
+                               embedding: Optional[np.ndarray],
+                               response: str):
+        """
+        응답을 정확 일치 캐시와 (임베딩이 있으면) 의미 캐시에 저장
+
+        Args:
+            prompt: 입력 프롬프트
+            context_key: _make_context_key로 만든 요청 조건 키
+            embedding: 조회 시 계산한 프롬프트 임베딩
+            response: 저장할 응답
+        """
+        exact_key = self._make_exact_key(prompt, context_key)
+        with self._cache_lock:
+            self._exact_cache[exact_key] = response
+            self._exact_cache.move_to_end(exact_key)
+            while len(self._exact_cache) > self.cache_max_entries:
+                self._exact_cache.popitem(last=False)
+
+        if self.semantic_cache is not None and embedding is not None:
+            self.semantic_cache.set(embedding, context_key, response)
+
+    def _generate_json_until_closed(self, prompt: str, max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """
+        JSON 응답을 스트리밍으로 받아 최상위 객체가 닫힌 지점까지만 파싱
+
+        객체 뒤에 이어지는 설명문 등은 버리되, 사용량 청크(추론 토큰 포함)를 받을 수 있도록
+        스트림은 끝까지 읽습니다.
+
+        Args:
+            prompt: 입력 프롬프트
+            max_tokens: 최대 토큰 수 (None시 기본값 사용)
+
+        Returns:
+            Dict[str, Any]: 파싱된 JSON 객체
+        """
+        messages = self._build_messages(prompt, _JSON_SYSTEM_MESSAGE)
+        prompt_tokens = self._count_messages_tokens(messages)
+
+        start_time = time.time()
+        stream = self._create_completion(
+            model=self.model_name,
+            messages=messages,
+            max_tokens=max_tokens or self.max_tokens,
+            temperature=self.temperature,
+            n=1,
+            stop=None,
+            response_format=self._json_response_format or openai.NOT_GIVEN,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+
+        tracker = _JsonObjectTracker()
+        pieces = []
+        closed = False
+        usage_recorded = False
+        try:
+            for chunk in stream:
+                if getattr(chunk, 'usage', None) is not None:
+                    self._record_completion(chunk, prompt_tokens, start_time)
+                    usage_recorded = True
+                # 객체가 닫힌 뒤에는 사용량 청크가 올 때까지 내용만 건너뜀
+                if closed or not chunk.choices:
+                    continue
+
+                content = chunk.choices[0].delta.content
+                if not content:
+                    continue
+
+                end = tracker.feed(content)
+                if end is not None:
+                    pieces.append(content[:end])
+                    closed = True
+                    continue
+                pieces.append(content)
+        finally:
+            if hasattr(stream, 'close'):
+                stream.close()
+
+        response_text = "".join(pieces)
+
+        # 사용량 청크를 보내지 않은 스트림은 받은 텍스트로 추정
+        if not usage_recorded:
+            completion_tokens = len(self.encoding.encode(response_text))
+            self._update_usage_stats(prompt_tokens, completion_tokens, prompt_tokens + completion_tokens)
+            self.logger.info(
+                f"Generated response: {prompt_tokens} prompt + ~{completion_tokens} completion tokens "
+                f"in {time.time() - start_time:.2f}s (no usage chunk in stream)"
+            )
+
+        return self._parse_json_response(response_text, repair=not self.supports_json_mode)
+
+    def _record_completion(self, response: Any, prompt_tokens: int, start_time: float):
+        """
+        API 응답의 사용량을 통계에 반영하고 로그 기록
+
+        Args:
+            response: Chat Completions API 응답
+            prompt_tokens: 추정 프롬프트 토큰 수
+            start_time: 요청 시작 시각
+        """
+        completion_tokens = response.usage.completion_tokens
+        total_tokens = response.usage.total_tokens
+
+        # 사용량 업데이트
+        self._update_usage_stats(prompt_tokens, completion_tokens, total_tokens)
+
+        response_time = time.time() - start_time
+        self.logger.info(
+            f"Generated response: {prompt_tokens} prompt + {completion_tokens} completion tokens "
+            f"in {response_time:.2f}s"
+        )
+
+    def _parse_json_response(self, response_text: str, repair: bool = True) -> Dict[str, Any]:
+        """
+        JSON 응답 파싱 (실패 시 코드 블록 등을 정리한 뒤 재시도)
+
+        Args:
+            response_text: LLM 응답 텍스트
+            repair: 파싱 실패 시 복구를 시도할지 여부 (JSON 모드 응답은 복구 불필요)
+
+        Returns:
+            Dict[str, Any]: 파싱된 JSON 객체
+        """
+        try:
+            return orjson.loads(response_text) if orjson is not None else json.loads(response_text)
+        except ValueError as e:  # orjson.JSONDecodeError, json.JSONDecodeError 모두 ValueError 하위 클래스
+            if not repair:
+                raise
+            # JSON 파싱 실패 시 재시도
+            self.logger.warning(f"JSON parsing failed: {str(e)}")
+
+            if json_repair is not None:
+                # 코드 블록, 후행 쉼표, 앞뒤 설명문 등 LLM 응답의 흔한 오류를 복구
+                repaired = json_repair.loads(response_text)
+                if isinstance(repaired, (dict, list)):
+                    return repaired
+                raise ValueError(f"Could not repair JSON response: {str(e)}")
+
+            # 간단한 JSON 수정 시도
+            cleaned_response = self._clean_json_response(response_text)
+            try:
+                return json.loads(cleaned_response)
+            except ValueError:
+                # 앞뒤 설명문이 붙은 경우 첫 '{'부터 중괄호 짝이 맞는 객체 하나만 디코딩
+                start = cleaned_response.find('{')
+                if start == -1:
+                    raise
+                return _JSON_DECODER.raw_decode(cleaned_response, start)[0]
+
     def _count_messages_tokens(self, messages: List[Dict[str, str]]) -> int:
         """
         메시지 리스트의 토큰 수 계산
@@ -255,16 +1261,43 @@ class LLMClient:
             int: 토큰 수
         """
         num_tokens = 0
+        texts = []
         for message in messages:
-            num_tokens += 4  # 메시지당 기본 토큰
-            for key, value in message.items():
-                num_tokens += len(self.encoding.encode(value))
-                if key == "name":
-                    num_tokens += -1  # name 필드는 1 토큰 감소
+            if message.get("role") == "system" and len(message) == 2:
+                # 고정된 시스템 메시지는 토큰 수를 한 번만 계산
+                num_tokens += self._system_message_tokens(message["content"])
+            else:
+                texts.extend(message.values())
+
+        # encode_batch는 호출마다 스레드 풀을 만들기 때문에 문자열이 많을 때만 사용
+        if len(texts) >= _BATCH_ENCODE_MIN_TEXTS:
+            token_lists = self.encoding.encode_batch(texts, num_threads=min(8, len(texts)))
+        else:
+            token_lists = map(self.encoding.encode, texts)
 
+        num_tokens += sum(map(len, token_lists))
+        num_tokens += 4 * len(messages)  # 메시지당 기본 토큰
+        num_tokens -= sum(1 for message in messages if "name" in message)  # name 필드는 1 토큰 감소
         num_tokens += 2  # 어시스턴트 응답을 위한 준비 토큰
         return num_tokens
 
+    def _system_message_tokens(self, content: str) -> int:
+        """
+        시스템 메시지의 역할/내용 토큰 수 (메모이즈)
+
+        Args:
+            content: 시스템 메시지 내용
+
+        Returns:
+            int: 토큰 수
+        """
+        num_tokens = self._sys_tok_cache.get(content)
+        if num_tokens is None:
+            num_tokens = len(self.encoding.encode("system")) + len(self.encoding.encode(content))
+            if len(self._sys_tok_cache) < _MAX_MEMOIZED_SYSTEM_MESSAGES:
+                self._sys_tok_cache[content] = num_tokens
+        return num_tokens
+
     def _update_usage_stats(self, prompt_tokens: int, completion_tokens: int, total_tokens: int):
         """
         사용량 통계 업데이트
@@ -274,26 +1307,30 @@ class LLMClient:
             completion_tokens: 완료 토큰 수
             total_tokens: 총 토큰 수
         """
-        # 기본 통계 업데이트
-        self.usage_stats['total_requests'] += 1
-        self.usage_stats['total_prompt_tokens'] += prompt_tokens
-        self.usage_stats['total_completion_tokens'] += completion_tokens
-
-        # 비용 계산
-        pricing = self.pricing.get(self.model_name, self.pricing['gpt-5-mini'])
-        prompt_cost = (prompt_tokens / 1000) * pricing['prompt']
-        completion_cost = (completion_tokens / 1000) * pricing['completion']
-        self.usage_stats['total_cost_usd'] += prompt_cost + completion_cost
-
-        # 시간 기록
-        now = datetime.now()
-        self.usage_stats['last_request_time'] = now.isoformat()
-
-        # 시간당 요청 수 추적
-        hour_key = now.strftime('%Y-%m-%d %H')
-        self.usage_stats['requests_by_hour'][hour_key] = (
-            self.usage_stats['requests_by_hour'].get(hour_key, 0) + 1
-        )
+        now = time.time()
+        epoch_hour = int(now) // 3600
+        slot = epoch_hour % _HOURLY_WINDOW
+
+        with self._usage_lock:
+            # 기본 통계 업데이트
+            self.usage_stats['total_requests'] += 1
+            self.usage_stats['total_prompt_tokens'] += prompt_tokens
+            self.usage_stats['total_completion_tokens'] += completion_tokens
+
+            # 비용 계산
+            self.usage_stats['total_cost_usd'] += (
+                prompt_tokens * self._prompt_price_per_tok
+                + completion_tokens * self._completion_price_per_tok
+            )
+
+            # 시간 기록
+            self.usage_stats['last_request_time'] = datetime.fromtimestamp(now).isoformat()
+
+            # 시간당 요청 수 추적 (칸이 이전 주기의 시간이면 초기화 후 재사용)
+            if self._bucket_hours[slot] != epoch_hour:
+                self._bucket_hours[slot] = epoch_hour
+                self._hour_buckets[slot] = 0
+            self._hour_buckets[slot] += 1
 
     def _clean_json_response(self, response: str) -> str:
         """
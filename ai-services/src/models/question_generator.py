@@ -1,38 +1,151 @@
-from typing import Dict, List, Optional, Any
-import json
+from typing import Deque, Dict, FrozenSet, List, Optional, Any, Tuple
+import asyncio
+import hashlib
+import itertools
 import logging
-import re
+import string
+import threading
+import time
+from collections import Counter, OrderedDict, deque
 from datetime import datetime
+from functools import lru_cache
 
-from .llm_client import LLMClient
+import numpy as np
+
+from .llm_client import LLMClient, SemanticCache
 from ..rag.retriever import RAGRetriever
 
 
+@lru_cache(maxsize=1)
+def _iso_timestamp(epoch_seconds: int) -> str:
+    """초 단위 ISO 타임스탬프 (같은 초 안에 생성된 문제는 포맷 결과 재사용)"""
+    return datetime.fromtimestamp(epoch_seconds).isoformat()
+
+
 class QuestionGenerator:
     """5지선다 문제 생성기"""
 
+    # 난이도별 출제 기준
+    _DIFFICULTY_GUIDELINES = {
+        'easy': '기본 개념 이해 확인, 단순 암기, 용어 정의',
+        'medium': '개념 적용 및 계산, 예제 문제 응용',
+        'hard': '복합적 사고 및 응용, 심화 분석, 문제 해결'
+    }
+
+    # 배치 생성 시 문제당 컨텍스트 문서 수와 한 번에 검색할 최대 문서 수
+    CONTEXT_DOCS_PER_QUESTION = 3
+    MAX_BATCH_CONTEXT_DOCS = 15
+
+    # validate_question 검증 기준
+    _REQUIRED_FIELDS = frozenset({
+        'title', 'description', 'content', 'type', 'difficulty', 'subject',
+        'gradeLevel', 'unit', 'options', 'correctAnswer', 'explanation',
+        'hints', 'tags', 'points', 'timeLimit', 'isAIGenerated'
+    })
+    _TEXT_FIELDS = ('title', 'content', 'explanation')
+    _DIFFICULTY_SET = frozenset({'easy', 'medium', 'hard'})
+    _TYPE_SET = frozenset({'multiple_choice', 'short_answer', 'essay'})
+    _ANSWER_SET = frozenset({'1', '2', '3', '4', '5'})
+
+    # 문제마다 검색 결과가 달라지도록 쿼리 뒤에 붙이는 키워드
+    _QUERY_SUFFIXES = ('개념', '예제', '응용', '문제', '정의', '계산', '공식', '원리')
+
+    # 문제 생성 프롬프트 템플릿 (subject, unit, difficulty, context, difficulty_guide를 채워 사용)
+    _PROMPT_TEMPLATE = """당신은 중학교 {subject} 과목의 전문 교사입니다.
+다음 교과서 내용을 바탕으로 {difficulty} 난이도의 5지선다 문제를 1개 생성해주세요.
+
+교과서 내용:
+{context}
+
+문제 생성 규칙:
+1. 교과서 내용에 직접 관련된 문제.
+2. 중학교 1학년 수준에 맞는 명확한 문제.
+3. 5개의 선택지 (정답 1개, 매력적인 오답 4개).
+4. 상세하고 교육적인 해설.
+5. 문제 해결에 도움이 되는 힌트 목록 (최소 1개 이상).
+6. 문제의 핵심 내용을 담은 간결한 제목.
+7. 문제에 대한 부가적인 설명 (description).
+8. 관련 개념을 나타내는 태그 목록 (최소 1개 이상).
+9. 모든 내용은 한국어로 작성.
+
+난이도 기준 ({difficulty}):
+{difficulty_guide}
+
+출력 형식 (JSON만 출력, 다른 설명 없이 JSON 객체만 반환):
+{{
+    "title": "문제의 간결한 제목",
+    "description": "문제에 대한 부가적인 설명입니다.",
+    "content": "여기에 문제의 본문을 작성합니다.",
+    "options": ["1번 선택지", "2번 선택지", "3번 선택지", "4번 선택지", "5번 선택지"],
+    "correct_answer": 정답_번호(1-5 사이의 숫자),
+    "explanation": "정답에 대한 상세하고 친절한 해설입니다.",
+    "hints": ["문제 해결에 도움이 되는 첫 번째 힌트"],
+    "tags": ["관련_태그_1"]
+}}
+"""
+
+    # 템플릿을 (고정 문자열, 채울 필드명) 조각으로 미리 나눠 두고 호출 시 str.join으로 조립
+    _PROMPT_SEGMENTS = tuple(
+        (literal, field) for literal, field, _, _ in string.Formatter().parse(_PROMPT_TEMPLATE)
+    )
+
     def __init__(self,
                  llm_client: LLMClient,
-                 retriever: RAGRetriever):
+                 retriever: RAGRetriever,
+                 max_concurrency: int = 8,
+                 context_cache_size: int = 256,
+                 question_cache: bool = False,
+                 similarity_threshold: float = 0.95,
+                 cache_size: int = 256,
+                 min_chunk_overlap: float = 0.8):
         """
         QuestionGenerator 초기화
 
         Args:
             llm_client: LLMClient 인스턴스
             retriever: RAGRetriever 인스턴스
+            max_concurrency: 비동기 배치 생성 시 동시에 보낼 최대 LLM 요청 수
+            context_cache_size: (과목, 단원, 검색 쿼리)별로 보관할 검색 컨텍스트 수
+            question_cache: 비슷한 프롬프트로 생성한 문제를 재사용할지 여부
+            similarity_threshold: 문제 캐시 적중으로 판단할 최소 프롬프트 코사인 유사도
+            cache_size: 문제 캐시 최대 저장 항목 수
+            min_chunk_overlap: 문제 캐시 적중에 필요한 근거 문서 ID의 최소 Jaccard 유사도
         """
         self.llm_client = llm_client
         self.retriever = retriever
+        self.max_concurrency = max_concurrency
         self.logger = logging.getLogger(__name__)
 
-        # 생성된 문제 히스토리
-        self.question_history = []
+        # 검색 컨텍스트 캐시 (교과서 데이터가 바뀌면 clear_context_cache로 비움)
+        self.context_cache_size = context_cache_size
+        self._context_cache: OrderedDict = OrderedDict()
+        self._context_cache_lock = threading.Lock()
+
+        # 문제 캐시 (프롬프트 임베딩이 비슷하고 근거 문서가 충분히 겹칠 때만 LLM 응답 재사용)
+        self.question_cache = SemanticCache(
+            threshold=similarity_threshold,
+            max_entries=cache_size,
+            min_grounding_overlap=min_chunk_overlap
+        ) if question_cache else None
+
+        # 생성된 문제 히스토리 (최대 1000개, 초과 시 가장 오래된 문제부터 제거)
+        self.question_history: Deque[Dict[str, Any]] = deque(maxlen=1000)
+        # 히스토리에서 문제가 제거되어도 aiGenerationId가 겹치지 않도록 별도 카운터 사용
+        self._generation_ids = itertools.count(1)
+
+        # 통계 조회가 히스토리 전체를 다시 세지 않도록 추가/제거 시점에 집계 유지
+        self._history_lock = threading.Lock()
+        self._by_subject: Counter = Counter()
+        self._by_difficulty: Counter = Counter()
+        self._by_unit: Counter = Counter()
+        self._generation_times: Deque[str] = deque()
 
     def generate_question(self,
                          subject: str,
                          unit: str,
                          difficulty: str = "medium",
-                         custom_query: Optional[str] = None) -> Dict[str, Any]:
+                         custom_query: Optional[str] = None,
+                         context: Optional[str] = None) -> Dict[str, Any]:
         """
         5지선다 문제 생성
 
@@ -41,57 +154,96 @@ class QuestionGenerator:
             unit: 단원명
             difficulty: 난이도 (easy, medium, hard)
             custom_query: 커스텀 검색 쿼리
+            context: 미리 검색해 둔 컨텍스트 (주어지면 검색 생략)
 
         Returns:
             Dict[str, Any]: 생성된 문제 데이터
         """
         try:
-            # 검색 쿼리 준비
-            if custom_query:
-                search_query = custom_query
-            else:
-                search_query = f"{subject} {unit} 개념"
+            question, error = self._try_generate_question(subject, unit, difficulty, custom_query, context)
+        except Exception as e:
+            self.logger.error("Error generating question: %s", e)
+            raise
 
-            # 관련 컨텍스트 검색
-            retrieved_docs = self.retriever.retrieve_documents(
-                query=search_query,
-                subject=subject,
-                unit=unit,
-                k=3
-            )
+        if question is None:
+            self.logger.error("Error generating question: %s", error)
+            raise ValueError(error)
+        return question
 
-            if not retrieved_docs:
-                raise ValueError(f"No context found for {subject} - {unit}")
+    def _try_generate_question(self,
+                               subject: str,
+                               unit: str,
+                               difficulty: str = "medium",
+                               custom_query: Optional[str] = None,
+                               context: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        문제 1개 생성 (응답 검증 실패는 예외 대신 사유로 반환, 네트워크 오류 등은 그대로 예외 발생)
 
-            # 컨텍스트 포맷팅
-            context = self.retriever.format_context(retrieved_docs)
+        Args:
+            subject: 과목명
+            unit: 단원명
+            difficulty: 난이도 (easy, medium, hard)
+            custom_query: 커스텀 검색 쿼리
+            context: 미리 검색해 둔 컨텍스트 (주어지면 검색 생략)
 
-            # 프롬프트 생성
-            prompt = self._create_question_prompt(
-                subject=subject,
-                unit=unit,
-                difficulty=difficulty,
-                context=context
+        Returns:
+            Tuple[Optional[Dict[str, Any]], Optional[str]]: (생성된 문제 데이터, 실패 사유)
+        """
+        prompt, chunk_ids, embedding, cached = self._prepare_cached_request(
+            subject, unit, difficulty, custom_query, context
+        )
+        if cached is not None:
+            return self._try_finalize_question(cached, subject, unit, difficulty)
+
+        # LLM으로 문제 생성 (JSON 모드 미지원 모델은 객체 뒤의 설명문을 버림)
+        response = self.llm_client.generate_structured_response(
+            prompt=prompt,
+            response_format="json",
+            max_tokens=1500,
+            early_stop=True
+        )
+
+        self._store_cached_question(embedding, subject, unit, difficulty, chunk_ids, response)
+        return self._try_finalize_question(response, subject, unit, difficulty)
+
+    async def generate_question_async(self,
+                                      subject: str,
+                                      unit: str,
+                                      difficulty: str = "medium",
+                                      custom_query: Optional[str] = None,
+                                      context: Optional[str] = None) -> Dict[str, Any]:
+        """
+        5지선다 문제 비동기 생성
+
+        Args:
+            subject: 과목명
+            unit: 단원명
+            difficulty: 난이도 (easy, medium, hard)
+            custom_query: 커스텀 검색 쿼리
+            context: 미리 검색해 둔 컨텍스트 (주어지면 검색 생략)
+
+        Returns:
+            Dict[str, Any]: 생성된 문제 데이터
+        """
+        try:
+            # 검색과 캐시 조회는 동기 API이므로 스레드에서 실행
+            prompt, chunk_ids, embedding, cached = await asyncio.to_thread(
+                self._prepare_cached_request, subject, unit, difficulty, custom_query, context
             )
+            if cached is not None:
+                return self._finalize_question(cached, subject, unit, difficulty)
 
-            # LLM으로 문제 생성
-            response = self.llm_client.generate_structured_response(
+            response = await self.llm_client.generate_structured_response_async(
                 prompt=prompt,
                 response_format="json",
                 max_tokens=1500
             )
 
-            # 응답 검증 및 후처리
-            validated_question = self._validate_and_clean_question(response, subject, unit, difficulty)
-
-            # 히스토리에 추가
-            self._add_to_history(validated_question)
-
-            self.logger.info(f"Generated question for {subject} - {unit} ({difficulty})")
-            return validated_question
+            self._store_cached_question(embedding, subject, unit, difficulty, chunk_ids, response)
+            return self._finalize_question(response, subject, unit, difficulty)
 
         except Exception as e:
-            self.logger.error(f"Error generating question: {str(e)}")
+            self.logger.error("Error generating question: %s", e)
             raise
 
     def generate_batch_questions(self,
@@ -102,6 +254,9 @@ class QuestionGenerator:
         """
         배치 문제 생성
 
+        문제 캐시를 쓰지 않으면 단일 배치 LLM 호출로 생성하고,
+        쓰면 캐시를 조회/저장하는 문제별 요청으로 생성합니다.
+
         Args:
             subject: 과목명
             unit: 단원명
@@ -111,41 +266,222 @@ class QuestionGenerator:
         Returns:
             List[Dict[str, Any]]: 생성된 문제 리스트
         """
+        if self.question_cache is None:
+            return self.generate_batch_questions_fused(subject, unit, count, difficulty)
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # 실행 중인 이벤트 루프가 없으면 문제별 LLM 요청을 동시에 전송
+            return asyncio.run(self.generate_batch_questions_async(subject, unit, count, difficulty))
+
+        # 이벤트 루프 안에서 동기 API가 호출된 경우에는 순차 생성
         try:
             questions = []
             failed_attempts = 0
             max_failures = count * 2  # 실패 허용 횟수
 
             for i in range(count):
-                try:
-                    # 각 문제마다 다른 검색 키워드 사용
-                    custom_query = self._generate_varied_query(subject, unit, i)
+                # 각 문제마다 다른 검색 키워드 사용
+                custom_query = self._generate_varied_query(subject, unit, i)
 
-                    question = self.generate_question(
+                # 검증 실패는 반환값으로 받고, API 오류 등 실제 예외만 잡음
+                try:
+                    question, error = self._try_generate_question(
                         subject=subject,
                         unit=unit,
                         difficulty=difficulty,
                         custom_query=custom_query
                     )
-
-                    questions.append(question)
-                    self.logger.info(f"Generated question {i+1}/{count}")
-
                 except Exception as e:
+                    question, error = None, str(e)
+
+                if question is None:
                     failed_attempts += 1
-                    self.logger.warning(f"Failed to generate question {i+1}: {str(e)}")
+                    self.logger.warning("Failed to generate question %d: %s", i + 1, error)
 
                     if failed_attempts >= max_failures:
                         self.logger.error("Too many failures, stopping batch generation")
                         break
+                    continue
+
+                questions.append(question)
+                self.logger.info("Generated question %d/%d", i + 1, count)
 
-            self.logger.info(f"Batch generation completed: {len(questions)}/{count} questions generated")
+            self.logger.info("Batch generation completed: %d/%d questions generated", len(questions), count)
             return questions
 
         except Exception as e:
-            self.logger.error(f"Error in batch question generation: {str(e)}")
+            self.logger.error("Error in batch question generation: %s", e)
             raise
 
+    def generate_batch_questions_fused(self,
+                                       subject: str,
+                                       unit: str,
+                                       count: int = 5,
+                                       difficulty: str = "medium") -> List[Dict[str, Any]]:
+        """
+        배치 문제 생성 (단일 배치 LLM 호출)
+
+        컨텍스트를 한 번에 검색해 문제별로 나눈 뒤 모든 프롬프트를
+        llm_client.generate_structured_responses_batch로 한 번에 요청합니다.
+        요청이나 검증에 실패한 문제만 건너뛰고 나머지 응답은 그대로 사용합니다.
+        문제 캐시는 조회/저장하지 않으므로 generate_batch_questions는 캐시를 쓰지 않을 때만 이 경로를 사용합니다.
+
+        Args:
+            subject: 과목명
+            unit: 단원명
+            count: 생성할 문제 수
+            difficulty: 난이도
+
+        Returns:
+            List[Dict[str, Any]]: 생성된 문제 리스트
+        """
+        try:
+            contexts = self._prefetch_batch_contexts(subject, unit, count)
+        except Exception as e:
+            self.logger.warning("Failed to retrieve batch context: %s", e)
+            contexts = []
+
+        prompts = [
+            self._create_question_prompt(subject=subject, unit=unit, difficulty=difficulty, context=context)
+            for context in contexts
+        ]
+
+        if not prompts:
+            self.logger.error("No prompts prepared, stopping batch generation")
+            return []
+
+        responses = self.llm_client.generate_structured_responses_batch(
+            prompts=prompts,
+            response_format="json",
+            max_tokens=1500,
+            return_exceptions=True
+        )
+
+        return self._finalize_batch_responses(responses, subject, unit, count, difficulty)
+
+    async def generate_batch_questions_async(self,
+                                             subject: str,
+                                             unit: str,
+                                             count: int = 5,
+                                             difficulty: str = "medium") -> List[Dict[str, Any]]:
+        """
+        비동기 배치 문제 생성
+
+        컨텍스트를 한 번에 검색해 문제별로 나눈 뒤, 네트워크 대기가 대부분인
+        LLM 요청을 최대 max_concurrency개까지 동시에 보내고 실패한 문제는 건너뜁니다.
+
+        Args:
+            subject: 과목명
+            unit: 단원명
+            count: 생성할 문제 수
+            difficulty: 난이도
+
+        Returns:
+            List[Dict[str, Any]]: 생성된 문제 리스트
+        """
+        try:
+            contexts = await asyncio.to_thread(self._prefetch_batch_contexts, subject, unit, count)
+        except Exception as e:
+            self.logger.warning("Failed to retrieve batch context: %s", e)
+            return []
+
+        # 문제 캐시를 쓰지 않으면 모든 프롬프트를 미리 만들어 한 번의 배치 호출로 요청
+        if self.question_cache is None:
+            return await self._generate_batch_from_contexts_async(subject, unit, count, difficulty, contexts)
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [
+            self._generate_one_async(
+                semaphore,
+                subject=subject,
+                unit=unit,
+                difficulty=difficulty,
+                context=context
+            )
+            for context in contexts
+        ]
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        questions = []
+        for i, result in enumerate(results):
+            if isinstance(result, Exception):
+                self.logger.warning("Failed to generate question %d: %s", i + 1, result)
+                continue
+            questions.append(result)
+
+        self.logger.info("Batch generation completed: %d/%d questions generated", len(questions), count)
+        return questions
+
+    async def _generate_batch_from_contexts_async(self,
+                                                  subject: str,
+                                                  unit: str,
+                                                  count: int,
+                                                  difficulty: str,
+                                                  contexts: List[str]) -> List[Dict[str, Any]]:
+        """
+        미리 나눈 컨텍스트로 프롬프트를 모두 만든 뒤 단일 배치 LLM 호출로 문제 생성
+
+        Args:
+            subject: 과목명
+            unit: 단원명
+            count: 생성할 문제 수
+            difficulty: 난이도
+            contexts: 문제별 컨텍스트 리스트
+
+        Returns:
+            List[Dict[str, Any]]: 검증을 통과한 문제 리스트
+        """
+        prompts = [
+            self._create_question_prompt(subject=subject, unit=unit, difficulty=difficulty, context=context)
+            for context in contexts
+        ]
+
+        responses = await self.llm_client.generate_structured_responses_batch_async(
+            prompts=prompts,
+            response_format="json",
+            max_tokens=1500,
+            concurrency=self.max_concurrency,
+            return_exceptions=True
+        )
+
+        return self._finalize_batch_responses(responses, subject, unit, count, difficulty)
+
+    def _finalize_batch_responses(self,
+                                  responses: List[Any],
+                                  subject: str,
+                                  unit: str,
+                                  count: int,
+                                  difficulty: str) -> List[Dict[str, Any]]:
+        """
+        배치 LLM 응답을 문제로 정리 (요청이나 검증에 실패한 자리는 건너뜀)
+
+        Args:
+            responses: 프롬프트 순서대로의 응답 리스트 (실패한 자리는 예외 객체)
+            subject: 과목명
+            unit: 단원명
+            count: 생성할 문제 수
+            difficulty: 난이도
+
+        Returns:
+            List[Dict[str, Any]]: 검증을 통과한 문제 리스트
+        """
+        questions = []
+        for i, response in enumerate(responses):
+            if isinstance(response, Exception):
+                question, error = None, str(response)
+            else:
+                question, error = self._try_finalize_question(response, subject, unit, difficulty)
+            if question is None:
+                self.logger.warning("Failed to generate question %d: %s", i + 1, error)
+                continue
+            questions.append(question)
+
+        self.logger.info("Batch generation completed: %d/%d questions generated", len(questions), count)
+        return questions
+
     def validate_question(self, question_data: Dict[str, Any]) -> bool:
         """
         문제 데이터 검증 (모든 필드 필수)
@@ -157,21 +493,15 @@ class QuestionGenerator:
             bool: 유효성 여부
         """
         try:
-            # 모든 필드를 필수로 간주
-            required_fields = [
-                'title', 'description', 'content', 'type', 'difficulty', 'subject',
-                'gradeLevel', 'unit', 'options', 'correctAnswer', 'explanation',
-                'hints', 'tags', 'points', 'timeLimit', 'isAIGenerated'
-            ]
-
-            # 필수 필드 존재 여부 확인
-            for field in required_fields:
-                if field not in question_data or question_data[field] is None:
-                    self.logger.error(f"Missing required field: {field}")
-                    return False
+            # 필수 필드 존재 여부 확인 (모든 필드를 필수로 간주)
+            missing = self._REQUIRED_FIELDS - question_data.keys()
+            missing.update(field for field in self._REQUIRED_FIELDS - missing if question_data[field] is None)
+            if missing:
+                self.logger.error("Missing required field: %s", ', '.join(sorted(missing)))
+                return False
 
             # 내용 확인 (비어 있으면 안 됨)
-            if not all(question_data[f].strip() for f in ['title', 'content', 'explanation']):
+            if not all(question_data[f].strip() for f in self._TEXT_FIELDS):
                 self.logger.error("Title, content, or explanation is empty")
                 return False
             
@@ -191,14 +521,14 @@ class QuestionGenerator:
 
             # 정답 확인 (문자열 형태의 숫자 1-5)
             correct_answer = question_data['correctAnswer']
-            if not isinstance(correct_answer, str) or not correct_answer.isdigit() or not 1 <= int(correct_answer) <= 5:
+            if correct_answer not in self._ANSWER_SET:
                 self.logger.error("Correct answer must be a string representing an integer between 1 and 5")
                 return False
 
             # JSON 형태의 리스트 필드 확인 (비어 있으면 안 됨)
             for field in ['hints', 'tags']:
                 if not isinstance(question_data[field], list) or not question_data[field]:
-                    self.logger.error(f"Field '{field}' must be a non-empty list")
+                    self.logger.error("Field '%s' must be a non-empty list", field)
                     return False
 
             # 숫자형 필드 확인
@@ -207,19 +537,46 @@ class QuestionGenerator:
                 return False
 
             # 기타 필드 확인
-            if question_data['difficulty'] not in ['easy', 'medium', 'hard']:
+            if question_data['difficulty'] not in self._DIFFICULTY_SET:
                 self.logger.error("Difficulty must be 'easy', 'medium', or 'hard'")
                 return False
-            if question_data['type'] not in ['multiple_choice', 'short_answer', 'essay']:
+            if question_data['type'] not in self._TYPE_SET:
                 self.logger.error("Invalid problem type")
                 return False
 
             return True
 
         except Exception as e:
-            self.logger.error(f"Error validating question: {str(e)}")
+            self.logger.error("Error validating question: %s", e)
             return False
 
+    @staticmethod
+    def _build_statistics(total_questions: int,
+                          by_subject: Dict[str, int],
+                          by_difficulty: Dict[str, int],
+                          by_unit: Dict[str, int],
+                          generation_times: List[str]) -> Dict[str, Any]:
+        """집계 값을 get_question_statistics() 반환 형식으로 묶기"""
+        return {
+            'total_questions': total_questions,
+            'by_subject': dict(by_subject),
+            'by_difficulty': dict(by_difficulty),
+            'by_unit': dict(by_unit),
+            'generation_times': list(generation_times)
+        }
+
+    @classmethod
+    def empty_statistics(cls) -> Dict[str, Any]:
+        """
+        생성한 문제가 없을 때의 통계 반환
+
+        생성기를 만들지 않고도 get_question_statistics()와 같은 키 구성을 얻을 때 사용한다.
+
+        Returns:
+            Dict[str, Any]: 비어 있는 통계 정보
+        """
+        return cls._build_statistics(0, {}, {}, {}, [])
+
     def get_question_statistics(self) -> Dict[str, Any]:
         """
         문제 생성 통계 반환
@@ -227,41 +584,292 @@ class QuestionGenerator:
         Returns:
             Dict[str, Any]: 통계 정보
         """
-        if not self.question_history:
-            return {
-                'total_questions': 0,
-                'by_subject': {},
-                'by_difficulty': {},
-                'by_unit': {},
-                'generation_times': []
-            }
-
-        stats = {
-            'total_questions': len(self.question_history),
-            'by_subject': {},
-            'by_difficulty': {},
-            'by_unit': {},
-            'generation_times': []
-        }
+        # 집계는 _add_to_history에서 미리 갱신해 두므로 히스토리를 다시 순회하지 않음
+        with self._history_lock:
+            return self._build_statistics(
+                len(self.question_history),
+                self._by_subject,
+                self._by_difficulty,
+                self._by_unit,
+                self._generation_times
+            )
 
-        for question in self.question_history:
-            # 과목별 통계
-            subject = question.get('subject', 'Unknown')
-            stats['by_subject'][subject] = stats['by_subject'].get(subject, 0) + 1
+    def clear_context_cache(self):
+        """검색 컨텍스트 캐시와 문제 캐시 비우기 (교과서 데이터 변경 시 호출)"""
+        with self._context_cache_lock:
+            self._context_cache.clear()
+        if self.question_cache is not None:
+            self.question_cache.clear()
+
+    async def _generate_one_async(self,
+                                  semaphore: asyncio.Semaphore,
+                                  subject: str,
+                                  unit: str,
+                                  difficulty: str,
+                                  custom_query: Optional[str] = None,
+                                  context: Optional[str] = None) -> Dict[str, Any]:
+        """
+        세마포어로 동시 요청 수를 제한하며 문제 1개를 비동기로 생성
 
-            # 난이도별 통계
-            difficulty = question.get('difficulty', 'Unknown')
-            stats['by_difficulty'][difficulty] = stats['by_difficulty'].get(difficulty, 0) + 1
+        Args:
+            semaphore: 동시 LLM 요청 수 제한용 세마포어
+            subject: 과목명
+            unit: 단원명
+            difficulty: 난이도
+            custom_query: 커스텀 검색 쿼리
+            context: 미리 검색해 둔 컨텍스트
 
-            # 단원별 통계
-            unit = question.get('unit', 'Unknown')
-            stats['by_unit'][unit] = stats['by_unit'].get(unit, 0) + 1
+        Returns:
+            Dict[str, Any]: 생성된 문제 데이터
+        """
+        async with semaphore:
+            return await self.generate_question_async(subject, unit, difficulty, custom_query, context)
+
+    def _prepare_question_prompt(self,
+                                 subject: str,
+                                 unit: str,
+                                 difficulty: str,
+                                 custom_query: Optional[str] = None) -> str:
+        """
+        관련 컨텍스트를 검색하여 문제 생성용 프롬프트 준비
 
-            # 생성 시간
-            if 'createdAt' in question:
-                stats['generation_times'].append(question['createdAt'])
+        Args:
+            subject: 과목명
+            unit: 단원명
+            difficulty: 난이도
+            custom_query: 커스텀 검색 쿼리
+
+        Returns:
+            str: 생성된 프롬프트
+        """
+        return self._prepare_question_request(subject, unit, difficulty, custom_query)[0]
+
+    def _prepare_question_request(self,
+                                  subject: str,
+                                  unit: str,
+                                  difficulty: str,
+                                  custom_query: Optional[str] = None,
+                                  context: Optional[str] = None) -> Tuple[str, FrozenSet[str]]:
+        """
+        문제 생성용 프롬프트와 근거 문서 ID 집합 준비
+
+        Args:
+            subject: 과목명
+            unit: 단원명
+            difficulty: 난이도
+            custom_query: 커스텀 검색 쿼리
+            context: 미리 검색해 둔 컨텍스트 (주어지면 검색 생략)
+
+        Returns:
+            Tuple[str, FrozenSet[str]]: (프롬프트, 근거 문서 ID 집합)
+        """
+        if context is not None:
+            # 미리 검색한 컨텍스트는 컨텍스트 전체를 하나의 근거로 취급
+            chunk_ids = self._content_ids([context]) if self.question_cache is not None else frozenset()
+        else:
+            # 검색 쿼리 준비
+            if custom_query:
+                search_query = custom_query
+            else:
+                search_query = f"{subject} {unit} 개념"
+
+            context, chunk_ids = self._get_context(subject, unit, search_query)
+
+        prompt = self._create_question_prompt(
+            subject=subject,
+            unit=unit,
+            difficulty=difficulty,
+            context=context
+        )
+        return prompt, chunk_ids
+
+    def _prepare_cached_request(self,
+                                subject: str,
+                                unit: str,
+                                difficulty: str,
+                                custom_query: Optional[str] = None,
+                                context: Optional[str] = None
+                                ) -> Tuple[str, FrozenSet[str], Optional[np.ndarray], Optional[Dict[str, Any]]]:
+        """
+        프롬프트를 준비하고 문제 캐시에서 재사용할 수 있는 LLM 응답 조회
+
+        Args:
+            subject: 과목명
+            unit: 단원명
+            difficulty: 난이도
+            custom_query: 커스텀 검색 쿼리
+            context: 미리 검색해 둔 컨텍스트
+
+        Returns:
+            Tuple: (프롬프트, 근거 문서 ID 집합, 프롬프트 임베딩, 캐시된 응답)
+        """
+        prompt, chunk_ids = self._prepare_question_request(subject, unit, difficulty, custom_query, context)
+        if self.question_cache is None:
+            return prompt, chunk_ids, None, None
+
+        try:
+            embedding = np.asarray(
+                self.retriever.embeddings_manager.generate_single_embedding(prompt), dtype=np.float32
+            )
+        except Exception as e:
+            # 캐시 조회 실패는 LLM 호출로 대체
+            self.logger.warning("Question cache lookup failed: %s", e)
+            return prompt, chunk_ids, None, None
+
+        cached = self.question_cache.get(embedding, f"{subject}|{unit}|{difficulty}", grounding=chunk_ids)
+        if cached is not None:
+            self.logger.info("Reusing cached question for %s - %s (%s)", subject, unit, difficulty)
+        return prompt, chunk_ids, embedding, cached
+
+    def _store_cached_question(self,
+                               embedding: Optional[np.ndarray],
+                               subject: str,
+                               unit: str,
+                               difficulty: str,
+                               chunk_ids: FrozenSet[str],
+                               response: Dict[str, Any]):
+        """LLM 응답을 문제 캐시에 저장 (캐시 미사용 또는 임베딩이 없으면 무시)"""
+        if self.question_cache is not None and embedding is not None:
+            self.question_cache.set(embedding, f"{subject}|{unit}|{difficulty}", response, grounding=chunk_ids)
+
+    def _prefetch_batch_contexts(self, subject: str, unit: str, count: int) -> List[str]:
+        """
+        배치 전체에 쓸 문서를 한 번만 검색해 문제별 컨텍스트로 나눔
+
+        문제마다 검색 쿼리를 바꿔 count번 검색하는 대신 (과목, 단원)으로 한 번에
+        최대 15개 문서를 가져와, 문제마다 3개씩 순서대로(부족하면 순환하며) 배정합니다.
+
+        Args:
+            subject: 과목명
+            unit: 단원명
+            count: 생성할 문제 수
+
+        Returns:
+            List[str]: 문제별 포맷팅된 컨텍스트 리스트
+        """
+        k = min(self.CONTEXT_DOCS_PER_QUESTION * count, self.MAX_BATCH_CONTEXT_DOCS)
+        retrieved_docs = self.retriever.retrieve_documents(
+            query=f"{subject} {unit}",
+            subject=subject,
+            unit=unit,
+            k=k,
+            candidates=max(10, k)
+        )
+
+        if not retrieved_docs:
+            raise ValueError(f"No context found for {subject} - {unit}")
+
+        total = len(retrieved_docs)
+        window = min(self.CONTEXT_DOCS_PER_QUESTION, total)
+        return [
+            self.retriever.format_context([
+                retrieved_docs[(i * self.CONTEXT_DOCS_PER_QUESTION + j) % total] for j in range(window)
+            ])
+            for i in range(count)
+        ]
+
+    @staticmethod
+    def _content_ids(contents) -> FrozenSet[str]:
+        """문서 내용 해시로 근거 문서 ID 집합 생성"""
+        return frozenset(
+            hashlib.blake2b(content.encode('utf-8'), digest_size=8).hexdigest() for content in contents
+        )
+
+    def _get_context(self, subject: str, unit: str, search_query: str) -> Tuple[str, FrozenSet[str]]:
+        """
+        검색 쿼리에 대한 포맷팅된 컨텍스트 반환 (캐시에 있으면 검색 생략)
+
+        Args:
+            subject: 과목명
+            unit: 단원명
+            search_query: 검색 쿼리
+
+        Returns:
+            Tuple[str, FrozenSet[str]]: (포맷팅된 컨텍스트, 근거 문서 ID 집합)
+        """
+        key = (subject, unit, search_query)
+        with self._context_cache_lock:
+            cached = self._context_cache.get(key)
+            if cached is not None:
+                self._context_cache.move_to_end(key)
+                return cached
+
+        # 관련 컨텍스트 검색
+        retrieved_docs = self.retriever.retrieve_documents(
+            query=search_query,
+            subject=subject,
+            unit=unit,
+            k=3
+        )
+
+        if not retrieved_docs:
+            raise ValueError(f"No context found for {subject} - {unit}")
+
+        # 컨텍스트 포맷팅
+        context = self.retriever.format_context(retrieved_docs)
+
+        # 문제 캐시의 근거 확인용 문서 ID (문서 내용 해시)
+        chunk_ids = (
+            self._content_ids(doc.content for doc in retrieved_docs)
+            if self.question_cache is not None else frozenset()
+        )
+
+        with self._context_cache_lock:
+            self._context_cache[key] = (context, chunk_ids)
+            self._context_cache.move_to_end(key)
+            while len(self._context_cache) > self.context_cache_size:
+                self._context_cache.popitem(last=False)
+
+        return context, chunk_ids
+
+    def _finalize_question(self,
+                           response: Dict[str, Any],
+                           subject: str,
+                           unit: str,
+                           difficulty: str) -> Dict[str, Any]:
+        """
+        LLM 응답을 검증하고 히스토리에 추가
+
+        Args:
+            response: LLM 응답
+            subject: 과목명
+            unit: 단원명
+            difficulty: 난이도
+
+        Returns:
+            Dict[str, Any]: 검증된 문제 데이터
+        """
+        question, error = self._try_finalize_question(response, subject, unit, difficulty)
+        if question is None:
+            raise ValueError(error)
+        return question
+
+    def _try_finalize_question(self,
+                               response: Dict[str, Any],
+                               subject: str,
+                               unit: str,
+                               difficulty: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        LLM 응답을 검증하고 히스토리에 추가 (검증 실패는 예외 대신 사유로 반환)
+
+        Args:
+            response: LLM 응답
+            subject: 과목명
+            unit: 단원명
+            difficulty: 난이도
+
+        Returns:
+            Tuple[Optional[Dict[str, Any]], Optional[str]]: (검증된 문제 데이터, 실패 사유)
+        """
+        validated_question, error = self._clean_question(response, subject, unit, difficulty)
+        if validated_question is None:
+            return None, error
 
-        return stats
+        # 히스토리에 추가
+        self._add_to_history(validated_question)
+
+        self.logger.info("Generated question for %s - %s (%s)", subject, unit, difficulty)
+        return validated_question, None
 
     def _create_question_prompt(self,
                               subject: str,
@@ -280,46 +888,20 @@ class QuestionGenerator:
         Returns:
             str: 생성된 프롬프트
         """
-        difficulty_guidelines = {
-            'easy': '기본 개념 이해 확인, 단순 암기, 용어 정의',
-            'medium': '개념 적용 및 계산, 예제 문제 응용',
-            'hard': '복합적 사고 및 응용, 심화 분석, 문제 해결'
+        values = {
+            'subject': subject,
+            'unit': unit,
+            'difficulty': difficulty,
+            'context': context,
+            'difficulty_guide': self._DIFFICULTY_GUIDELINES.get(difficulty, self._DIFFICULTY_GUIDELINES['medium'])
         }
-        difficulty_guide = difficulty_guidelines.get(difficulty, difficulty_guidelines['medium'])
-
-        prompt = f"""당신은 중학교 {subject} 과목의 전문 교사입니다.
-다음 교과서 내용을 바탕으로 {difficulty} 난이도의 5지선다 문제를 1개 생성해주세요.
 
-교과서 내용:
-{context}
-
-문제 생성 규칙:
-1. 교과서 내용에 직접 관련된 문제.
-2. 중학교 1학년 수준에 맞는 명확한 문제.
-3. 5개의 선택지 (정답 1개, 매력적인 오답 4개).
-4. 상세하고 교육적인 해설.
-5. 문제 해결에 도움이 되는 힌트 목록 (최소 1개 이상).
-6. 문제의 핵심 내용을 담은 간결한 제목.
-7. 문제에 대한 부가적인 설명 (description).
-8. 관련 개념을 나타내는 태그 목록 (최소 1개 이상).
-9. 모든 내용은 한국어로 작성.
-
-난이도 기준 ({difficulty}):
-{difficulty_guide}
-
-출력 형식 (JSON만 출력, 다른 설명 없이 JSON 객체만 반환):
-{{
-    "title": "문제의 간결한 제목",
-    "description": "문제에 대한 부가적인 설명입니다.",
-    "content": "여기에 문제의 본문을 작성합니다.",
-    "options": ["1번 선택지", "2번 선택지", "3번 선택지", "4번 선택지", "5번 선택지"],
-    "correct_answer": 정답_번호(1-5 사이의 숫자),
-    "explanation": "정답에 대한 상세하고 친절한 해설입니다.",
-    "hints": ["문제 해결에 도움이 되는 첫 번째 힌트"],
-    "tags": ["관련_태그_1"]
-}}
-"""
-        return prompt
+        parts = []
+        for literal, field in self._PROMPT_SEGMENTS:
+            parts.append(literal)
+            if field is not None:
+                parts.append(values[field])
+        return ''.join(parts)
 
     def _validate_and_clean_question(self,
                                    response: Dict[str, Any],
@@ -327,7 +909,7 @@ class QuestionGenerator:
                                    unit: str,
                                    difficulty: str) -> Dict[str, Any]:
         """
-        생성된 문제 검증 및 정리 (모든 필드 필수)
+        생성된 문제 검증 및 정리 (검증 실패 시 ValueError 발생)
 
         Args:
             response: LLM 응답
@@ -338,23 +920,80 @@ class QuestionGenerator:
         Returns:
             Dict[str, Any]: 검증 및 변환된 문제 데이터
         """
-        now = datetime.now().isoformat()
-        ai_generation_id = f"{subject}_{unit}_{difficulty}_{len(self.question_history) + 1}"
+        question, error = self._clean_question(response, subject, unit, difficulty)
+        if question is None:
+            raise ValueError(error)
+        return question
+
+    def _clean_question(self,
+                        response: Dict[str, Any],
+                        subject: str,
+                        unit: str,
+                        difficulty: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        생성된 문제 검증 및 정리 (모든 필드 필수, 검증 실패는 예외 대신 사유로 반환)
+
+        Args:
+            response: LLM 응답
+            subject: 과목명
+            unit: 단원명
+            difficulty: 난이도
+
+        Returns:
+            Tuple[Optional[Dict[str, Any]], Optional[str]]: (변환된 문제 데이터, 실패 사유) - 둘 중 하나는 None
+        """
+        # 본문이나 5개 선택지가 없는 응답은 데이터 변환 전에 바로 거부
+        if not isinstance(response, dict):
+            return None, "Malformed LLM response: expected a JSON object"
+        options = response.get('options')
+        content = response.get('content')
+        if not (isinstance(options, list) and len(options) == 5 and isinstance(content, str) and content.strip()):
+            return None, "Malformed LLM response: content and 5 options are required"
+
+        # 필드를 꺼내는 즉시 validate_question과 같은 기준으로 검증 (정리된 dict를 다시 순회하지 않음)
+        if subject is None or unit is None:
+            return None, "Subject and unit are required"
+        if difficulty not in self._DIFFICULTY_SET:
+            return None, "Difficulty must be 'easy', 'medium', or 'hard'"
+
+        content = content.strip()
+        options = self._strip_items(options)
+        if not all(options):
+            return None, "All options must be non-empty strings"
+
+        explanation = response.get('explanation', '')
+        if not (isinstance(explanation, str) and explanation.strip()):
+            return None, "Explanation is empty"
+        explanation = explanation.strip()
 
-        # LLM 응답에서 데이터 추출 및 기본값 설정
-        title = response.get('title', 'Untitled').strip()
-        description = response.get('description', '').strip()
-        content = response.get('content', '').strip()
-        options = response.get('options', [])
-        correct_answer_num = response.get('correct_answer', 1)
-        explanation = response.get('explanation', '').strip()
         hints = response.get('hints', [])
         tags = response.get('tags', [])
+        if not (isinstance(hints, list) and hints and isinstance(tags, list) and tags):
+            return None, "Fields 'hints' and 'tags' must be non-empty lists"
+
+        # 정답 번호 검증 (1-5 사이의 숫자가 아니면 1번으로 대체)
+        correct_answer = str(response.get('correct_answer', 1))  # DB 스키마에 맞춰 문자열로 변환
+        # isdigit()은 '²' 같은 유니코드 숫자도 참이라 int()에서 실패하므로 허용 값 집합으로 확인
+        if correct_answer not in self._ANSWER_SET:
+            correct_answer = '1'
+
+        # 제목이 없으면 내용에서 일부 추출 (content가 비어 있지 않으므로 항상 채워짐)
+        title = response.get('title', 'Untitled')
+        description = response.get('description', '')
+        if not (isinstance(title, str) and isinstance(description, str)):
+            return None, "Title and description must be strings"
+        title = title.strip() or content[:50]
+        description = description.strip()
+
+        now = _iso_timestamp(int(time.time()))
+        # 여러 스레드에서 동시에 생성해도 ID가 겹치지 않도록 히스토리 잠금 안에서 발급
+        with self._history_lock:
+            generation_number = next(self._generation_ids)
 
         # 데이터 변환 및 추가 필드 설정
         problem_data = {
             'id': None,  # DB에서 자동 생성
-            'title': title if title else content[:50], # 제목 없으면 내용에서 일부 추출
+            'title': title,
             'description': description,
             'content': content,
             'type': 'multiple_choice', # 5지선다 유형
@@ -362,16 +1001,16 @@ class QuestionGenerator:
             'subject': subject,
             'gradeLevel': 'Middle-1', # 중학교 1학년으로 가정
             'unit': unit,
-            'options': [str(opt).strip() for opt in options] if isinstance(options, list) else [],
-            'correctAnswer': str(correct_answer_num), # DB 스키마에 맞춰 문자열로 변환
+            'options': options,
+            'correctAnswer': correct_answer,
             'explanation': explanation,
-            'hints': [str(h).strip() for h in hints] if isinstance(hints, list) else [],
-            'tags': [str(t).strip() for t in tags] if isinstance(tags, list) else [],
+            'hints': self._strip_items(hints),
+            'tags': self._strip_items(tags),
             'points': 10, # 기본 점수
             'timeLimit': 60, # 기본 제한 시간 (초)
             'isActive': True,
             'isAIGenerated': True,
-            'aiGenerationId': ai_generation_id,
+            'aiGenerationId': f"{subject}_{unit}_{difficulty}_{generation_number}",
             'qualityScore': None,
             'reviewStatus': 'pending', # 검토 대기 상태
             'reviewedAt': None,
@@ -382,19 +1021,22 @@ class QuestionGenerator:
             'updatedAt': now,
             'deletedAt': None
         }
-        
-        # 정답 번호 검증 (1-5 사이의 숫자인지)
-        try:
-            if not (1 <= int(problem_data['correctAnswer']) <= 5):
-                problem_data['correctAnswer'] = '1'
-        except (ValueError, TypeError):
-            problem_data['correctAnswer'] = '1'
 
-        # 최종 데이터 유효성 검사
-        if not self.validate_question(problem_data):
-            raise ValueError("Generated question failed validation")
+        return problem_data, None
+
+    @staticmethod
+    def _strip_items(values: List[Any]) -> List[str]:
+        """
+        리스트 항목을 문자열로 변환해 앞뒤 공백 제거 (이미 문자열이면 str() 변환 생략)
+
+        Args:
+            values: LLM 응답의 리스트 필드 값
 
-        return problem_data
+        Returns:
+            List[str]: 정리된 문자열 리스트
+        """
+        strip = str.strip
+        return [strip(v) if type(v) is str else strip(str(v)) for v in values]
 
     def _generate_varied_query(self, subject: str, unit: str, index: int) -> str:
         """
@@ -408,18 +1050,7 @@ class QuestionGenerator:
         Returns:
             str: 검색 쿼리
         """
-        query_variations = [
-            f"{subject} {unit} 개념",
-            f"{subject} {unit} 예제",
-            f"{subject} {unit} 응용",
-            f"{subject} {unit} 문제",
-            f"{subject} {unit} 정의",
-            f"{subject} {unit} 계산",
-            f"{subject} {unit} 공식",
-            f"{subject} {unit} 원리"
-        ]
-
-        return query_variations[index % len(query_variations)]
+        return f"{subject} {unit} {self._QUERY_SUFFIXES[index % len(self._QUERY_SUFFIXES)]}"
 
     def _add_to_history(self, question: Dict[str, Any]):
         """
@@ -428,8 +1059,31 @@ class QuestionGenerator:
         Args:
             question: 문제 데이터
         """
-        self.question_history.append(question)
+        with self._history_lock:
+            # 가득 찬 deque는 append 시 가장 오래된 문제를 버리므로 그 문제의 집계를 먼저 되돌림
+            if len(self.question_history) == self.question_history.maxlen:
+                evicted = self.question_history[0]
+                self._update_statistics(evicted, -1)
+                if 'createdAt' in evicted:
+                    self._generation_times.popleft()
+
+            self.question_history.append(question)
+            self._update_statistics(question, 1)
+            if 'createdAt' in question:
+                self._generation_times.append(question['createdAt'])
+
+    def _update_statistics(self, question: Dict[str, Any], delta: int):
+        """
+        문제 하나만큼 항목별 집계 갱신 (_history_lock 보유 상태에서 호출)
 
-        # 히스토리 크기 제한 (최대 1000개)
-        if len(self.question_history) > 1000:
-            self.question_history = self.question_history[-1000:]
\ No newline at end of file
+        Args:
+            question: 문제 데이터
+            delta: 추가 시 1, 제거 시 -1
+        """
+        for counter, field in ((self._by_subject, 'subject'),
+                               (self._by_difficulty, 'difficulty'),
+                               (self._by_unit, 'unit')):
+            key = question.get(field, 'Unknown')
+            counter[key] += delta
+            if counter[key] <= 0:
+                del counter[key]
\ No newline at end of file
@@ -1,4 +1,8 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+import codecs
+import hashlib
+import mmap
+import os
 import re
 from pathlib import Path
 from dataclasses import dataclass
@@ -7,6 +11,30 @@ from PIL import Image
 import pytesseract
 import io
 
+# 전처리에서 제거할 문자 (단어 문자, 공백, 한글, 기본 문장부호 외)
+_DISALLOWED_CHARS_RE = re.compile(r'[^\w\s가-힣.,!?()-]')
+# 연속된 공백/줄바꿈
+_WHITESPACE_RE = re.compile(r'\s+')
+# 한국어 문장 종결 표시
+_SENTENCE_END_RE = re.compile(r'[.!?。]')
+# 텍스트 파일을 한 번에 디코딩/전처리할 크기 (바이트)
+_TEXT_READ_WINDOW = 1 << 20
+
+
+def compute_content_hash(content: str) -> str:
+    """
+    문서 내용의 해시 계산 (중복 제거용)
+
+    hash()와 달리 프로세스가 달라도 같은 값이 나오므로 벡터 저장소 메타데이터에 저장해 둘 수 있습니다.
+
+    Args:
+        content: 문서 내용
+
+    Returns:
+        str: 16바이트 BLAKE2b 다이제스트의 16진수 문자열
+    """
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
 
 @dataclass
 class Document:
@@ -44,16 +72,15 @@ class DocumentProcessor:
             file_suffix = file_path_obj.suffix.lower()
 
             if file_suffix in ['.txt', '.md']:
-                with open(file_path_obj, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                # 원문 전체를 문자열로 올리지 않고 구간별로 디코딩하며 전처리
+                cleaned_text = self._load_text_file(file_path_obj)
             elif file_suffix == '.pdf':
                 content = self._load_pdf_with_ocr(str(file_path_obj))
+                # 텍스트 전처리
+                cleaned_text = self.preprocess_text(content)
             else:
                 raise ValueError(f"Unsupported file format: {file_suffix}")
 
-            # 텍스트 전처리
-            cleaned_text = self.preprocess_text(content)
-
             # 텍스트 청킹
             chunks = self.chunk_text(cleaned_text)
 
@@ -71,6 +98,48 @@ class DocumentProcessor:
         except Exception as e:
             raise Exception(f"Error loading textbook: {str(e)}")
 
+    def _load_text_file(self, file_path: Path, window: int = _TEXT_READ_WINDOW) -> str:
+        """
+        UTF-8 텍스트 파일을 메모리 맵으로 읽어 구간별로 전처리
+
+        파일을 window 바이트씩 디코딩해 전처리하므로 원문 전체의 문자열 사본을 만들지 않습니다.
+        구간은 공백 위치에서 나누므로 결과는 preprocess_text(파일 전체)와 같습니다.
+
+        Args:
+            file_path: 텍스트 파일 경로
+            window: 한 번에 처리할 바이트 수
+
+        Returns:
+            str: 전처리된 텍스트
+        """
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return ""
+
+            decoder = codecs.getincrementaldecoder('utf-8')()
+            cleaned_parts = []
+            carry = ""
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for offset in range(0, size, window):
+                    final = offset + window >= size
+                    text = carry + decoder.decode(mm[offset:offset + window], final=final)
+
+                    if not final:
+                        # 마지막 공백 이후는 다음 구간과 이어질 수 있으므로 넘겨서 함께 처리
+                        cut = max(text.rfind(' '), text.rfind('\n'), text.rfind('\t'), text.rfind('\r'))
+                        if cut <= 0:
+                            carry = text
+                            continue
+                        text, carry = text[:cut], text[cut:]
+
+                    cleaned = self.preprocess_text(text)
+                    if cleaned:
+                        cleaned_parts.append(cleaned)
+
+        return ' '.join(cleaned_parts)
+
     def _load_pdf_with_ocr(self, file_path: str) -> str:
         """
         PDF 파일에서 텍스트를 추출하고, 이미지 기반 페이지는 OCR 처리
@@ -130,45 +199,42 @@ class DocumentProcessor:
         if not text.strip():
             return []
 
-        # 문장 단위로 분할
-        sentences = self._split_into_sentences(text)
+        # 문장을 문자열로 잘라내지 않고 (시작, 끝) 오프셋으로만 다룸
+        spans = self._sentence_spans(text)
 
         chunks = []
-        current_chunk = ""
+        window_start = 0  # 현재 청크에 들어 있는 첫 문장의 인덱스
 
-        for sentence in sentences:
+        for i, (sent_start, sent_end) in enumerate(spans):
             # 문장이 청크 크기보다 크면 강제로 분할
-            if len(sentence) > chunk_size:
+            if sent_end - sent_start > chunk_size:
                 # 현재 청크가 있으면 먼저 저장
-                if current_chunk.strip():
-                    chunks.append(current_chunk.strip())
-                    current_chunk = ""
+                if window_start < i:
+                    chunks.append(text[spans[window_start][0]:spans[i - 1][1]])
 
                 # 긴 문장을 청크 크기로 분할
-                for i in range(0, len(sentence), chunk_size):
-                    chunk_part = sentence[i:i + chunk_size]
-                    chunks.append(chunk_part)
+                for pos in range(sent_start, sent_end, chunk_size):
+                    chunks.append(text[pos:min(pos + chunk_size, sent_end)])
+                window_start = i + 1
                 continue
 
-            # 현재 청크에 문장을 추가했을 때 크기 계산
-            test_chunk = current_chunk + " " + sentence if current_chunk else sentence
-
-            # 청크 크기 초과 시 새로운 청크 시작
-            if len(test_chunk) > chunk_size and current_chunk:
-                chunks.append(current_chunk.strip())
+            # 청크 크기 초과 시 현재 청크를 저장하고 새로운 청크 시작
+            if window_start < i and sent_end - spans[window_start][0] > chunk_size:
+                prev_end = spans[i - 1][1]
+                chunks.append(text[spans[window_start][0]:prev_end])
 
-                # 오버랩 적용
-                if overlap > 0 and len(current_chunk) > overlap:
-                    overlap_text = current_chunk[-overlap:]
-                    current_chunk = overlap_text + " " + sentence
-                else:
-                    current_chunk = sentence
-            else:
-                current_chunk = test_chunk
+                # 오버랩 적용: 이전 청크 끝의 overlap 이내 문장들만 남기고,
+                # 새 문장과 합쳐도 청크 크기를 넘지 않을 때까지 시작을 앞으로 이동
+                window_start += 1
+                while window_start < i and (
+                    prev_end - spans[window_start][0] > overlap
+                    or sent_end - spans[window_start][0] > chunk_size
+                ):
+                    window_start += 1
 
         # 마지막 청크 추가
-        if current_chunk.strip():
-            chunks.append(current_chunk.strip())
+        if window_start < len(spans):
+            chunks.append(text[spans[window_start][0]:spans[-1][1]])
 
         return chunks
 
@@ -182,19 +248,9 @@ class DocumentProcessor:
         Returns:
             str: 전처리된 텍스트
         """
-        # 여러 공백을 하나로 변환
-        text = re.sub(r'\s+', ' ', text)
-
-        # 연속된 줄바꿈 제거
-        text = re.sub(r'\n\s*\n', '\n', text)
-
-        # 특수 문자 정리 (기본적인 정리만)
-        text = re.sub(r'[^\w\s가-힣.,!?()-]', '', text)
-
-        # 앞뒤 공백 제거
-        text = text.strip()
-
-        return text
+        # 특수 문자 정리 (기본적인 정리만) 후 줄바꿈을 포함한 연속 공백을 하나로 변환
+        text = _DISALLOWED_CHARS_RE.sub('', text)
+        return _WHITESPACE_RE.sub(' ', text).strip()
 
     def add_metadata(self, chunks: List[str], metadata: Dict[str, Any]) -> List[Document]:
         """
@@ -214,7 +270,8 @@ class DocumentProcessor:
             chunk_metadata.update({
                 'chunk_index': i,
                 'chunk_size': len(chunk),
-                'total_chunks': len(chunks)
+                'total_chunks': len(chunks),
+                'content_hash': compute_content_hash(chunk)
             })
 
             documents.append(Document(
@@ -232,13 +289,39 @@ class DocumentProcessor:
             text: 입력 텍스트
 
         Returns:
-            List[str]: 문장 리스트
+            List[str]: 문장 리스트 (문장 종결 부호 포함)
         """
-        # 한국어 문장 종결 표시를 기준으로 분할
-        sentence_endings = r'[.!?。]'
-        sentences = re.split(sentence_endings, text)
+        return [text[start:end] for start, end in self._sentence_spans(text)]
 
-        # 빈 문장 제거 및 정리
-        sentences = [s.strip() for s in sentences if s.strip()]
+    def _sentence_spans(self, text: str) -> List[Tuple[int, int]]:
+        """
+        문장별 (시작, 끝) 오프셋 계산
+
+        한국어 문장 종결 표시를 기준으로 나누며, 앞뒤 공백은 제외하고
+        공백뿐인 문장은 건너뜁니다.
 
-        return sentences
\ No newline at end of file
+        Args:
+            text: 입력 텍스트
+
+        Returns:
+            List[Tuple[int, int]]: text[start:end]가 한 문장인 오프셋 리스트
+        """
+        spans = []
+        boundaries = [match.end() for match in _SENTENCE_END_RE.finditer(text)]
+        boundaries.append(len(text))
+
+        start = 0
+        for end in boundaries:
+            sent_start, sent_end = start, end
+            while sent_start < sent_end and text[sent_start].isspace():
+                sent_start += 1
+            while sent_end > sent_start and text[sent_end - 1].isspace():
+                sent_end -= 1
+            # 종결 부호만 남은 조각은 문장으로 보지 않음
+            if sent_end - sent_start > 1 or (
+                sent_end > sent_start and not _SENTENCE_END_RE.match(text, sent_start)
+            ):
+                spans.append((sent_start, sent_end))
+            start = end
+
+        return spans
@@ -1,39 +1,324 @@
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import sqlite3
+import numpy as np
 import openai
 import tiktoken
-import time
+import threading
 import logging
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cached_property
+from pathlib import Path
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from ..utils.http import get_shared_http_client
+from ..utils.rate_limit import RateLimiter
+
+# 디스크 캐시 파일명 (EmbeddingCache의 directory 아래에 생성)
+_DISK_CACHE_FILENAME = "embeddings.sqlite3"
+# SQLite IN 절 하나에 넣을 최대 키 수 (구버전 SQLite의 바인딩 변수 제한 999 이하)
+_DISK_LOOKUP_CHUNK = 500
+# 배치 하나의 임베딩 요청 재시도 정책 (실패한 배치만 다시 요청)
+_retry_batch_request = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=4, max=10)
+)
+
+
+class EmbeddingCache:
+    """임베딩 벡터 캐시 (메모리 LRU + 선택적 SQLite 디스크 캐시)"""
+
+    def __init__(self, maxsize: int = 4096, directory: Optional[str] = None):
+        """
+        EmbeddingCache 초기화
+
+        Args:
+            maxsize: 메모리에 유지할 최대 벡터 수
+            directory: 실행 간 공유할 디스크 캐시 디렉토리 (None이면 메모리 캐시만 사용)
+        """
+        self.maxsize = maxsize
+        self._memory: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._disk = self._open_disk(directory) if directory else None
+        self.stats = {'hits': 0, 'misses': 0}
+
+    @staticmethod
+    def make_key(model_name: str, text: str) -> str:
+        """
+        모델명과 텍스트로 캐시 키 생성
+
+        Args:
+            model_name: 임베딩 모델명
+            text: 임베딩할 텍스트
+
+        Returns:
+            str: 캐시 키
+        """
+        return hashlib.blake2b(f"{model_name}\n{text}".encode('utf-8'), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """
+        캐시된 임베딩 조회 (메모리 → 디스크 순)
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            Optional[List[float]]: 캐시된 임베딩 (없으면 None)
+        """
+        return self.get_many([key])[0]
+
+    def get_many(self, keys: List[str]) -> List[Optional[List[float]]]:
+        """
+        여러 키의 임베딩을 한 번에 조회 (메모리에 없는 키만 디스크에서 일괄 조회)
+
+        Args:
+            keys: 캐시 키 리스트
+
+        Returns:
+            List[Optional[List[float]]]: 키 순서대로 캐시된 임베딩 (없으면 None)
+        """
+        with self._lock:
+            embeddings = [self._memory.get(key) for key in keys]
+            for key, embedding in zip(keys, embeddings):
+                if embedding is not None:
+                    self._memory.move_to_end(key)
+
+        missing = [key for key, embedding in zip(keys, embeddings) if embedding is None]
+        found = self._disk_get_many(missing) if missing and self._disk is not None else {}
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                if embeddings[i] is None and key in found:
+                    embeddings[i] = found[key]
+                    self._remember(key, embeddings[i])
+            hits = sum(embedding is not None for embedding in embeddings)
+            self.stats['hits'] += hits
+            self.stats['misses'] += len(keys) - hits
+        return embeddings
+
+    def set(self, key: str, embedding: List[float]):
+        """
+        임베딩을 캐시에 저장
+
+        Args:
+            key: 캐시 키
+            embedding: 임베딩 벡터
+        """
+        self.set_many([(key, embedding)])
+
+    def set_many(self, items: List[Tuple[str, List[float]]]):
+        """
+        여러 임베딩을 한 번에 저장 (디스크는 단일 트랜잭션으로 기록)
+
+        Args:
+            items: (캐시 키, 임베딩 벡터) 리스트
+        """
+        with self._lock:
+            for key, embedding in items:
+                self._remember(key, embedding)
+
+        if self._disk is not None and items:
+            rows = [(key, np.asarray(embedding, dtype=np.float32).tobytes()) for key, embedding in items]
+            with self._disk_lock, self._disk:
+                self._disk.executemany("INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows)
+
+    def get_stats(self) -> Dict[str, int]:
+        """캐시 통계 반환"""
+        with self._lock:
+            return dict(self.stats, size=len(self._memory))
+
+    def clear(self):
+        """메모리와 디스크 캐시 모두 비우기"""
+        with self._lock:
+            self._memory.clear()
+        if self._disk is not None:
+            with self._disk_lock, self._disk:
+                self._disk.execute("DELETE FROM embeddings")
+
+    def close(self):
+        """디스크 캐시 연결 종료"""
+        if self._disk is not None:
+            with self._disk_lock:
+                self._disk.close()
+            self._disk = None
+
+    def _remember(self, key: str, embedding: List[float]):
+        """메모리 LRU에 저장하고 최대 크기를 넘으면 가장 오래된 항목 제거 (락 보유 상태에서 호출)"""
+        self._memory[key] = embedding
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def _disk_get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """디스크 캐시에서 키들을 IN 절로 나눠 조회"""
+        found = {}
+        with self._disk_lock:
+            for i in range(0, len(keys), _DISK_LOOKUP_CHUNK):
+                chunk = keys[i:i + _DISK_LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._disk.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, vector in rows:
+                    found[key] = np.frombuffer(vector, dtype=np.float32).tolist()
+        return found
+
+    @staticmethod
+    def _open_disk(directory: str) -> sqlite3.Connection:
+        """디스크 캐시용 SQLite 데이터베이스 열기 (없으면 생성)"""
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+
+        # CLI와 데몬 등 여러 프로세스가 같은 파일을 읽을 수 있도록 WAL 모드 사용
+        connection = sqlite3.connect(str(path / _DISK_CACHE_FILENAME), check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+        connection.commit()
+        return connection
+
+
+class _EmbeddingCoalescer:
+    """여러 스레드에서 동시에 들어온 단일 임베딩 요청을 짧은 시간 모아 한 번의 배치 요청으로 처리"""
+
+    def __init__(self,
+                 embed_batch: Callable[[List[str]], List[List[float]]],
+                 window: float,
+                 max_batch_size: int):
+        """
+        _EmbeddingCoalescer 초기화
+
+        Args:
+            embed_batch: 텍스트 리스트의 임베딩을 순서대로 반환하는 함수
+            window: 첫 요청 이후 다른 요청을 기다리는 최대 시간 (초)
+            max_batch_size: 이 수만큼 모이면 대기 시간 전이라도 바로 요청
+        """
+        self._embed_batch = embed_batch
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._pending: List[Tuple[str, Future]] = []
+        self._lock = threading.Lock()
+        self._full = threading.Event()
+
+    def submit(self, text: str) -> List[float]:
+        """
+        텍스트 임베딩 요청 (묶인 배치 요청이 끝날 때까지 대기)
+
+        대기열이 비어 있을 때 들어온 요청이 배치를 대표해 window 동안 기다린 뒤
+        모인 요청을 한 번에 보내고, 나머지 요청은 결과만 기다립니다.
+
+        Args:
+            text: 임베딩할 텍스트
+
+        Returns:
+            List[float]: 임베딩 벡터
+        """
+        future: Future = Future()
+        with self._lock:
+            self._pending.append((text, future))
+            is_leader = len(self._pending) == 1
+            if len(self._pending) >= self.max_batch_size:
+                self._full.set()
+
+        if is_leader:
+            self._full.wait(self.window)
+            with self._lock:
+                batch, self._pending = self._pending, []
+                self._full.clear()
+
+            try:
+                embeddings = self._embed_batch([item_text for item_text, _ in batch])
+                for (_, item_future), embedding in zip(batch, embeddings):
+                    item_future.set_result(embedding)
+            except Exception as e:
+                for _, item_future in batch:
+                    item_future.set_exception(e)
+
+        return future.result()
+
 
 class EmbeddingsManager:
     """임베딩 생성 및 관리"""
 
-    def __init__(self, model_name: str = "text-embedding-ada-002", api_key: Optional[str] = None):
+    def __init__(self,
+                 model_name: str = "text-embedding-ada-002",
+                 api_key: Optional[str] = None,
+                 cache: Optional[EmbeddingCache] = None,
+                 max_concurrency: int = 8,
+                 coalesce_window: float = 0.0,
+                 coalesce_max_batch: int = 64):
         """
         EmbeddingsManager 초기화
 
         Args:
             model_name: OpenAI 임베딩 모델명
             api_key: OpenAI API 키
+            cache: 이미 계산한 임베딩을 재사용할 캐시 (None이면 캐시 사용 안 함)
+            max_concurrency: 배치가 여러 개일 때 동시에 보낼 최대 임베딩 요청 수
+            coalesce_window: 동시에 들어온 단일 임베딩 요청을 모으는 시간 (초, 0이면 모으지 않음)
+            coalesce_max_batch: 모은 요청이 이 수에 도달하면 대기 없이 바로 요청
         """
         self.model_name = model_name
-        self.client = openai.OpenAI(api_key=api_key) if api_key else openai.OpenAI()
-        self.encoding = tiktoken.encoding_for_model("text-embedding-ada-002")
+        self.cache = cache
+        self.max_concurrency = max_concurrency
+        self.api_key = api_key
+        self.client = openai.OpenAI(api_key=api_key, http_client=get_shared_http_client())
         self.logger = logging.getLogger(__name__)
 
         # API 제한: text-embedding-ada-002는 분당 1,000,000 토큰, 분당 3,000 요청
         self.max_tokens_per_minute = 1000000
         self.max_requests_per_minute = 3000
-        self.batch_size = 100  # 한 번에 처리할 텍스트 수
+        self.rate_limiter = RateLimiter(self.max_requests_per_minute, self.max_tokens_per_minute)
+        # 요청당 제한: 최대 2,048개 입력, 약 300,000 토큰 (여유를 두고 290,000 토큰까지 채움)
+        self.batch_size = 2048  # 한 번에 처리할 최대 텍스트 수
+        self.max_batch_tokens = 290000  # 한 번에 처리할 최대 토큰 수
+        self.max_input_tokens = 8191  # 입력 하나의 최대 토큰 수
+
+        # 서버에서 여러 검색 쿼리가 동시에 들어올 때 단일 임베딩 요청을 하나의 배치로 묶음
+        self._coalescer = _EmbeddingCoalescer(
+            self._embed_texts, coalesce_window, coalesce_max_batch
+        ) if coalesce_window > 0 else None
+
+    @cached_property
+    def async_client(self) -> openai.AsyncOpenAI:
+        """비동기 OpenAI 클라이언트 (agenerate_embeddings 처음 호출 시 생성)"""
+        return openai.AsyncOpenAI(api_key=self.api_key)
+
+    @cached_property
+    def encoding(self) -> tiktoken.Encoding:
+        """토큰 인코딩 (처음 토큰 수를 셀 때 로드)"""
+        return tiktoken.encoding_for_model("text-embedding-ada-002")
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
-    )
     def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
         """
-        텍스트 리스트에 대한 임베딩 생성 (배치 처리)
+        텍스트 리스트에 대한 임베딩 생성 (배치 처리, 캐시된 텍스트는 API 호출 생략)
+
+        Args:
+            texts: 임베딩을 생성할 텍스트 리스트
+
+        Returns:
+            List[List[float]]: 임베딩 벡터 리스트
+        """
+        if not texts:
+            return []
+
+        if self.cache is None:
+            return self._embed_texts(texts)
+
+        keys, embeddings, positions = self._lookup_cached(texts)
+        if positions:
+            new_embeddings = self._embed_texts([texts[indices[0]] for indices in positions])
+            self._fill_missing(keys, embeddings, positions, new_embeddings)
+
+        self.logger.info(f"Embedding cache: {len(texts) - sum(map(len, positions))}/{len(texts)} texts reused")
+        return embeddings
+
+    async def agenerate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        generate_embeddings의 비동기 버전 (배치 요청을 최대 max_concurrency개까지 동시에 전송)
 
         Args:
             texts: 임베딩을 생성할 텍스트 리스트
@@ -44,39 +329,172 @@ class EmbeddingsManager:
         if not texts:
             return []
 
-        all_embeddings = []
+        if self.cache is None:
+            return await self._aembed_texts(texts)
 
-        # 배치 단위로 처리
-        for i in range(0, len(texts), self.batch_size):
-            batch = texts[i:i + self.batch_size]
+        keys, embeddings, positions = self._lookup_cached(texts)
+        if positions:
+            new_embeddings = await self._aembed_texts([texts[indices[0]] for indices in positions])
+            self._fill_missing(keys, embeddings, positions, new_embeddings)
 
-            # 토큰 수 확인
-            total_tokens = sum(self._count_tokens(text) for text in batch)
-            self.logger.info(f"Processing batch {i//self.batch_size + 1}: {len(batch)} texts, {total_tokens} tokens")
+        self.logger.info(f"Embedding cache: {len(texts) - sum(map(len, positions))}/{len(texts)} texts reused")
+        return embeddings
+
+    def _lookup_cached(self, texts: List[str]) -> Tuple[List[str], List[Optional[List[float]]], List[List[int]]]:
+        """
+        캐시에서 임베딩을 조회하고 캐시에 없는 텍스트 위치를 중복 없이 모음
+
+        Args:
+            texts: 임베딩을 생성할 텍스트 리스트
+
+        Returns:
+            Tuple: (캐시 키 리스트, 캐시된 임베딩 리스트, 캐시에 없는 텍스트별 원래 위치 리스트)
+        """
+        keys = [EmbeddingCache.make_key(self.model_name, text) for text in texts]
+        embeddings = self.cache.get_many(keys)
+
+        missing = {}
+        for i, embedding in enumerate(embeddings):
+            if embedding is None:
+                missing.setdefault(keys[i], []).append(i)
+        return keys, embeddings, list(missing.values())
+
+    def _fill_missing(self,
+                      keys: List[str],
+                      embeddings: List[Optional[List[float]]],
+                      positions: List[List[int]],
+                      new_embeddings: List[List[float]]):
+        """
+        새로 생성한 임베딩을 캐시에 저장하고 원래 순서대로 채움
+
+        Args:
+            keys: 캐시 키 리스트
+            embeddings: 채울 임베딩 리스트
+            positions: 캐시에 없던 텍스트별 원래 위치 리스트
+            new_embeddings: positions 순서대로 생성된 임베딩
+        """
+        self.cache.set_many([(keys[indices[0]], embedding) for indices, embedding in zip(positions, new_embeddings)])
+        for indices, embedding in zip(positions, new_embeddings):
+            for i in indices:
+                embeddings[i] = embedding
+
+    def _embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        OpenAI API로 텍스트 리스트의 임베딩 생성 (배치가 여러 개면 스레드 풀에서 동시에 요청)
+
+        재시도는 배치 단위로 하므로 한 배치가 실패해도 성공한 배치는 다시 요청하지 않습니다.
+
+        Args:
+            texts: 임베딩을 생성할 텍스트 리스트
+
+        Returns:
+            List[List[float]]: 임베딩 벡터 리스트
+        """
+        # 토큰 수는 전체 텍스트에 대해 한 번에 계산
+        token_counts = self._count_tokens_each(texts)
+        batches = self._pack_batches(token_counts)
+
+        @_retry_batch_request
+        def embed_batch(batch_num: int) -> List[List[float]]:
+            start, end = batches[batch_num]
+            batch = texts[start:end]
+            total_tokens = sum(token_counts[start:end])
+            self.logger.info(f"Processing batch {batch_num + 1}/{len(batches)}: {len(batch)} texts, {total_tokens} tokens")
 
             try:
+                # 분당 요청 수/토큰 수 한도를 넘을 때만 대기
+                self.rate_limiter.acquire(tokens=total_tokens)
                 response = self.client.embeddings.create(
                     model=self.model_name,
                     input=batch
                 )
-
-                batch_embeddings = [item.embedding for item in response.data]
-                all_embeddings.extend(batch_embeddings)
-
-                # API 속도 제한 방지를 위한 대기
-                if len(batch) == self.batch_size:
-                    time.sleep(0.1)
+                return [item.embedding for item in response.data]
 
             except Exception as e:
                 self.logger.error(f"Error generating embeddings for batch: {str(e)}")
                 raise
 
-        return all_embeddings
+        if len(batches) <= 1 or self.max_concurrency <= 1:
+            results = [embed_batch(i) for i in range(len(batches))]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as executor:
+                results = list(executor.map(embed_batch, range(len(batches))))
+
+        return [embedding for batch_embeddings in results for embedding in batch_embeddings]
+
+    async def _aembed_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        _embed_texts의 비동기 버전 (AsyncOpenAI와 asyncio.gather 사용)
+
+        Args:
+            texts: 임베딩을 생성할 텍스트 리스트
+
+        Returns:
+            List[List[float]]: 임베딩 벡터 리스트
+        """
+        token_counts = self._count_tokens_each(texts)
+        batches = self._pack_batches(token_counts)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        @_retry_batch_request
+        async def embed_batch(batch_num: int) -> List[List[float]]:
+            start, end = batches[batch_num]
+            batch = texts[start:end]
+            total_tokens = sum(token_counts[start:end])
+
+            async with semaphore:
+                self.logger.info(f"Processing batch {batch_num + 1}/{len(batches)}: {len(batch)} texts, {total_tokens} tokens")
+                try:
+                    await self.rate_limiter.acquire_async(tokens=total_tokens)
+                    response = await self.async_client.embeddings.create(
+                        model=self.model_name,
+                        input=batch
+                    )
+                    return [item.embedding for item in response.data]
+
+                except Exception as e:
+                    self.logger.error(f"Error generating embeddings for batch: {str(e)}")
+                    raise
+
+        # 한 배치가 최종 실패해도 나머지 배치 작업이 남아 돌지 않도록 모두 끝난 뒤 오류 전달
+        results = await asyncio.gather(*(embed_batch(i) for i in range(len(batches))), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return [embedding for batch_embeddings in results for embedding in batch_embeddings]
+
+    def _pack_batches(self, token_counts: List[int]) -> List[Tuple[int, int]]:
+        """
+        텍스트를 순서대로 묶어 요청당 입력 수/토큰 수 제한을 넘지 않는 배치 구간 생성
+
+        Args:
+            token_counts: 텍스트별 토큰 수
+
+        Returns:
+            List[Tuple[int, int]]: 배치별 (시작, 끝) 인덱스
+        """
+        batches = []
+        start = 0
+        batch_tokens = 0
+
+        for i, tokens in enumerate(token_counts):
+            if tokens > self.max_input_tokens:
+                self.logger.warning(
+                    f"Text {i} has {tokens} tokens, exceeding the {self.max_input_tokens}-token input limit; "
+                    f"use split_long_text before embedding"
+                )
+
+            # 현재 배치에 추가하면 제한을 넘는 경우 배치를 닫고 새로 시작
+            if i > start and (i - start >= self.batch_size or batch_tokens + tokens > self.max_batch_tokens):
+                batches.append((start, i))
+                start = i
+                batch_tokens = 0
+            batch_tokens += tokens
+
+        if start < len(token_counts):
+            batches.append((start, len(token_counts)))
+        return batches
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
-    )
     def generate_single_embedding(self, text: str) -> List[float]:
         """
         단일 텍스트에 대한 임베딩 생성
@@ -90,13 +508,22 @@ class EmbeddingsManager:
         if not text.strip():
             raise ValueError("Text cannot be empty")
 
+        key = EmbeddingCache.make_key(self.model_name, text) if self.cache is not None else None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
         try:
-            response = self.client.embeddings.create(
-                model=self.model_name,
-                input=[text]
-            )
+            # 재시도는 _embed_texts의 배치 요청에서만 수행 (재시도가 중첩되지 않도록)
+            if self._coalescer is not None:
+                embedding = self._coalescer.submit(text)
+            else:
+                embedding = self._embed_texts([text])[0]
 
-            return response.data[0].embedding
+            if key is not None:
+                self.cache.set(key, embedding)
+            return embedding
 
         except Exception as e:
             self.logger.error(f"Error generating single embedding: {str(e)}")
@@ -119,7 +546,7 @@ class EmbeddingsManager:
                 'num_texts': 0
             }
 
-        total_tokens = sum(self._count_tokens(text) for text in texts)
+        total_tokens = self._count_tokens_batch(texts)
 
         # text-embedding-ada-002 가격: $0.0001 / 1K tokens
         cost_per_1k_tokens = 0.0001
@@ -150,6 +577,38 @@ class EmbeddingsManager:
             # 대략적인 추정치 (1 토큰 ≈ 4 문자)
             return len(text) // 4
 
+    def _count_tokens_batch(self, texts: List[str]) -> int:
+        """
+        여러 텍스트의 총 토큰 수 계산 (tiktoken 배치 인코딩 사용)
+
+        Args:
+            texts: 텍스트 리스트
+
+        Returns:
+            int: 총 토큰 수
+        """
+        return sum(self._count_tokens_each(texts))
+
+    def _count_tokens_each(self, texts: List[str]) -> List[int]:
+        """
+        텍스트별 토큰 수를 한 번의 배치 인코딩으로 계산
+
+        Args:
+            texts: 텍스트 리스트
+
+        Returns:
+            List[int]: 텍스트 순서대로의 토큰 수
+        """
+        if not texts:
+            return []
+
+        try:
+            token_lists = self.encoding.encode_batch(texts, num_threads=min(8, len(texts)))
+            return [len(tokens) for tokens in token_lists]
+        except Exception as e:
+            self.logger.warning(f"Error counting tokens in batch: {str(e)}")
+            return [self._count_tokens(text) for text in texts]
+
     def validate_text_length(self, text: str) -> bool:
         """
         텍스트가 모델의 최대 토큰 길이를 초과하는지 확인
@@ -180,20 +639,22 @@ class EmbeddingsManager:
         if self._count_tokens(text) <= max_tokens:
             return [text]
 
-        # 문장 단위로 분할하여 토큰 제한 맞추기
-        sentences = text.split('. ')
+        # 문장 단위로 분할하여 토큰 제한 맞추기 (문장별 토큰 수는 한 번에 계산해 누적)
+        sentences = [sentence + ". " for sentence in text.split('. ')]
+        sentence_tokens = self._count_tokens_each(sentences)
         chunks = []
         current_chunk = ""
+        current_tokens = 0
 
-        for sentence in sentences:
-            test_chunk = current_chunk + sentence + ". " if current_chunk else sentence + ". "
-
-            if self._count_tokens(test_chunk) <= max_tokens:
-                current_chunk = test_chunk
+        for sentence, tokens in zip(sentences, sentence_tokens):
+            if current_tokens + tokens <= max_tokens:
+                current_chunk += sentence
+                current_tokens += tokens
             else:
                 if current_chunk:
                     chunks.append(current_chunk.strip())
-                current_chunk = sentence + ". "
+                current_chunk = sentence
+                current_tokens = tokens
 
         if current_chunk:
             chunks.append(current_chunk.strip())
@@ -0,0 +1,278 @@
+from typing import List, Dict, Optional, Any, Union
+import json
+import logging
+import threading
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import faiss
+except ImportError:  # faiss-cpu가 설치된 경우에만 FAISS 백엔드 사용 가능
+    faiss = None
+
+from .document_processor import Document
+
+
+class FAISSVectorStore:
+    """FAISS 기반 인프로세스 벡터 저장소 (VectorStore와 같은 인터페이스)"""
+
+    # 이 개수를 넘으면 전수 비교(IndexFlatIP) 대신 HNSW 그래프 인덱스 사용
+    HNSW_THRESHOLD = 100_000
+    HNSW_M = 32
+
+    def __init__(self,
+                 collection_name: str = "textbook_embeddings",
+                 persist_directory: str = "./data/vector_db"):
+        """
+        FAISSVectorStore 초기화
+
+        Args:
+            collection_name: 인덱스 이름 (저장 파일명으로 사용)
+            persist_directory: 데이터 저장 경로
+        """
+        if faiss is None:
+            raise ImportError("faiss is required for the FAISS vector backend (pip install faiss-cpu)")
+
+        self.collection_name = collection_name
+        self.persist_directory = Path(persist_directory)
+        self.logger = logging.getLogger(__name__)
+
+        self.persist_directory.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.persist_directory / f"{collection_name}.faiss"
+        self.store_path = self.persist_directory / f"{collection_name}.json"
+
+        self.index = None
+        self.ids: List[str] = []
+        self.contents: List[str] = []
+        self.metadatas: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+        # 저장된 인덱스가 있으면 메모리에 올려 두고 재사용
+        if self.index_path.exists() and self.store_path.exists():
+            self.index = faiss.read_index(str(self.index_path))
+            with open(self.store_path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            self.ids = stored['ids']
+            self.contents = stored['documents']
+            self.metadatas = stored['metadatas']
+            self.logger.info(f"Loaded existing FAISS index: {collection_name} ({len(self.ids)} vectors)")
+        else:
+            self.logger.info(f"Created new FAISS index: {collection_name}")
+
+    def add_documents(self,
+                     documents: List[Document],
+                     embeddings: Union[np.ndarray, List[List[float]]]) -> bool:
+        """
+        문서와 임베딩을 벡터 저장소에 추가
+
+        Args:
+            documents: Document 객체 리스트
+            embeddings: (N, D) 형태의 임베딩 배열 (리스트도 허용)
+
+        Returns:
+            bool: 성공 여부
+        """
+        if len(documents) != len(embeddings):
+            raise ValueError("Documents and embeddings must have the same length")
+
+        if len(documents) == 0:
+            return True
+
+        return self.add_documents_np(
+            ids=[str(uuid.uuid4()) for _ in documents],
+            embeddings=embeddings,
+            metadatas=[
+                {
+                    key: value if isinstance(value, (str, int, float, bool)) else str(value)
+                    for key, value in doc.metadata.items()
+                }
+                for doc in documents
+            ],
+            documents=[doc.content for doc in documents]
+        )
+
+    def add_documents_np(self,
+                         ids: List[str],
+                         embeddings: np.ndarray,
+                         metadatas: List[Dict[str, Any]],
+                         documents: List[str]) -> bool:
+        """
+        미리 준비된 ID/메타데이터와 (N, D) 임베딩 배열을 인덱스에 추가
+
+        Args:
+            ids: 문서 ID 리스트
+            embeddings: (N, D) 형태의 임베딩 배열
+            metadatas: 메타데이터 리스트
+            documents: 문서 내용 리스트
+
+        Returns:
+            bool: 성공 여부
+        """
+        # normalize_L2가 제자리 연산이므로 호출자의 배열을 바꾸지 않도록 복사
+        vectors = np.array(embeddings, dtype=np.float32, order='C')
+
+        if vectors.ndim != 2:
+            raise ValueError("Embeddings must be a 2-D array of shape (N, D)")
+
+        if not (len(ids) == len(metadatas) == len(documents) == vectors.shape[0]):
+            raise ValueError("ids, embeddings, metadatas and documents must have the same length")
+
+        if vectors.shape[0] == 0:
+            return True
+
+        try:
+            # 내적 = 코사인 유사도가 되도록 L2 정규화
+            faiss.normalize_L2(vectors)
+
+            with self._lock:
+                if self.index is None:
+                    self.index = faiss.IndexFlatIP(vectors.shape[1])
+                elif self.index.d != vectors.shape[1]:
+                    raise ValueError(
+                        f"Embedding dimension {vectors.shape[1]} does not match index dimension {self.index.d}"
+                    )
+
+                self.index.add(vectors)
+                self.ids.extend(ids)
+                self.contents.extend(documents)
+                self.metadatas.extend(metadatas)
+
+                self._maybe_upgrade_index()
+                self._persist()
+
+            self.logger.info(f"Successfully added {len(ids)} documents to FAISS index")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Error adding documents to vector store: {str(e)}")
+            raise
+
+    def similarity_search_by_embedding(self,
+                                     query_embedding: List[float],
+                                     k: int = 5,
+                                     filter_metadata: Optional[Dict[str, Any]] = None) -> List[Document]:
+        """
+        임베딩 벡터로 유사도 검색 수행
+
+        Args:
+            query_embedding: 쿼리 임베딩 벡터
+            k: 반환할 결과 수
+            filter_metadata: 메타데이터 필터
+
+        Returns:
+            List[Document]: 검색 결과 Document 리스트
+        """
+        try:
+            with self._lock:
+                total = len(self.ids)
+                if self.index is None or total == 0:
+                    return []
+
+                query = np.array([query_embedding], dtype=np.float32)
+                faiss.normalize_L2(query)
+
+                conditions = {key: value for key, value in (filter_metadata or {}).items() if value is not None}
+                allowed = self._filter_mask(conditions) if conditions else None
+                if allowed is not None and not allowed.any():
+                    return []
+
+                # 필터가 있으면 후보를 넉넉히 가져와 비트맵으로 거른 뒤, 부족하면 범위를 넓혀 재검색
+                search_k = min(total, k if allowed is None else k * 4)
+                while True:
+                    scores, indices = self.index.search(query, search_k)
+                    hits = [
+                        (score, idx) for score, idx in zip(scores[0], indices[0])
+                        if idx >= 0 and (allowed is None or allowed[idx])
+                    ]
+                    if len(hits) >= k or search_k >= total:
+                        break
+                    search_k = min(total, search_k * 4)
+
+                documents = []
+                for score, idx in hits[:k]:
+                    metadata = dict(self.metadatas[idx])
+                    metadata['similarity_score'] = float(score)
+                    metadata['distance'] = 1.0 - float(score)
+                    documents.append(Document(content=self.contents[idx], metadata=metadata))
+
+            self.logger.info(f"Found {len(documents)} documents for query")
+            return documents
+
+        except Exception as e:
+            self.logger.error(f"Error in similarity search by embedding: {str(e)}")
+            raise
+
+    def get_collection_info(self) -> Dict[str, Any]:
+        """
+        인덱스 정보 반환
+
+        Returns:
+            dict: 인덱스 통계 정보
+        """
+        with self._lock:
+            return {
+                'collection_name': self.collection_name,
+                'total_documents': len(self.ids),
+                'subjects': list({m['subject'] for m in self.metadatas if 'subject' in m}),
+                'units': list({m['unit'] for m in self.metadatas if 'unit' in m}),
+                'source_files': list({m['source_file'] for m in self.metadatas if 'source_file' in m}),
+                'persist_directory': str(self.persist_directory)
+            }
+
+    def clear_collection(self) -> bool:
+        """
+        인덱스의 모든 데이터 삭제
+
+        Returns:
+            bool: 성공 여부
+        """
+        with self._lock:
+            self.index = None
+            self.ids = []
+            self.contents = []
+            self.metadatas = []
+            self.index_path.unlink(missing_ok=True)
+            self.store_path.unlink(missing_ok=True)
+
+        self.logger.info(f"Successfully cleared FAISS index: {self.collection_name}")
+        return True
+
+    def _filter_mask(self, conditions: Dict[str, Any]) -> np.ndarray:
+        """
+        메타데이터 조건을 모두 만족하는 문서의 비트맵 생성
+
+        Args:
+            conditions: 메타데이터 조건
+
+        Returns:
+            np.ndarray: 문서 위치별 허용 여부
+        """
+        return np.fromiter(
+            (all(metadata.get(key) == value for key, value in conditions.items())
+             for metadata in self.metadatas),
+            dtype=bool,
+            count=len(self.metadatas)
+        )
+
+    def _maybe_upgrade_index(self):
+        """문서 수가 임계값을 넘으면 전수 비교 인덱스를 HNSW 인덱스로 재구성"""
+        if not isinstance(self.index, faiss.IndexFlatIP) or self.index.ntotal <= self.HNSW_THRESHOLD:
+            return
+
+        vectors = self.index.reconstruct_n(0, self.index.ntotal)
+        hnsw_index = faiss.IndexHNSWFlat(self.index.d, self.HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        hnsw_index.add(vectors)
+        self.index = hnsw_index
+        self.logger.info(f"Rebuilt FAISS index as HNSW ({self.index.ntotal} vectors)")
+
+    def _persist(self):
+        """인덱스와 문서 정보를 디스크에 저장"""
+        faiss.write_index(self.index, str(self.index_path))
+        with open(self.store_path, 'w', encoding='utf-8') as f:
+            json.dump(
+                {'ids': self.ids, 'documents': self.contents, 'metadatas': self.metadatas},
+                f,
+                ensure_ascii=False
+            )
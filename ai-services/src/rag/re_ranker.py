@@ -1,28 +1,71 @@
-from typing import List
+from typing import Dict, List, Optional, Tuple
+import logging
+import platform
+import threading
+from collections import OrderedDict
+
+import numpy as np
 from sentence_transformers import CrossEncoder
 from .document_processor import Document
 
+
+def _quantized_onnx_file() -> str:
+    """Returns the INT8-quantized ONNX export that matches the host CPU architecture."""
+    if platform.machine().lower() in ('arm64', 'aarch64'):
+        return 'onnx/model_qint8_arm64.onnx'
+    return 'onnx/model_quint8_avx2.onnx'
+
+
 class ReRanker:
     """
     Re-ranks a list of documents based on a query using a Cross-Encoder model.
     """
 
-    def __init__(self, model_name: str = 'cross-encoder/ms-marco-MiniLM-L-6-v2'):
+    def __init__(self,
+                 model_name: str = 'cross-encoder/ms-marco-MiniLM-L-6-v2',
+                 backend: str = 'torch',
+                 score_cache_size: int = 4096):
         """
         Initializes the ReRanker by loading a pre-trained Cross-Encoder model.
 
         Args:
             model_name: The name of the Cross-Encoder model to use.
+            backend: 'torch' for the FP32 PyTorch model, or 'onnx' to run the model's
+                INT8-quantized ONNX export with ONNX Runtime. Falls back to 'torch'
+                if the ONNX backend cannot be loaded.
+            score_cache_size: Maximum number of (query, document) scores to keep, so
+                repeated queries over the same candidates skip the model. 0 disables it.
         """
+        self.logger = logging.getLogger(__name__)
+        self.backend = backend
+        self.score_cache_size = score_cache_size
+        self._score_cache: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._score_cache_lock = threading.Lock()
+
+        if backend == 'onnx':
+            try:
+                self.model = CrossEncoder(
+                    model_name,
+                    backend='onnx',
+                    model_kwargs={'file_name': _quantized_onnx_file()}
+                )
+                return
+            except Exception as e:
+                self.logger.warning(f"Could not load ONNX re-ranker, falling back to PyTorch: {str(e)}")
+                self.backend = 'torch'
+        elif backend != 'torch':
+            raise ValueError(f"Unsupported re-ranker backend: {backend}")
+
         self.model = CrossEncoder(model_name)
 
-    def rerank(self, query: str, documents: List[Document]) -> List[Document]:
+    def rerank(self, query: str, documents: List[Document], top_k: Optional[int] = None) -> List[Document]:
         """
         Re-ranks the given documents based on their relevance to the query.
 
         Args:
             query: The search query.
             documents: A list of Document objects to be re-ranked.
+            top_k: If given, only the top_k most relevant documents are returned.
 
         Returns:
             A new list of Document objects, sorted by relevance score in descending order.
@@ -30,17 +73,77 @@ class ReRanker:
         if not documents:
             return []
 
-        # Create pairs of [query, document_content] for scoring
-        sentence_pairs = [[query, doc.content] for doc in documents]
+        scores = self._score(query, [doc.content for doc in documents])
+
+        return [documents[i] for i in self._top_k_order(scores, top_k)]
+
+    @staticmethod
+    def _top_k_order(scores: np.ndarray, top_k: Optional[int]) -> np.ndarray:
+        """
+        Indices of the top_k highest scores in descending order, with ties kept in
+        input (vector-store) order.
+
+        When only a prefix is wanted, an O(n) partition narrows the sort down to the
+        scores at or above the k-th best before ordering them.
+
+        Args:
+            scores: Relevance scores.
+            top_k: Number of indices to return, or None for all of them.
+
+        Returns:
+            An index array into scores.
+        """
+        negated = -scores
+        if top_k is None or top_k >= len(scores):
+            return np.argsort(negated, kind='stable')
+        if top_k <= 0:
+            return np.empty(0, dtype=np.intp)
+
+        # Keep every score tied with the k-th best so the stable sort decides among them
+        kth = np.partition(negated, top_k - 1)[top_k - 1]
+        candidates = np.flatnonzero(negated <= kth)
+        return candidates[np.argsort(negated[candidates], kind='stable')][:top_k]
+
+    def clear_cache(self):
+        """Drops all cached (query, document) scores."""
+        with self._score_cache_lock:
+            self._score_cache.clear()
+
+    def _score(self, query: str, contents: List[str]) -> np.ndarray:
+        """
+        Scores each document content against the query, running the model only on
+        pairs that are neither cached nor duplicated within this call.
+
+        Args:
+            query: The search query.
+            contents: The document contents to score.
+
+        Returns:
+            A float32 vector of relevance scores, aligned with contents.
+        """
+        scores = np.empty(len(contents), dtype=np.float32)
+        missing: Dict[str, List[int]] = {}
 
-        # Compute scores
-        scores = self.model.predict(sentence_pairs)
+        with self._score_cache_lock:
+            for i, content in enumerate(contents):
+                cached = self._score_cache.get((query, content))
+                if cached is None:
+                    missing.setdefault(content, []).append(i)
+                else:
+                    self._score_cache.move_to_end((query, content))
+                    scores[i] = cached
 
-        # Combine documents with their scores
-        scored_documents = list(zip(scores, documents))
+        if missing:
+            # Create pairs of [query, document_content] for the uncached documents only
+            sentence_pairs = [[query, content] for content in missing]
+            new_scores = np.asarray(self.model.predict(sentence_pairs), dtype=np.float32)
 
-        # Sort documents by score in descending order
-        scored_documents.sort(key=lambda x: x[0], reverse=True)
+            with self._score_cache_lock:
+                for (content, indices), score in zip(missing.items(), new_scores):
+                    scores[indices] = score
+                    if self.score_cache_size > 0:
+                        self._score_cache[(query, content)] = float(score)
+                while len(self._score_cache) > self.score_cache_size:
+                    self._score_cache.popitem(last=False)
 
-        # Return only the sorted documents
-        return [doc for score, doc in scored_documents]
+        return scores
@@ -3,7 +3,7 @@ import logging
 
 from .vector_store import VectorStore
 from .embeddings import EmbeddingsManager
-from .document_processor import Document
+from .document_processor import Document, compute_content_hash
 from .re_ranker import ReRanker
 
 
@@ -12,17 +12,19 @@ class RAGRetriever:
 
     def __init__(self,
                  vector_store: VectorStore,
-                 embeddings_manager: EmbeddingsManager):
+                 embeddings_manager: EmbeddingsManager,
+                 re_ranker_backend: str = "torch"):
         """
         RAGRetriever 초기화
 
         Args:
-            vector_store: VectorStore 인스턴스
+            vector_store: VectorStore 또는 FAISSVectorStore 인스턴스
             embeddings_manager: EmbeddingsManager 인스턴스
+            re_ranker_backend: 재순위화 모델 실행 방식 ("torch" 또는 INT8 양자화 모델을 쓰는 "onnx")
         """
         self.vector_store = vector_store
         self.embeddings_manager = embeddings_manager
-        self.re_ranker = ReRanker()  # ReRanker 초기화
+        self.re_ranker = ReRanker(backend=re_ranker_backend)  # ReRanker 초기화
         self.logger = logging.getLogger(__name__)
 
     def retrieve_documents(self,
@@ -30,7 +32,8 @@ class RAGRetriever:
                          subject: Optional[str] = None,
                          unit: Optional[str] = None,
                          k: int = 3,
-                         candidates: int = 10) -> List[Document]:
+                         candidates: int = 10,
+                         query_embedding: Optional[List[float]] = None) -> List[Document]:
         """
         쿼리에 대한 관련 문서를 검색하고 재순위화합니다.
 
@@ -40,13 +43,15 @@ class RAGRetriever:
             unit: 단원 필터
             k: 반환할 최종 문서 수
             candidates: 1차 검색할 후보 문서 수
+            query_embedding: 미리 계산한 쿼리 임베딩 (주면 임베딩 요청 생략)
 
         Returns:
             List[Document]: 재순위화된 상위 k개의 문서 리스트
         """
         try:
-            # 1. 쿼리 임베딩 생성
-            query_embedding = self.embeddings_manager.generate_single_embedding(query)
+            # 1. 쿼리 임베딩 생성 (호출자가 이미 계산했으면 재사용)
+            if query_embedding is None:
+                query_embedding = self.embeddings_manager.generate_single_embedding(query)
 
             # 2. 메타데이터 필터 준비
             filter_metadata = {}
@@ -66,12 +71,14 @@ class RAGRetriever:
                 self.logger.warning("No documents found from vector store.")
                 return []
 
-            # 4. ReRanker를 사용한 재순위화
-            reranked_docs = self.re_ranker.rerank(query, candidate_docs)
+            # 같은 내용이 여러 번 저장된 경우 한 번만 재순위화
+            candidate_docs = self._remove_duplicates(candidate_docs)
+
+            # 4. ReRanker를 사용한 재순위화 후 상위 k개 문서 선택
+            top_k_docs = self.re_ranker.rerank(query, candidate_docs, top_k=k)
             self.logger.info(f"Re-ranked {len(candidate_docs)} documents.")
 
-            # 5. 상위 k개 문서 선택 및 반환
-            top_k_docs = reranked_docs[:k]
+            # 5. 상위 k개 문서 반환
             self.logger.info(f"Retrieved {len(top_k_docs)} documents for query: {query[:50]}...")
             
             return top_k_docs
@@ -80,6 +87,34 @@ class RAGRetriever:
             self.logger.error(f"Error retrieving documents: {str(e)}")
             raise
 
+    def _remove_duplicates(self, documents: List[Document]) -> List[Document]:
+        """
+        내용이 같은 문서를 제거 (처음 나온 문서 유지)
+
+        저장 시 계산해 둔 metadata['content_hash']를 우선 사용하고,
+        없는 문서만 해시를 새로 계산해 메타데이터에 저장합니다.
+
+        Args:
+            documents: Document 리스트
+
+        Returns:
+            List[Document]: 중복이 제거된 Document 리스트
+        """
+        seen = set()
+        unique_documents = []
+
+        for doc in documents:
+            content_hash = doc.metadata.get('content_hash')
+            if not content_hash:
+                content_hash = compute_content_hash(doc.content)
+                doc.metadata['content_hash'] = content_hash
+
+            if content_hash not in seen:
+                seen.add(content_hash)
+                unique_documents.append(doc)
+
+        return unique_documents
+
     def format_context(self, documents: List[Document]) -> str:
         """
         문서들을 LLM 입력용 컨텍스트로 포맷팅
@@ -1,10 +1,12 @@
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Union
 import chromadb
 from chromadb.config import Settings
 import logging
 import uuid
 from pathlib import Path
 
+import numpy as np
+
 from .document_processor import Document
 
 
@@ -50,13 +52,13 @@ class VectorStore:
 
     def add_documents(self,
                      documents: List[Document],
-                     embeddings: List[List[float]]) -> bool:
+                     embeddings: Union[np.ndarray, List[List[float]]]) -> bool:
         """
         문서와 임베딩을 벡터 저장소에 추가
 
         Args:
             documents: Document 객체 리스트
-            embeddings: 임베딩 벡터 리스트
+            embeddings: (N, D) 형태의 임베딩 배열 (리스트도 허용)
 
         Returns:
             bool: 성공 여부
@@ -68,36 +70,60 @@ class VectorStore:
         if len(documents) == 0:
             return True
 
+        # ChromaDB는 중첩된 딕셔너리를 지원하지 않으므로 단일 값이 아닌 메타데이터는 문자열로 변환
+        return self.add_documents_np(
+            ids=[str(uuid.uuid4()) for _ in documents],
+            embeddings=embeddings,
+            metadatas=[
+                {
+                    key: value if isinstance(value, (str, int, float, bool)) else str(value)
+                    for key, value in doc.metadata.items()
+                }
+                for doc in documents
+            ],
+            documents=[doc.content for doc in documents]
+        )
+
+    def add_documents_np(self,
+                         ids: List[str],
+                         embeddings: np.ndarray,
+                         metadatas: List[Dict[str, Any]],
+                         documents: List[str]) -> bool:
+        """
+        미리 준비된 ID/메타데이터와 (N, D) 임베딩 배열을 ChromaDB에 그대로 추가
+
+        문서별로 임베딩을 순회하지 않고 연속된 float32 배열을 한 번에 전달합니다.
+        메타데이터는 ChromaDB가 지원하는 단일 값(str, int, float, bool)이어야 합니다.
+
+        Args:
+            ids: 문서 ID 리스트
+            embeddings: (N, D) 형태의 임베딩 배열
+            metadatas: 메타데이터 리스트
+            documents: 문서 내용 리스트
+
+        Returns:
+            bool: 성공 여부
+        """
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+
+        if embeddings.ndim != 2:
+            raise ValueError("Embeddings must be a 2-D array of shape (N, D)")
+
+        if not (len(ids) == len(metadatas) == len(documents) == embeddings.shape[0]):
+            raise ValueError("ids, embeddings, metadatas and documents must have the same length")
+
+        if embeddings.shape[0] == 0:
+            return True
+
         try:
-            ids = []
-            contents = []
-            metadatas = []
-
-            for doc, embedding in zip(documents, embeddings):
-                # 고유 ID 생성
-                doc_id = str(uuid.uuid4())
-                ids.append(doc_id)
-                contents.append(doc.content)
-
-                # 메타데이터 준비 (ChromaDB는 중첩된 딕셔너리를 지원하지 않음)
-                metadata = {}
-                for key, value in doc.metadata.items():
-                    if isinstance(value, (str, int, float, bool)):
-                        metadata[key] = value
-                    else:
-                        metadata[key] = str(value)
-
-                metadatas.append(metadata)
-
-            # ChromaDB에 추가
             self.collection.add(
                 ids=ids,
                 embeddings=embeddings,
-                documents=contents,
+                documents=documents,
                 metadatas=metadatas
             )
 
-            self.logger.info(f"Successfully added {len(documents)} documents to collection")
+            self.logger.info(f"Successfully added {len(ids)} documents to collection")
             return True
 
         except Exception as e:
@@ -18,6 +18,7 @@ class Settings(BaseSettings):
     # ChromaDB 설정
     chroma_db_path: str = Field(default="./data/vector_db", description="ChromaDB persist directory")
     chroma_collection_name: str = Field(default="textbook_embeddings", description="ChromaDB collection name")
+    vector_backend: str = Field(default="chroma", pattern="^(chroma|faiss)$", description="Vector store backend (chroma or faiss)")
 
     # 텍스트 처리 설정
     chunk_size: int = Field(default=1000, ge=100, le=4000, description="Text chunk size")
@@ -27,6 +28,13 @@ class Settings(BaseSettings):
     # 검색 설정
     retrieval_k: int = Field(default=3, ge=1, le=10, description="Number of documents to retrieve")
     similarity_threshold: float = Field(default=0.7, ge=0.0, le=1.0, description="Similarity threshold for retrieval")
+    reranker_backend: str = Field(default="torch", pattern="^(torch|onnx)$", description="Re-ranker backend (torch, or onnx for the INT8-quantized model)")
+
+    # 임베딩 설정
+    embedding_coalesce_window_ms: int = Field(default=0, ge=0, le=1000, description="Window for batching concurrent single-text embedding requests (0 disables)")
+
+    # 평가 설정
+    eval_concurrency: int = Field(default=8, ge=1, le=32, description="Number of questions evaluated concurrently")
 
     # 로깅 설정
     log_level: str = Field(default="INFO", description="Logging level")
@@ -39,6 +47,12 @@ class Settings(BaseSettings):
     # 캐시 설정
     enable_cache: bool = Field(default=True, description="Enable embedding cache")
     cache_dir: str = Field(default="./data/cache", description="Cache directory")
+    llm_cache_enabled: bool = Field(default=False, description="Enable LLM response cache")
+    llm_semantic_cache: bool = Field(default=False, description="Reuse LLM responses for similar prompts")
+    llm_semantic_cache_threshold: float = Field(default=0.92, ge=0.0, le=1.0, description="Cosine similarity threshold for semantic cache hits")
+    llm_cache_max_entries: int = Field(default=1024, ge=1, description="Max entries per LLM response cache")
+    question_cache_enabled: bool = Field(default=False, description="Reuse generated questions for near-identical prompts with the same source chunks")
+    question_cache_threshold: float = Field(default=0.95, ge=0.0, le=1.0, description="Prompt cosine similarity threshold for question cache hits")
 
     class Config:
         env_file = ".env"
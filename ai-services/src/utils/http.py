@@ -0,0 +1,28 @@
+import importlib.util
+from functools import lru_cache
+
+import httpx
+
+# h2 패키지가 설치된 경우에만 HTTP/2 사용 (없으면 HTTP/1.1 keep-alive)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@lru_cache(maxsize=None)
+def get_shared_http_client(timeout: float = 60.0) -> httpx.Client:
+    """
+    OpenAI 클라이언트들이 함께 쓰는 httpx 클라이언트 반환
+
+    같은 프로세스의 LLMClient/EmbeddingsManager가 하나의 연결 풀을 공유해
+    요청마다 TLS 핸드셰이크를 반복하지 않도록 합니다.
+
+    Args:
+        timeout: 요청 타임아웃 (초)
+
+    Returns:
+        httpx.Client: 공유 HTTP 클라이언트
+    """
+    return httpx.Client(
+        http2=HTTP2_AVAILABLE,
+        timeout=timeout,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+    )
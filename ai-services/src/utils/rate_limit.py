@@ -0,0 +1,74 @@
+import asyncio
+import threading
+import time
+
+
+class RateLimiter:
+    """GCRA(Generic Cell Rate Algorithm) 방식으로 분당 요청 수와 토큰 수를 함께 제한"""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, period: float = 60.0):
+        """
+        RateLimiter 초기화
+
+        Args:
+            requests_per_minute: 기간당 최대 요청 수
+            tokens_per_minute: 기간당 최대 토큰 수
+            period: 제한 기간 (초)
+        """
+        self.period = period
+        self._request_interval = period / requests_per_minute
+        self._token_interval = period / tokens_per_minute
+
+        # 다음 요청/토큰이 이론적으로 도착해야 하는 시각 (TAT)
+        self._request_tat = 0.0
+        self._token_tat = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 0, requests: int = 1) -> float:
+        """
+        요청을 보내도 될 때까지 대기
+
+        한도 안에서는 바로 반환하고, 한도를 넘으면 필요한 만큼만 대기합니다.
+        여러 스레드가 동시에 호출해도 잠금 안에서 순서대로 자리를 예약합니다.
+
+        Args:
+            tokens: 이번 요청의 토큰 수
+            requests: 이번 요청 수
+
+        Returns:
+            float: 실제로 대기한 시간 (초)
+        """
+        wait = self._reserve(tokens, requests)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: int = 0, requests: int = 1) -> float:
+        """
+        acquire의 비동기 버전 (대기 중에도 이벤트 루프를 막지 않음)
+
+        Args:
+            tokens: 이번 요청의 토큰 수
+            requests: 이번 요청 수
+
+        Returns:
+            float: 실제로 대기한 시간 (초)
+        """
+        wait = self._reserve(tokens, requests)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def _reserve(self, tokens: int, requests: int) -> float:
+        """요청 자리를 예약하고 보내기 전까지 기다려야 하는 시간 반환"""
+        with self._lock:
+            now = time.monotonic()
+            request_tat = max(self._request_tat, now) + requests * self._request_interval
+            token_tat = max(self._token_tat, now) + tokens * self._token_interval
+
+            # 기간 한 번 분량까지는 몰아서 보낼 수 있고, 그 이상은 초과분만큼 대기
+            wait = max(request_tat, token_tat) - self.period - now
+            self._request_tat = request_tat
+            self._token_tat = token_tat
+
+        return max(wait, 0.0)
@@ -0,0 +1,95 @@
+import pytest
+import tempfile
+import shutil
+import socket
+import threading
+from pathlib import Path
+from unittest.mock import Mock
+
+from src.daemon import PipelineServer, RemotePipeline
+
+
+class TestPipelineDaemon:
+    """CLI 데몬 테스트 클래스"""
+
+    def setup_method(self):
+        """각 테스트 메서드 실행 전 초기화"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.socket_path = str(Path(self.temp_dir) / "edubridge.sock")
+
+        self.mock_pipeline = Mock()
+        self.server = PipelineServer(self.socket_path, self.mock_pipeline)
+        self.server_thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True
+        )
+        self.server_thread.start()
+
+        self.remote = RemotePipeline(self.socket_path)
+
+    def teardown_method(self):
+        """각 테스트 메서드 실행 후 정리"""
+        self.server.shutdown()
+        self.server.server_close()
+        if Path(self.temp_dir).exists():
+            shutil.rmtree(self.temp_dir)
+
+    def test_generate_questions(self):
+        """데몬을 통한 문제 생성 테스트"""
+        self.mock_pipeline.generate_questions.return_value = [{"question": "기울기는?"}]
+
+        questions = self.remote.generate_questions("수학", "일차함수", "easy", 1)
+
+        assert questions == [{"question": "기울기는?"}]
+        self.mock_pipeline.generate_questions.assert_called_once_with(
+            subject="수학", unit="일차함수", difficulty="easy", count=1
+        )
+
+    def test_relative_paths_are_resolved(self):
+        """상대 경로를 절대 경로로 바꿔 전달하는지 테스트"""
+        self.mock_pipeline.process_textbook.return_value = {"status": "success"}
+
+        self.remote.process_textbook("textbook.txt", "수학", "일차함수")
+
+        file_path = self.mock_pipeline.process_textbook.call_args.kwargs['file_path']
+        assert Path(file_path).is_absolute()
+
+    def test_error_propagation(self):
+        """데몬에서 발생한 오류가 호출자에게 전달되는지 테스트"""
+        self.mock_pipeline.get_status.side_effect = ValueError("Vector store unavailable")
+
+        with pytest.raises(RuntimeError, match="Vector store unavailable"):
+            self.remote.get_status()
+
+    def test_server_close_removes_socket(self):
+        """서버 종료 시 소켓 파일 삭제 테스트"""
+        assert Path(self.socket_path).exists()
+
+        self.server.shutdown()
+        self.server.server_close()
+
+        assert not Path(self.socket_path).exists()
+
+    def test_refuses_to_replace_running_daemon(self):
+        """실행 중인 데몬의 소켓 경로로는 새 서버를 시작하지 않는지 테스트"""
+        with pytest.raises(RuntimeError, match="already running"):
+            PipelineServer(self.socket_path, Mock())
+
+        # 기존 데몬은 계속 요청을 처리
+        self.mock_pipeline.get_status.return_value = {"ok": True}
+        assert self.remote.get_status() == {"ok": True}
+
+    def test_socket_is_owner_only(self):
+        """소켓 파일이 소유자 전용 권한으로 만들어지는지 테스트"""
+        assert Path(self.socket_path).stat().st_mode & 0o077 == 0
+
+    def test_stale_socket_is_replaced(self):
+        """응답하지 않는 이전 소켓 파일은 지우고 새로 시작하는지 테스트"""
+        stale_path = str(Path(self.temp_dir) / "stale.sock")
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(stale_path)
+        stale.close()
+
+        server = PipelineServer(stale_path, Mock())
+        server.server_close()
+
+        assert not Path(stale_path).exists()
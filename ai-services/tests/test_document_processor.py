@@ -3,7 +3,7 @@ import tempfile
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-from src.rag.document_processor import DocumentProcessor, Document
+from src.rag.document_processor import DocumentProcessor, Document, compute_content_hash
 
 
 class TestDocumentProcessor:
@@ -52,6 +52,34 @@ class TestDocumentProcessor:
         finally:
             Path(temp_file).unlink()
 
+    def test_load_text_file_matches_full_preprocessing(self):
+        """구간별로 읽어 전처리한 결과가 전체를 한 번에 전처리한 결과와 같은지 테스트"""
+        text = "일차함수는  y = ax + b 형태입니다.\n\n기울기 @#$ a와\t절편 b!  그래프는 직선입니다。 " * 50
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8') as f:
+            f.write(text)
+            temp_file = f.name
+
+        try:
+            expected = self.processor.preprocess_text(text)
+            # 작은 구간으로 나눠 한글 멀티바이트 문자가 구간 경계에 걸리도록 함
+            for window in (7, 64, 1 << 20):
+                assert self.processor._load_text_file(Path(temp_file), window=window) == expected
+
+        finally:
+            Path(temp_file).unlink()
+
+    def test_load_text_file_empty(self):
+        """빈 텍스트 파일은 빈 문자열을 반환하는지 테스트"""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8') as f:
+            temp_file = f.name
+
+        try:
+            assert self.processor._load_text_file(Path(temp_file)) == ""
+
+        finally:
+            Path(temp_file).unlink()
+
     def test_load_textbook_file_not_found(self):
         """파일이 존재하지 않을 때 예외 처리 테스트"""
         with pytest.raises(Exception) as exc_info:
@@ -97,6 +125,13 @@ class TestDocumentProcessor:
         assert len(chunks) >= 2
         # 오버랩 확인을 위해 연속된 청크 간에 공통 부분이 있는지 확인
 
+    def test_chunk_text_overlap_keeps_trailing_sentences(self):
+        """오버랩 범위 안의 마지막 문장이 다음 청크 앞에 다시 들어가는지 테스트"""
+        text = "a. b. c. d. e. f. g. h."
+        chunks = self.processor.chunk_text(text, chunk_size=8, overlap=3)
+
+        assert chunks == ["a. b. c.", "c. d. e.", "e. f. g.", "g. h."]
+
     def test_preprocess_text(self):
         """텍스트 전처리 테스트"""
         text = "  여러  공백이   있는\n\n\n텍스트입니다.  "
@@ -128,6 +163,7 @@ class TestDocumentProcessor:
             assert doc.metadata['chunk_index'] == i
             assert doc.metadata['total_chunks'] == 3
             assert doc.metadata['chunk_size'] == len(chunks[i])
+            assert doc.metadata['content_hash'] == compute_content_hash(chunks[i])
 
     def test_add_metadata_empty_chunks(self):
         """빈 청크 리스트에 메타데이터 추가 테스트"""
@@ -0,0 +1,186 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.rag.embeddings import EmbeddingCache, EmbeddingsManager
+
+
+def _embedding_response(texts):
+    """입력 텍스트 길이를 값으로 하는 가짜 임베딩 응답 생성"""
+    response = Mock()
+    response.data = [Mock(embedding=[float(len(text)), 1.0]) for text in texts]
+    return response
+
+
+class TestEmbeddingCache:
+    """EmbeddingCache 테스트 클래스"""
+
+    def test_lru_eviction(self):
+        """최대 크기 초과 시 가장 오래 사용되지 않은 항목 제거 테스트"""
+        cache = EmbeddingCache(maxsize=2)
+        cache.set("a", [1.0])
+        cache.set("b", [2.0])
+        cache.get("a")
+        cache.set("c", [3.0])
+
+        assert cache.get("b") is None
+        assert cache.get("a") == [1.0]
+        assert cache.get("c") == [3.0]
+
+    def test_make_key_distinguishes_model(self):
+        """모델이 다르면 다른 키를 생성하는지 테스트"""
+        key1 = EmbeddingCache.make_key("text-embedding-ada-002", "기울기")
+        key2 = EmbeddingCache.make_key("text-embedding-3-small", "기울기")
+
+        assert key1 != key2
+        assert key1 == EmbeddingCache.make_key("text-embedding-ada-002", "기울기")
+
+    def test_disk_cache_persists_between_instances(self, tmp_path):
+        """디스크 캐시에 저장한 임베딩을 새 인스턴스에서 일괄 조회하는지 테스트"""
+        cache = EmbeddingCache(directory=str(tmp_path))
+        cache.set_many([("a", [0.5, 1.0]), ("b", [2.0, -1.0])])
+        cache.close()
+
+        reopened = EmbeddingCache(directory=str(tmp_path))
+
+        assert reopened.get_many(["b", "missing", "a"]) == [[2.0, -1.0], None, [0.5, 1.0]]
+        assert reopened.get_stats()['hits'] == 2
+        reopened.close()
+
+
+class TestEmbeddingsManagerCache:
+    """EmbeddingsManager 임베딩 캐시 테스트 클래스"""
+
+    def setup_method(self):
+        """각 테스트 메서드 실행 전 초기화"""
+        with patch('src.rag.embeddings.openai.OpenAI') as mock_openai:
+            self.mock_client = mock_openai.return_value
+            self.mock_client.embeddings.create.side_effect = lambda model, input: _embedding_response(input)
+            self.manager = EmbeddingsManager(api_key="test-key", cache=EmbeddingCache())
+        self.manager._count_tokens_each = Mock(side_effect=lambda texts: [1] * len(texts))
+
+    def test_generate_embeddings_only_requests_missing_texts(self):
+        """캐시에 없는 텍스트만 중복 없이 API로 요청하는지 테스트"""
+        self.manager.generate_embeddings(["일차함수"])
+
+        embeddings = self.manager.generate_embeddings(["광합성 과정", "일차함수", "광합성 과정"])
+
+        assert embeddings == [[6.0, 1.0], [4.0, 1.0], [6.0, 1.0]]
+        last_call = self.mock_client.embeddings.create.call_args
+        assert last_call.kwargs['input'] == ["광합성 과정"]
+        assert self.mock_client.embeddings.create.call_count == 2
+
+    def test_generate_single_embedding_uses_cache(self):
+        """같은 쿼리 재임베딩 시 캐시 사용 테스트"""
+        first = self.manager.generate_single_embedding("기울기란?")
+        second = self.manager.generate_single_embedding("기울기란?")
+
+        assert first == second == [5.0, 1.0]
+        self.mock_client.embeddings.create.assert_called_once()
+        assert self.manager.cache.get_stats()['hits'] == 1
+
+    def test_generate_single_embedding_single_retry_layer(self):
+        """단일 임베딩 요청이 계속 실패해도 재시도는 한 단계(최대 3번)만 하는지 테스트"""
+        self.mock_client.embeddings.create.side_effect = Exception("API 오류")
+
+        with patch('tenacity.nap.time.sleep'):
+            with pytest.raises(Exception):
+                self.manager.generate_single_embedding("기울기란?")
+
+        assert self.mock_client.embeddings.create.call_count == 3
+
+    def test_split_long_text_counts_sentences_once(self):
+        """문장별 토큰 수를 한 번의 배치 계산으로 구해 분할하는지 테스트"""
+        word_count = lambda text: len(text.split())
+        self.manager._count_tokens = Mock(side_effect=word_count)
+        self.manager._count_tokens_each = Mock(side_effect=lambda texts: [word_count(t) for t in texts])
+
+        text = "가 나 다. 라 마. 바 사 아 자. 차"
+        chunks = self.manager.split_long_text(text, max_tokens=5)
+
+        assert chunks == ["가 나 다. 라 마.", "바 사 아 자. 차."]
+        self.manager._count_tokens_each.assert_called_once()
+
+    def test_pack_batches_respects_item_and_token_limits(self):
+        """입력 수와 토큰 수 제한에 맞춰 배치를 나누는지 테스트"""
+        self.manager.batch_size = 3
+        self.manager.max_batch_tokens = 100
+
+        batches = self.manager._pack_batches([10, 10, 10, 10, 60, 50, 200, 5])
+
+        assert batches == [(0, 3), (3, 5), (5, 6), (6, 7), (7, 8)]
+
+    def test_embed_texts_uses_token_aware_batches(self):
+        """짧은 텍스트는 고정 100개가 아닌 하나의 요청으로 묶는지 테스트"""
+        texts = [f"문장 {i}" for i in range(250)]
+
+        embeddings = self.manager.generate_embeddings(texts)
+
+        assert len(embeddings) == 250
+        self.mock_client.embeddings.create.assert_called_once()
+
+    def test_embed_texts_dispatches_batches_concurrently(self):
+        """배치가 여러 개면 동시에 요청해도 원래 순서대로 임베딩을 모으는지 테스트"""
+        self.manager.batch_size = 2
+        texts = ["가", "나나", "다다다", "라라라라", "마마마마마"]
+
+        embeddings = self.manager.generate_embeddings(texts)
+
+        assert embeddings == [[float(len(text)), 1.0] for text in texts]
+        assert self.mock_client.embeddings.create.call_count == 3
+
+    def test_embed_texts_retries_only_failed_batch(self):
+        """한 배치가 실패하면 그 배치만 다시 요청하고 성공한 배치는 재요청하지 않는지 테스트"""
+        self.manager.batch_size = 2
+        self.manager.max_concurrency = 1
+        texts = ["가", "나나", "다다다", "라라라라", "마마마마마"]
+        failures = iter([True])
+
+        def flaky_create(model, input):
+            if input == ["다다다", "라라라라"] and next(failures, False):
+                raise Exception("일시적인 오류")
+            return _embedding_response(input)
+
+        self.mock_client.embeddings.create.side_effect = flaky_create
+        with patch('tenacity.nap.time.sleep'):
+            embeddings = self.manager.generate_embeddings(texts)
+
+        assert embeddings == [[float(len(text)), 1.0] for text in texts]
+        # 배치 3개 + 실패한 배치 재시도 1번
+        assert self.mock_client.embeddings.create.call_count == 4
+
+    def test_agenerate_embeddings(self):
+        """비동기 임베딩 생성이 캐시를 공유하고 배치를 모두 요청하는지 테스트"""
+        self.manager.batch_size = 2
+        self.manager.generate_embeddings(["가"])
+        self.manager.async_client = Mock()
+        self.manager.async_client.embeddings.create = AsyncMock(
+            side_effect=lambda model, input: _embedding_response(input)
+        )
+
+        embeddings = asyncio.run(self.manager.agenerate_embeddings(["나나", "가", "다다다", "라라라라"]))
+
+        assert embeddings == [[2.0, 1.0], [1.0, 1.0], [3.0, 1.0], [4.0, 1.0]]
+        assert self.manager.async_client.embeddings.create.await_count == 2
+
+
+class TestEmbeddingsManagerCoalescing:
+    """EmbeddingsManager 단일 임베딩 요청 묶음 처리 테스트 클래스"""
+
+    def test_concurrent_single_embeddings_share_one_request(self):
+        """동시에 들어온 단일 임베딩 요청을 한 번의 API 호출로 묶는지 테스트"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        with patch('src.rag.embeddings.openai.OpenAI') as mock_openai:
+            mock_client = mock_openai.return_value
+            mock_client.embeddings.create.side_effect = lambda model, input: _embedding_response(input)
+            manager = EmbeddingsManager(api_key="test-key", coalesce_window=5.0, coalesce_max_batch=4)
+        manager._count_tokens_each = Mock(side_effect=lambda texts: [1] * len(texts))
+
+        queries = ["가", "나나", "다다다", "라라라라"]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            embeddings = list(executor.map(manager.generate_single_embedding, queries))
+
+        # 4개가 모이면 대기 시간 전에 바로 한 번에 요청
+        assert embeddings == [[1.0, 1.0], [2.0, 1.0], [3.0, 1.0], [4.0, 1.0]]
+        mock_client.embeddings.create.assert_called_once()
@@ -0,0 +1,87 @@
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+faiss = pytest.importorskip("faiss")
+
+from src.rag.faiss_store import FAISSVectorStore
+from src.rag.document_processor import Document
+
+
+class TestFAISSVectorStore:
+    """FAISSVectorStore 테스트 클래스"""
+
+    def setup_method(self):
+        """각 테스트 메서드 실행 전 초기화"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.vector_store = FAISSVectorStore(
+            collection_name="test_collection",
+            persist_directory=self.temp_dir
+        )
+
+        self.documents = [
+            Document(content="일차함수의 기울기", metadata={"subject": "수학", "unit": "일차함수"}),
+            Document(content="광합성의 과정", metadata={"subject": "과학", "unit": "광합성"}),
+            Document(content="일차함수의 그래프", metadata={"subject": "수학", "unit": "일차함수"})
+        ]
+        self.embeddings = [
+            [1.0, 0.0, 0.0],
+            [0.0, 1.0, 0.0],
+            [0.8, 0.0, 0.6]
+        ]
+
+    def teardown_method(self):
+        """각 테스트 메서드 실행 후 정리"""
+        if Path(self.temp_dir).exists():
+            shutil.rmtree(self.temp_dir)
+
+    def test_search(self):
+        """코사인 유사도 순 검색 테스트"""
+        self.vector_store.add_documents(self.documents, self.embeddings)
+
+        results = self.vector_store.similarity_search_by_embedding([1.0, 0.0, 0.0], k=2)
+
+        assert [doc.content for doc in results] == ["일차함수의 기울기", "일차함수의 그래프"]
+        assert results[0].metadata['similarity_score'] == pytest.approx(1.0)
+
+    def test_search_with_filter(self):
+        """메타데이터 필터 검색 테스트"""
+        self.vector_store.add_documents(self.documents, self.embeddings)
+
+        results = self.vector_store.similarity_search_by_embedding(
+            [1.0, 0.0, 0.0], k=3, filter_metadata={"subject": "과학"}
+        )
+
+        assert [doc.content for doc in results] == ["광합성의 과정"]
+
+    def test_persistence(self):
+        """저장된 인덱스 재로드 테스트"""
+        self.vector_store.add_documents(self.documents, self.embeddings)
+
+        reloaded = FAISSVectorStore(collection_name="test_collection", persist_directory=self.temp_dir)
+
+        assert reloaded.get_collection_info()['total_documents'] == 3
+        results = reloaded.similarity_search_by_embedding([0.0, 1.0, 0.0], k=1)
+        assert results[0].content == "광합성의 과정"
+
+    def test_add_documents_np_does_not_modify_input(self):
+        """정규화가 호출자의 임베딩 배열을 바꾸지 않는지 테스트"""
+        embeddings = np.array([[3.0, 4.0, 0.0]], dtype=np.float32)
+
+        self.vector_store.add_documents_np(
+            ids=["doc-1"], embeddings=embeddings, metadatas=[{}], documents=["내용"]
+        )
+
+        assert embeddings.tolist() == [[3.0, 4.0, 0.0]]
+
+    def test_clear_collection(self):
+        """인덱스 초기화 테스트"""
+        self.vector_store.add_documents(self.documents, self.embeddings)
+
+        self.vector_store.clear_collection()
+
+        assert self.vector_store.get_collection_info()['total_documents'] == 0
+        assert self.vector_store.similarity_search_by_embedding([1.0, 0.0, 0.0], k=1) == []
@@ -0,0 +1,476 @@
+import asyncio
+import httpx
+import numpy as np
+import openai
+import pytest
+from unittest.mock import Mock, patch
+
+from src.models.llm_client import LLMClient, SemanticCache, _split_paragraphs
+
+
+def make_completion(content: str) -> Mock:
+    """Chat Completions API 응답 모의 객체 생성"""
+    response = Mock()
+    response.choices = [Mock(message=Mock(content=content))]
+    response.usage = Mock(completion_tokens=10, total_tokens=30)
+    return response
+
+
+class TestLLMClientCache:
+    """LLMClient 응답 캐시 테스트 클래스"""
+
+    def setup_method(self):
+        """각 테스트 메서드 실행 전 초기화"""
+        self.encoding_patcher = patch('src.models.llm_client._get_encoding')
+        mock_get_encoding = self.encoding_patcher.start()
+        mock_get_encoding.return_value.encode.side_effect = lambda text: text.split()
+
+        self.mock_embeddings_manager = Mock()
+
+    def teardown_method(self):
+        """각 테스트 메서드 실행 후 정리"""
+        self.encoding_patcher.stop()
+
+    def make_client(self, **kwargs) -> LLMClient:
+        client = LLMClient(api_key="test-key", **kwargs)
+        client.client = Mock()
+        client.client.chat.completions.create.return_value = make_completion("응답")
+        return client
+
+    def test_cache_disabled_by_default(self):
+        """기본 설정에서는 매 요청마다 API 호출하는지 테스트"""
+        client = self.make_client()
+
+        client.generate_response("일차함수의 기울기는?")
+        client.generate_response("일차함수의 기울기는?")
+
+        assert client.client.chat.completions.create.call_count == 2
+
+    def test_exact_cache_hit(self):
+        """같은 프롬프트 재요청 시 API 호출 없이 캐시 응답 반환 테스트"""
+        client = self.make_client(cache_responses=True)
+
+        first = client.generate_response("일차함수의 기울기는?")
+        second = client.generate_response("일차함수의 기울기는?")
+
+        assert first == second == "응답"
+        client.client.chat.completions.create.assert_called_once()
+        assert client.get_cache_stats()['exact_hits'] == 1
+
+    def test_exact_cache_distinguishes_system_message(self):
+        """시스템 메시지가 다르면 캐시를 공유하지 않는지 테스트"""
+        client = self.make_client(cache_responses=True)
+
+        client.generate_response("일차함수의 기울기는?")
+        client.generate_response("일차함수의 기울기는?", system_message="JSON으로 답하세요")
+
+        assert client.client.chat.completions.create.call_count == 2
+
+    def test_semantic_cache_hit(self):
+        """비슷한 프롬프트는 의미 캐시에서 응답을 재사용하는지 테스트"""
+        self.mock_embeddings_manager.generate_single_embedding.side_effect = [
+            [1.0, 0.0, 0.0],
+            [0.99, 0.05, 0.0]
+        ]
+        client = self.make_client(semantic_cache=True, embeddings_manager=self.mock_embeddings_manager)
+
+        client.generate_response("일차함수의 기울기는?")
+        result = client.generate_response("일차함수의 기울기는 무엇인가?")
+
+        assert result == "응답"
+        client.client.chat.completions.create.assert_called_once()
+        assert client.get_cache_stats()['semantic_hits'] == 1
+
+    def test_semantic_cache_requires_embeddings_manager(self):
+        """임베딩 관리자 없이 의미 캐시를 켜면 오류가 나는지 테스트"""
+        with pytest.raises(ValueError):
+            LLMClient(api_key="test-key", semantic_cache=True)
+
+
+class TestSemanticCache:
+    """SemanticCache 테스트 클래스"""
+
+    def test_hit_above_threshold(self):
+        """임계값 이상 유사한 임베딩 조회 테스트"""
+        cache = SemanticCache(threshold=0.9, max_entries=4)
+        cache.set(np.array([1.0, 0.0]), "ctx", "응답 A")
+
+        assert cache.get(np.array([2.0, 0.1]), "ctx") == "응답 A"
+        assert cache.get(np.array([0.0, 1.0]), "ctx") is None
+
+    def test_context_isolation(self):
+        """요청 조건이 다른 항목은 조회되지 않는지 테스트"""
+        cache = SemanticCache(threshold=0.9, max_entries=4)
+        cache.set(np.array([1.0, 0.0]), "ctx-a", "응답 A")
+
+        assert cache.get(np.array([1.0, 0.0]), "ctx-b") is None
+
+    def test_lru_replacement(self):
+        """가득 찼을 때 가장 오래 사용되지 않은 항목을 교체하는지 테스트"""
+        cache = SemanticCache(threshold=0.9, max_entries=2)
+        cache.set(np.array([1.0, 0.0, 0.0]), "ctx", "A")
+        cache.set(np.array([0.0, 1.0, 0.0]), "ctx", "B")
+        cache.get(np.array([1.0, 0.0, 0.0]), "ctx")
+        cache.set(np.array([0.0, 0.0, 1.0]), "ctx", "C")
+
+        assert len(cache) == 2
+        assert cache.get(np.array([0.0, 1.0, 0.0]), "ctx") is None
+        assert cache.get(np.array([1.0, 0.0, 0.0]), "ctx") == "A"
+        assert cache.get(np.array([0.0, 0.0, 1.0]), "ctx") == "C"
+
+
+class TestLLMClientStream:
+    """LLMClient 스트리밍 응답 테스트 클래스"""
+
+    def setup_method(self):
+        """각 테스트 메서드 실행 전 초기화"""
+        self.encoding_patcher = patch('src.models.llm_client._get_encoding')
+        mock_get_encoding = self.encoding_patcher.start()
+        mock_get_encoding.return_value.encode.side_effect = lambda text: text.split()
+
+        self.client = LLMClient(api_key="test-key")
+        self.client.client = Mock()
+
+    def teardown_method(self):
+        """각 테스트 메서드 실행 후 정리"""
+        self.encoding_patcher.stop()
+
+    def test_generate_response_stream(self):
+        """응답 조각을 순서대로 내보내고 마지막 청크의 사용량을 기록하는지 테스트"""
+        chunks = [
+            Mock(choices=[Mock(delta=Mock(content="일차"))], usage=None),
+            Mock(choices=[Mock(delta=Mock(content=None))], usage=None),
+            Mock(choices=[Mock(delta=Mock(content="함수"))], usage=None),
+            Mock(choices=[], usage=Mock(completion_tokens=2, total_tokens=12))
+        ]
+        self.client.client.chat.completions.create.return_value = iter(chunks)
+
+        pieces = list(self.client.generate_response_stream("일차함수란?"))
+
+        assert pieces == ["일차", "함수"]
+        call_kwargs = self.client.client.chat.completions.create.call_args.kwargs
+        assert call_kwargs['stream'] is True
+        assert self.client.usage_stats['total_requests'] == 1
+        assert self.client.usage_stats['total_completion_tokens'] == 2
+
+    def test_structured_response_early_stop(self):
+        """JSON 객체가 닫힌 뒤의 내용은 버리고, 사용량 청크까지 스트림을 읽는지 테스트"""
+        client = LLMClient(model_name="gpt-4", api_key="test-key")
+        client.client = Mock()
+        chunks = [
+            Mock(choices=[Mock(delta=Mock(content='{"answer": "{2}", '))], usage=None),
+            Mock(choices=[Mock(delta=Mock(content='"nested": {"a": 1}} 이상입니다'))], usage=None),
+            Mock(choices=[Mock(delta=Mock(content=" 추가 설명"))], usage=None),
+            Mock(choices=[], usage=Mock(completion_tokens=40, total_tokens=60))
+        ]
+        client.client.chat.completions.create.return_value = iter(chunks)
+
+        result = client.generate_structured_response("기울기는?", early_stop=True)
+
+        assert result == {"answer": "{2}", "nested": {"a": 1}}
+        assert client.client.chat.completions.create.call_args.kwargs['stream'] is True
+        assert client.usage_stats['total_requests'] == 1
+        # 추론 토큰 등이 포함된 실제 사용량을 기록
+        assert client.usage_stats['total_completion_tokens'] == 40
+
+    def test_structured_response_early_stop_skipped_in_json_mode(self):
+        """JSON 모드 모델은 스트리밍 없이 일반 요청으로 처리하는지 테스트"""
+        self.client.client.chat.completions.create.return_value = make_completion('{"answer": 2}')
+
+        result = self.client.generate_structured_response("기울기는?", early_stop=True)
+
+        assert result == {"answer": 2}
+        assert 'stream' not in self.client.client.chat.completions.create.call_args.kwargs
+
+
+class TestLLMClientRetry:
+    """LLMClient 재시도 테스트 클래스"""
+
+    def setup_method(self):
+        """각 테스트 메서드 실행 전 초기화"""
+        self.encoding_patcher = patch('src.models.llm_client._get_encoding')
+        self.encoding_patcher.start()
+        self.sleep_patcher = patch('src.models.llm_client.time.sleep')
+        self.mock_sleep = self.sleep_patcher.start()
+
+        self.client = LLMClient(api_key="test-key")
+        self.client.client = Mock()
+        self.connection_error = openai.APIConnectionError(
+            request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+        )
+
+    def teardown_method(self):
+        """각 테스트 메서드 실행 후 정리"""
+        self.sleep_patcher.stop()
+        self.encoding_patcher.stop()
+
+    def test_retries_transient_errors(self):
+        """일시적인 오류는 재시도 후 성공하는지 테스트"""
+        self.client.client.chat.completions.create.side_effect = [
+            self.connection_error,
+            make_completion("응답")
+        ]
+
+        assert self.client.generate_response("기울기는?") == "응답"
+        assert self.client.client.chat.completions.create.call_count == 2
+        self.mock_sleep.assert_called_once()
+
+    def test_gives_up_after_max_attempts(self):
+        """최대 시도 횟수를 넘으면 오류를 전달하는지 테스트"""
+        self.client.client.chat.completions.create.side_effect = self.connection_error
+
+        with pytest.raises(openai.APIConnectionError):
+            self.client.generate_response("기울기는?")
+        assert self.client.client.chat.completions.create.call_count == 3
+
+    def test_does_not_retry_other_errors(self):
+        """일시적이지 않은 오류는 즉시 전달하는지 테스트"""
+        self.client.client.chat.completions.create.side_effect = ValueError("bad request")
+
+        with pytest.raises(ValueError):
+            self.client.generate_response("기울기는?")
+        self.client.client.chat.completions.create.assert_called_once()
+        self.mock_sleep.assert_not_called()
+
+    def test_stream_retries_transient_errors(self):
+        """스트리밍 요청도 일시적인 오류는 재시도하는지 테스트"""
+        self.client.client.chat.completions.create.side_effect = [
+            self.connection_error,
+            iter([Mock(choices=[Mock(delta=Mock(content="응답"))], usage=None)])
+        ]
+
+        assert list(self.client.generate_response_stream("기울기는?")) == ["응답"]
+        assert self.client.client.chat.completions.create.call_count == 2
+        self.mock_sleep.assert_called_once()
+
+
+class TestLLMClientUsage:
+    """LLMClient 사용량 및 비용 계산 테스트 클래스"""
+
+    def setup_method(self):
+        """각 테스트 메서드 실행 전 초기화"""
+        self.encoding_patcher = patch('src.models.llm_client._get_encoding')
+        mock_get_encoding = self.encoding_patcher.start()
+        mock_get_encoding.return_value.encode.side_effect = lambda text: text.split()
+
+    def teardown_method(self):
+        """각 테스트 메서드 실행 후 정리"""
+        self.encoding_patcher.stop()
+
+    def test_estimate_cost(self):
+        """모델 가격표 기준 비용 추정 테스트"""
+        client = LLMClient(model_name="gpt-4", api_key="test-key")
+
+        cost = client.estimate_cost("one two three four", estimated_completion_tokens=1000)
+
+        assert cost['prompt_tokens'] == 4
+        assert cost['completion_cost_usd'] == pytest.approx(0.06)
+        assert cost['total_cost_usd'] == pytest.approx(0.06 + 4 * 0.03 / 1000)
+
+    def test_estimate_costs_batch(self):
+        """여러 텍스트의 토큰 수와 비용을 한 번에 추정하는 테스트"""
+        client = LLMClient(model_name="gpt-4", api_key="test-key")
+        client.encoding.encode_batch.side_effect = lambda texts, num_threads: [text.split() for text in texts]
+
+        cost = client.estimate_costs_batch(["one two", "three four five", "six"])
+
+        assert cost['total_tokens'] == 6
+        assert cost['num_texts'] == 3
+        assert cost['estimated_cost_usd'] == pytest.approx(6 * 0.03 / 1000)
+        assert client.estimate_costs_batch([])['total_tokens'] == 0
+
+    def test_estimate_tokens_long_text(self):
+        """긴 텍스트는 문단 단위로 나눠 배치 인코딩하는지 테스트"""
+        client = LLMClient(api_key="test-key")
+        client.encoding.encode_batch.side_effect = lambda texts, num_threads: [text.split() for text in texts]
+        paragraph = "일차함수 " * 2000 + "\n\n"
+        text = paragraph * 4
+
+        assert client.estimate_tokens(text) == 8000
+        pieces = client.encoding.encode_batch.call_args.args[0]
+        assert len(pieces) > 1
+        assert "".join(pieces) == text
+
+    def test_split_paragraphs(self):
+        """문단 경계 분할 결과를 이어 붙이면 원문과 같은지 테스트"""
+        text = "가" * 30 + "\n\n" + "나" * 30 + "\n\n" + "다" * 5
+
+        pieces = _split_paragraphs(text, 40)
+
+        assert pieces == ["가" * 30 + "\n\n", "나" * 30 + "\n\n" + "다" * 5]
+        assert _split_paragraphs("가" * 100, 40) == ["가" * 100]
+
+    def test_unknown_model_uses_default_pricing(self):
+        """가격표에 없는 모델은 기본 가격을 사용하는지 테스트"""
+        client = LLMClient(model_name="unknown-model", api_key="test-key")
+
+        client._update_usage_stats(prompt_tokens=1000, completion_tokens=1000, total_tokens=2000)
+
+        assert client.usage_stats['total_cost_usd'] == pytest.approx(0.00025 + 0.002)
+
+
+    def test_system_message_tokens_memoized(self):
+        """고정된 시스템 메시지는 토큰화를 반복하지 않는지 테스트"""
+        client = LLMClient(api_key="test-key")
+        messages = client._build_messages("one two three", "answer in JSON")
+
+        first = client._count_messages_tokens(messages)
+        encode_calls = client.encoding.encode.call_count
+        second = client._count_messages_tokens(client._build_messages("one two three", "answer in JSON"))
+
+        # 두 번째 호출에서는 사용자 메시지(role, content)만 토큰화
+        assert first == second == (1 + 3) + (1 + 3) + 4 * 2 + 2
+        assert client.encoding.encode.call_count == encode_calls + 2
+        assert messages[0] is client._build_messages("다른 질문", "answer in JSON")[0]
+
+    def test_requests_by_hour(self):
+        """시간당 요청 수를 원형 버퍼로 기록하고 요청 시에만 반환하는지 테스트"""
+        client = LLMClient(api_key="test-key")
+        base = 500000 * 3600
+
+        with patch('src.models.llm_client.time.time', return_value=base + 10):
+            client._update_usage_stats(prompt_tokens=1, completion_tokens=1, total_tokens=2)
+            client._update_usage_stats(prompt_tokens=1, completion_tokens=1, total_tokens=2)
+
+        # 7일(168시간) 뒤 같은 칸을 사용할 때 이전 주기의 값은 초기화
+        with patch('src.models.llm_client.time.time', return_value=base + 168 * 3600 + 10):
+            client._update_usage_stats(prompt_tokens=1, completion_tokens=1, total_tokens=2)
+            usage = client.track_usage(include_hourly=True)
+
+        assert 'requests_by_hour' not in client.track_usage()
+        assert list(usage['requests_by_hour'].values()) == [1]
+        assert usage['total_requests'] == 3
+
+    def test_empty_usage_matches_track_usage(self):
+        """empty_usage가 요청 전 클라이언트의 사용량과 같은지 테스트"""
+        client = LLMClient(model_name="gpt-4", api_key="test-key")
+
+        assert LLMClient.empty_usage("gpt-4") == client.track_usage()
+
+class TestLLMClientJsonParsing:
+    """LLMClient JSON 응답 파싱 테스트 클래스"""
+
+    def setup_method(self):
+        """각 테스트 메서드 실행 전 초기화"""
+        self.encoding_patcher = patch('src.models.llm_client._get_encoding')
+        self.encoding_patcher.start()
+        self.client = LLMClient(api_key="test-key")
+
+    def teardown_method(self):
+        """각 테스트 메서드 실행 후 정리"""
+        self.encoding_patcher.stop()
+
+    def test_parse_valid_json(self):
+        """올바른 JSON 파싱 테스트"""
+        assert self.client._parse_json_response('{"question": "기울기는?", "answer": 2}') == {
+            "question": "기울기는?",
+            "answer": 2
+        }
+
+    def test_parse_json_in_code_block(self):
+        """코드 블록으로 감싼 JSON 파싱 테스트"""
+        response = '```json\n{"question": "기울기는?"}\n```'
+
+        assert self.client._parse_json_response(response) == {"question": "기울기는?"}
+
+    def test_parse_json_with_surrounding_text(self):
+        """앞뒤 설명문이 붙은 JSON에서 객체만 추출하는지 테스트"""
+        response = '다음은 문제입니다: {"question": "{x}의 기울기는?", "meta": {"a": 1}} 참고하세요 {"b": 2}'
+
+        with patch('src.models.llm_client.json_repair', None):
+            assert self.client._parse_json_response(response) == {
+                "question": "{x}의 기울기는?",
+                "meta": {"a": 1}
+            }
+
+    def test_parse_invalid_json_raises(self):
+        """복구할 수 없는 응답은 예외가 발생하는지 테스트"""
+        with pytest.raises(ValueError):
+            self.client._parse_json_response("JSON이 아닌 응답")
+
+    def test_structured_response_uses_json_mode(self):
+        """JSON 모드 지원 모델은 response_format을 지정해 요청하는지 테스트"""
+        self.client.client = Mock()
+        self.client.client.chat.completions.create.return_value = make_completion('{"answer": 2}')
+
+        result = self.client.generate_structured_response("기울기는?")
+
+        assert result == {"answer": 2}
+        call_kwargs = self.client.client.chat.completions.create.call_args.kwargs
+        assert call_kwargs['response_format'] == {"type": "json_object"}
+
+    def test_structured_response_without_json_mode(self):
+        """JSON 모드 미지원 모델은 응답 복구 경로를 사용하는지 테스트"""
+        client = LLMClient(model_name="gpt-4", api_key="test-key")
+        client.client = Mock()
+        client.client.chat.completions.create.return_value = make_completion('```json\n{"answer": 2}\n```')
+
+        result = client.generate_structured_response("기울기는?")
+
+        assert result == {"answer": 2}
+        assert client.supports_json_mode is False
+
+
+
+class TestLLMClientBatch:
+    """LLMClient 배치 구조화 응답 테스트 클래스"""
+
+    def setup_method(self):
+        """각 테스트 메서드 실행 전 초기화"""
+        self.encoding_patcher = patch('src.models.llm_client._get_encoding')
+        self.encoding_patcher.start()
+        self.client = LLMClient(api_key="test-key")
+
+    def teardown_method(self):
+        """각 테스트 메서드 실행 후 정리"""
+        self.encoding_patcher.stop()
+
+    @staticmethod
+    def fake_response(prompt, response_format="json", max_tokens=None):
+        if prompt == "실패":
+            raise ValueError("JSON 파싱 실패")
+        return {"prompt": prompt}
+
+    def test_batch_keeps_successful_responses(self):
+        """한 프롬프트가 실패해도 나머지 응답은 자리에 맞게 반환하는지 테스트"""
+        with patch.object(self.client, 'generate_structured_response', side_effect=self.fake_response) as mock_generate:
+            results = self.client.generate_structured_responses_batch(
+                ["가", "실패", "나"], return_exceptions=True
+            )
+
+        assert results[0] == {"prompt": "가"}
+        assert isinstance(results[1], ValueError)
+        assert results[2] == {"prompt": "나"}
+        assert mock_generate.call_count == 3
+
+    def test_batch_raises_without_return_exceptions(self):
+        """return_exceptions가 없으면 실패한 요청의 예외를 발생시키는지 테스트"""
+        with patch.object(self.client, 'generate_structured_response', side_effect=self.fake_response):
+            with pytest.raises(ValueError):
+                self.client.generate_structured_responses_batch(["가", "실패"])
+
+    def test_batch_same_prompt_parse_error_per_slot(self):
+        """같은 프롬프트 n개 요청에서 파싱에 실패한 응답만 예외로 표시하는지 테스트"""
+        with patch.object(self.client, 'generate_responses', return_value=['{"a": 1}', "JSON이 아닌 응답"]):
+            results = self.client.generate_structured_responses_batch(
+                ["가", "가"], return_exceptions=True
+            )
+
+        assert results[0] == {"a": 1}
+        assert isinstance(results[1], ValueError)
+
+    def test_batch_async_keeps_successful_responses(self):
+        """비동기 배치에서 한 요청이 실패해도 나머지 응답을 모두 받는지 테스트"""
+        async def fake_response_async(prompt, response_format="json", max_tokens=None):
+            return self.fake_response(prompt)
+
+        with patch.object(self.client, 'generate_structured_response_async', side_effect=fake_response_async):
+            results = asyncio.run(self.client.generate_structured_responses_batch_async(
+                ["가", "실패", "나"], return_exceptions=True
+            ))
+            with pytest.raises(ValueError):
+                asyncio.run(self.client.generate_structured_responses_batch_async(["가", "실패"]))
+
+        assert results[0] == {"prompt": "가"}
+        assert isinstance(results[1], ValueError)
+        assert results[2] == {"prompt": "나"}
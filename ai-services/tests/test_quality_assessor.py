@@ -0,0 +1,165 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.evaluation.quality_assessor import AssessmentCache, QualityAssessor
+from src.models.llm_client import LLMClient
+
+
+class TestQualityAssessor:
+    """QualityAssessor 테스트 클래스"""
+
+    def setup_method(self):
+        """각 테스트 메서드 실행 전 초기화"""
+        self.mock_llm_client = Mock(spec=LLMClient)
+        self.assessor = QualityAssessor(llm_client=self.mock_llm_client)
+
+        self.question_data = {
+            "question": "일차함수 y = 2x + 3에서 기울기는 무엇인가?",
+            "options": ["1", "2", "3", "-2", "0"],
+            "correct_answer": 2
+        }
+        self.source_context = "일차함수는 y = ax + b 형태이며 a는 기울기입니다."
+
+    def test_assess_question(self):
+        """단일 문제 평가 테스트"""
+        self.mock_llm_client.generate_structured_response.return_value = {"overall_score": 8}
+
+        result = self.assessor.assess_question(self.question_data, self.source_context)
+
+        assert result == {"overall_score": 8}
+        prompt = self.mock_llm_client.generate_structured_response.call_args.kwargs['prompt']
+        assert "기울기" in prompt
+        assert self.source_context in prompt
+
+    def test_assess_questions_batch(self):
+        """여러 문제를 한 번의 배치 호출로 평가하는 테스트"""
+        other_question = dict(self.question_data, question="일차함수 y = 2x + 3의 y절편은?")
+        self.mock_llm_client.generate_structured_responses_batch.return_value = [
+            {"overall_score": 8},
+            {"overall_score": 6}
+        ]
+
+        results = self.assessor.assess_questions([
+            (self.question_data, self.source_context),
+            (other_question, self.source_context)
+        ])
+
+        assert results == [{"overall_score": 8}, {"overall_score": 6}]
+        self.mock_llm_client.generate_structured_responses_batch.assert_called_once()
+        prompts = self.mock_llm_client.generate_structured_responses_batch.call_args.kwargs['prompts']
+        assert len(prompts) == 2
+        assert "y절편" in prompts[1]
+        self.mock_llm_client.generate_structured_response.assert_not_called()
+
+    def test_assess_questions_empty(self):
+        """빈 배치 평가 테스트"""
+        assert self.assessor.assess_questions([]) == []
+        self.mock_llm_client.generate_structured_responses_batch.assert_not_called()
+
+    def test_assess_question_uses_cache(self):
+        """같은 문제/컨텍스트 재평가 시 캐시 사용 테스트"""
+        self.mock_llm_client.generate_structured_response.return_value = {"overall_score": 8}
+
+        first = self.assessor.assess_question(self.question_data, self.source_context)
+        second = self.assessor.assess_question(self.question_data, self.source_context)
+
+        assert first == second == {"overall_score": 8}
+        self.mock_llm_client.generate_structured_response.assert_called_once()
+
+        stats = self.assessor.get_cache_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+
+    def test_assess_questions_only_sends_cache_misses(self):
+        """배치 평가 시 캐시에 없는 문제만 LLM에 보내는지 테스트"""
+        self.mock_llm_client.generate_structured_response.return_value = {"overall_score": 8}
+        self.assessor.assess_question(self.question_data, self.source_context)
+
+        other_question = dict(self.question_data, question="일차함수 y = 2x + 3의 y절편은?")
+        self.mock_llm_client.generate_structured_responses_batch.return_value = [{"overall_score": 6}]
+
+        results = self.assessor.assess_questions([
+            (self.question_data, self.source_context),
+            (other_question, self.source_context)
+        ])
+
+        assert results == [{"overall_score": 8}, {"overall_score": 6}]
+        prompts = self.mock_llm_client.generate_structured_responses_batch.call_args.kwargs['prompts']
+        assert len(prompts) == 1
+
+    def test_assess_question_async_coalesces_duplicates(self):
+        """동시에 들어온 같은 평가 요청을 한 번의 LLM 호출로 합치는지 테스트"""
+        async def slow_response(**kwargs):
+            await asyncio.sleep(0.01)
+            return {"overall_score": 7}
+
+        self.mock_llm_client.generate_structured_response_async = AsyncMock(side_effect=slow_response)
+
+        async def run():
+            return await asyncio.gather(*[
+                self.assessor.assess_question_async(self.question_data, self.source_context)
+                for _ in range(3)
+            ])
+
+        results = asyncio.run(run())
+
+        assert results == [{"overall_score": 7}] * 3
+        assert self.mock_llm_client.generate_structured_response_async.await_count == 1
+        assert self.assessor._inflight == {}
+
+    def test_assess_question_async_propagates_errors(self):
+        """공유 요청 실패 시 모든 호출자에게 예외가 전달되는지 테스트"""
+        async def failing_response(**kwargs):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("API Error")
+
+        self.mock_llm_client.generate_structured_response_async = AsyncMock(side_effect=failing_response)
+
+        async def run():
+            return await asyncio.gather(*[
+                self.assessor.assess_question_async(self.question_data, self.source_context)
+                for _ in range(2)
+            ], return_exceptions=True)
+
+        results = asyncio.run(run())
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert self.mock_llm_client.generate_structured_response_async.await_count == 1
+        assert self.assessor._inflight == {}
+
+
+class TestAssessmentCache:
+    """AssessmentCache 테스트 클래스"""
+
+    def test_lru_eviction(self):
+        """최대 크기 초과 시 가장 오래 사용되지 않은 항목 제거 테스트"""
+        cache = AssessmentCache(maxsize=2, ttl=60)
+        cache.set("a", {"score": 1})
+        cache.set("b", {"score": 2})
+        cache.get("a")
+        cache.set("c", {"score": 3})
+
+        assert cache.get("b") is None
+        assert cache.get("a") == {"score": 1}
+        assert cache.get("c") == {"score": 3}
+        assert cache.get_stats()['evictions'] == 1
+
+    def test_ttl_expiry(self):
+        """TTL 경과 후 항목 만료 테스트"""
+        cache = AssessmentCache(maxsize=10, ttl=10)
+
+        with patch('src.evaluation.quality_assessor.time.monotonic', return_value=100.0):
+            cache.set("a", {"score": 1})
+            assert cache.get("a") == {"score": 1}
+
+        with patch('src.evaluation.quality_assessor.time.monotonic', return_value=111.0):
+            assert cache.get("a") is None
+
+    def test_make_key_distinguishes_context(self):
+        """컨텍스트가 다르면 다른 키를 생성하는지 테스트"""
+        key1 = AssessmentCache.make_key('{"q": 1}', "context A")
+        key2 = AssessmentCache.make_key('{"q": 1}', "context B")
+
+        assert key1 != key2
+        assert key1 == AssessmentCache.make_key('{"q": 1}', "context A")
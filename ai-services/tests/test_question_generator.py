@@ -1,10 +1,12 @@
+import asyncio
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 import json
 
 from src.models.question_generator import QuestionGenerator
 from src.models.llm_client import LLMClient
 from src.rag.retriever import RAGRetriever
+from src.rag.document_processor import Document
 
 
 class TestQuestionGenerator:
@@ -26,7 +28,7 @@ class TestQuestionGenerator:
         """초기화 테스트"""
         assert self.generator.llm_client == self.mock_llm_client
         assert self.generator.retriever == self.mock_retriever
-        assert self.generator.question_history == []
+        assert len(self.generator.question_history) == 0
 
     def test_generate_question_success(self):
         """정상적인 문제 생성 테스트"""
@@ -179,6 +181,166 @@ class TestQuestionGenerator:
         # 실패한 것 제외하고 2개만 생성되어야 함
         assert len(results) == 2
 
+    def test_generate_batch_questions_async(self):
+        """비동기 배치 문제 생성 테스트 (실패한 문제는 건너뜀)"""
+        self.mock_llm_client.model_name = "gpt-5-mini"
+        self.mock_retriever.retrieve_documents.return_value = ["테스트 문서"]
+        self.mock_retriever.format_context.return_value = "테스트 컨텍스트"
+
+        mock_response = {
+            "title": "기울기 구하기",
+            "description": "일차함수의 기울기를 묻는 문제",
+            "content": "일차함수 y = 2x + 3에서 기울기는?",
+            "options": ["1", "2", "3", "4", "5"],
+            "correct_answer": 2,
+            "explanation": "y = ax + b에서 a가 기울기입니다.",
+            "hints": ["y = ax + b 형태를 떠올려 보세요."],
+            "tags": ["일차함수"]
+        }
+
+        # 배치 중 한 요청이 실패해도 나머지 응답은 사용하고 문제별로 다시 요청하지 않음
+        self.mock_llm_client.generate_structured_responses_batch_async = AsyncMock(
+            return_value=[mock_response, Exception("API 오류"), mock_response]
+        )
+        self.mock_llm_client.generate_structured_response_async = AsyncMock(return_value=mock_response)
+
+        results = asyncio.run(self.generator.generate_batch_questions_async(
+            subject="수학",
+            unit="일차함수",
+            count=3,
+            difficulty="medium"
+        ))
+
+        assert len(results) == 2
+        assert len(self.generator.question_history) == 2
+        call_kwargs = self.mock_llm_client.generate_structured_responses_batch_async.call_args.kwargs
+        assert call_kwargs["return_exceptions"] is True
+        self.mock_llm_client.generate_structured_response_async.assert_not_awaited()
+
+    def test_generate_batch_questions_async_single_batch_call(self):
+        """비동기 배치 생성 시 프롬프트를 모아 배치 호출 1회로 요청하는지 테스트"""
+        self.mock_llm_client.model_name = "gpt-5-mini"
+        self.mock_retriever.retrieve_documents.return_value = ["테스트 문서"]
+        self.mock_retriever.format_context.return_value = "테스트 컨텍스트"
+
+        mock_response = {
+            "title": "기울기 구하기",
+            "description": "일차함수의 기울기를 묻는 문제",
+            "content": "일차함수 y = 2x + 3에서 기울기는?",
+            "options": ["1", "2", "3", "4", "5"],
+            "correct_answer": 2,
+            "explanation": "y = ax + b에서 a가 기울기입니다.",
+            "hints": ["y = ax + b 형태를 떠올려 보세요."],
+            "tags": ["일차함수"]
+        }
+
+        self.mock_llm_client.generate_structured_responses_batch_async = AsyncMock(
+            return_value=[mock_response, mock_response, mock_response]
+        )
+        self.mock_llm_client.generate_structured_response_async = AsyncMock()
+
+        results = asyncio.run(self.generator.generate_batch_questions_async(
+            subject="수학",
+            unit="일차함수",
+            count=3,
+            difficulty="medium"
+        ))
+
+        assert len(results) == 3
+        self.mock_llm_client.generate_structured_responses_batch_async.assert_awaited_once()
+        prompts = self.mock_llm_client.generate_structured_responses_batch_async.call_args.kwargs["prompts"]
+        assert len(prompts) == 3
+        self.mock_llm_client.generate_structured_response_async.assert_not_awaited()
+
+    def test_generate_batch_questions_fused(self):
+        """배치 LLM 호출 1회로 문제를 생성하는지 테스트"""
+        self.mock_llm_client.model_name = "gpt-5-mini"
+        self.mock_retriever.retrieve_documents.return_value = ["테스트 문서"]
+        self.mock_retriever.format_context.return_value = "테스트 컨텍스트"
+
+        mock_response = {
+            "title": "기울기 구하기",
+            "description": "일차함수의 기울기를 묻는 문제",
+            "content": "일차함수 y = 2x + 3에서 기울기는?",
+            "options": ["1", "2", "3", "4", "5"],
+            "correct_answer": 2,
+            "explanation": "y = ax + b에서 a가 기울기입니다.",
+            "hints": ["y = ax + b 형태를 떠올려 보세요."],
+            "tags": ["일차함수"]
+        }
+
+        # 두 번째 응답은 선택지가 부족해 검증에서 제외되어야 함
+        invalid_response = dict(mock_response, options=["1", "2"])
+        self.mock_llm_client.generate_structured_responses_batch.return_value = [
+            mock_response, invalid_response, mock_response
+        ]
+
+        results = self.generator.generate_batch_questions(
+            subject="수학",
+            unit="일차함수",
+            count=3,
+            difficulty="medium"
+        )
+
+        assert len(results) == 2
+        self.mock_llm_client.generate_structured_responses_batch.assert_called_once()
+        prompts = self.mock_llm_client.generate_structured_responses_batch.call_args.kwargs["prompts"]
+        assert len(prompts) == 3
+        self.mock_llm_client.generate_structured_response.assert_not_called()
+        # 배치 전체에 쓸 컨텍스트는 한 번만 검색
+        self.mock_retriever.retrieve_documents.assert_called_once()
+
+    def test_prefetch_batch_contexts(self):
+        """한 번 검색한 문서를 문제별 3개씩 나누는지 테스트"""
+        docs = [Document(content=f"문서 {i}", metadata={}) for i in range(5)]
+        self.mock_retriever.retrieve_documents.return_value = docs
+        self.mock_retriever.format_context.side_effect = lambda window: [doc.content for doc in window]
+
+        contexts = self.generator._prefetch_batch_contexts("수학", "일차함수", 3)
+
+        assert contexts == [
+            ["문서 0", "문서 1", "문서 2"],
+            ["문서 3", "문서 4", "문서 0"],
+            ["문서 1", "문서 2", "문서 3"]
+        ]
+        assert self.mock_retriever.retrieve_documents.call_args.kwargs['k'] == 9
+
+    def test_generate_batch_questions_fused_skips_failed_slots(self):
+        """배치 중 한 요청이 실패해도 그 문제만 건너뛰고 다시 요청하지 않는지 테스트"""
+        self.mock_llm_client.model_name = "gpt-5-mini"
+        self.mock_retriever.retrieve_documents.return_value = ["테스트 문서"]
+        self.mock_retriever.format_context.return_value = "테스트 컨텍스트"
+
+        mock_response = {
+            "title": "기울기 구하기",
+            "description": "일차함수의 기울기를 묻는 문제",
+            "content": "일차함수 y = 2x + 3에서 기울기는?",
+            "options": ["1", "2", "3", "4", "5"],
+            "correct_answer": 2,
+            "explanation": "y = ax + b에서 a가 기울기입니다.",
+            "hints": ["y = ax + b 형태를 떠올려 보세요."],
+            "tags": ["일차함수"]
+        }
+
+        self.mock_llm_client.generate_structured_responses_batch.return_value = [
+            mock_response, ValueError("JSON 파싱 실패"), mock_response
+        ]
+        self.mock_llm_client.generate_structured_response_async = AsyncMock(return_value=mock_response)
+
+        results = self.generator.generate_batch_questions(
+            subject="수학",
+            unit="일차함수",
+            count=3,
+            difficulty="medium"
+        )
+
+        assert len(results) == 2
+        assert self.mock_llm_client.generate_structured_responses_batch.call_args.kwargs["return_exceptions"] is True
+        self.mock_llm_client.generate_structured_responses_batch.assert_called_once()
+        self.mock_retriever.retrieve_documents.assert_called_once()
+        self.mock_llm_client.generate_structured_response_async.assert_not_awaited()
+        self.mock_llm_client.generate_structured_response.assert_not_called()
+
     def test_validate_question_valid(self):
         """유효한 문제 검증 테스트"""
         valid_question = {
@@ -275,6 +437,10 @@ class TestQuestionGenerator:
         assert stats['by_difficulty'] == {}
         assert stats['by_unit'] == {}
 
+    def test_empty_statistics_matches_get_question_statistics(self):
+        """empty_statistics가 빈 생성기의 통계와 같은지 테스트"""
+        assert QuestionGenerator.empty_statistics() == self.generator.get_question_statistics()
+
     def test_get_question_statistics_with_data(self):
         """데이터가 있는 히스토리 통계 테스트"""
         # 테스트 문제들을 히스토리에 추가
@@ -299,7 +465,8 @@ class TestQuestionGenerator:
             }
         ]
 
-        self.generator.question_history = test_questions
+        for question in test_questions:
+            self.generator._add_to_history(question)
 
         stats = self.generator.get_question_statistics()
 
@@ -348,6 +515,128 @@ class TestQuestionGenerator:
         assert "generated_at" in cleaned
         assert "id" in cleaned
 
+    def test_validate_and_clean_question_rejects_malformed(self):
+        """본문이나 선택지 5개가 없는 응답은 변환 전에 거부하는지 테스트"""
+        with pytest.raises(ValueError):
+            self.generator._validate_and_clean_question(
+                {"content": "일차함수의 기울기는?", "options": ["1", "2"]}, "수학", "일차함수", "medium"
+            )
+        with pytest.raises(ValueError):
+            self.generator._validate_and_clean_question(
+                {"content": "  ", "options": ["1", "2", "3", "4", "5"]}, "수학", "일차함수", "medium"
+            )
+
+        # 거부된 응답은 생성 ID를 소비하지 않음
+        assert next(self.generator._generation_ids) == 1
+
+    def test_validate_and_clean_question_single_pass(self):
+        """정리된 문제는 validate_question 기준을 통과하고, 빈 해설은 거부하는지 테스트"""
+        self.mock_llm_client.model_name = "gpt-5-mini"
+        response = {
+            "title": "  ",
+            "description": "일차함수의 기울기를 묻는 문제",
+            "content": "  일차함수 y = 2x + 3에서 기울기는?  ",
+            "options": [1, " 2 ", "3", "4", "5"],
+            "correct_answer": 7,
+            "explanation": "y = ax + b에서 a가 기울기입니다.",
+            "hints": ["y = ax + b 형태를 떠올려 보세요."],
+            "tags": ["일차함수"]
+        }
+
+        cleaned = self.generator._validate_and_clean_question(response, "수학", "일차함수", "medium")
+
+        assert self.generator.validate_question(cleaned)
+        assert cleaned["title"] == "일차함수 y = 2x + 3에서 기울기는?"
+        assert cleaned["options"] == ["1", "2", "3", "4", "5"]
+        assert cleaned["correctAnswer"] == "1"
+
+        with pytest.raises(ValueError):
+            self.generator._validate_and_clean_question(
+                dict(response, explanation=" "), "수학", "일차함수", "medium"
+            )
+
+    def test_clean_question_unicode_digit_answer(self):
+        """정답이 '²' 같은 유니코드 숫자여도 예외 없이 1번으로 대체하는지 테스트"""
+        self.mock_llm_client.model_name = "gpt-5-mini"
+        response = {
+            "title": "기울기 구하기",
+            "description": "일차함수의 기울기를 묻는 문제",
+            "content": "일차함수 y = 2x + 3에서 기울기는?",
+            "options": ["1", "2", "3", "4", "5"],
+            "correct_answer": 2,
+            "explanation": "y = ax + b에서 a가 기울기입니다.",
+            "hints": ["y = ax + b 형태를 떠올려 보세요."],
+            "tags": ["일차함수"]
+        }
+
+        questions = self.generator._finalize_batch_responses(
+            [response, dict(response, correct_answer="²")], "수학", "일차함수", 2, "medium"
+        )
+
+        assert len(questions) == 2
+        assert questions[1]["correctAnswer"] == "1"
+        assert not self.generator.validate_question(dict(questions[0], correctAnswer="²"))
+
+    def test_generate_batch_questions_skips_invalid_without_raising(self):
+        """순차 배치 생성 시 검증 실패는 예외 없이 실패로 집계하고 건너뛰는지 테스트"""
+        self.mock_llm_client.model_name = "gpt-5-mini"
+        self.mock_retriever.retrieve_documents.return_value = [Document(content="테스트 문서", metadata={})]
+        self.mock_retriever.format_context.return_value = "테스트 컨텍스트"
+
+        valid_response = {
+            "title": "기울기 구하기",
+            "description": "일차함수의 기울기를 묻는 문제",
+            "content": "일차함수 y = 2x + 3에서 기울기는?",
+            "options": ["1", "2", "3", "4", "5"],
+            "correct_answer": 2,
+            "explanation": "y = ax + b에서 a가 기울기입니다.",
+            "hints": ["y = ax + b 형태를 떠올려 보세요."],
+            "tags": ["일차함수"]
+        }
+        self.mock_llm_client.generate_structured_response.side_effect = [
+            valid_response, ["JSON 객체가 아닌 응답"], dict(valid_response, explanation=None)
+        ]
+
+        async def run_in_loop():
+            # 실행 중인 이벤트 루프 안에서는 순차 생성 경로를 사용
+            return self.generator.generate_batch_questions("수학", "일차함수", count=3)
+
+        # 문제 캐시를 쓰면 배치 호출 대신 문제별 요청 경로를 사용 (캐시는 항상 미스)
+        self.generator.question_cache = MagicMock()
+        self.generator.question_cache.get.return_value = None
+        with patch.object(self.generator, '_finalize_question', side_effect=AssertionError):
+            results = asyncio.run(run_in_loop())
+
+        assert len(results) == 1
+        assert len(self.generator.question_history) == 1
+
+    def test_concurrent_generation_ids_unique(self):
+        """여러 스레드에서 동시에 문제를 정리해도 ID와 통계가 일관적인지 테스트"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.mock_llm_client.model_name = "gpt-5-mini"
+        response = {
+            "title": "기울기 구하기",
+            "description": "일차함수의 기울기를 묻는 문제",
+            "content": "일차함수 y = 2x + 3에서 기울기는?",
+            "options": ["1", "2", "3", "4", "5"],
+            "correct_answer": 2,
+            "explanation": "y = ax + b에서 a가 기울기입니다.",
+            "hints": ["y = ax + b 형태를 떠올려 보세요."],
+            "tags": ["일차함수"]
+        }
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            questions = list(executor.map(
+                lambda _: self.generator._finalize_question(response, "수학", "일차함수", "medium"),
+                range(200)
+            ))
+
+        assert len({q['aiGenerationId'] for q in questions}) == 200
+        stats = self.generator.get_question_statistics()
+        assert stats['total_questions'] == 200
+        assert stats['by_subject'] == {"수학": 200}
+
     def test_generate_varied_query(self):
         """다양한 쿼리 생성 테스트"""
         query1 = self.generator._generate_varied_query("수학", "일차함수", 0)
@@ -358,6 +647,89 @@ class TestQuestionGenerator:
         assert "수학" in query2 and "일차함수" in query2
         assert query1 != query2  # 다른 쿼리가 생성되어야 함
 
+    def test_context_cache(self):
+        """같은 검색 쿼리의 컨텍스트 재사용 및 캐시 초기화 테스트"""
+        self.mock_retriever.retrieve_documents.return_value = ["테스트 문서"]
+        self.mock_retriever.format_context.return_value = "테스트 컨텍스트"
+
+        first = self.generator._prepare_question_prompt("수학", "일차함수", "medium", "수학 일차함수 개념")
+        second = self.generator._prepare_question_prompt("수학", "일차함수", "hard", "수학 일차함수 개념")
+
+        assert "테스트 컨텍스트" in first and "테스트 컨텍스트" in second
+        self.mock_retriever.retrieve_documents.assert_called_once()
+
+        self.generator.clear_context_cache()
+        self.generator._prepare_question_prompt("수학", "일차함수", "medium", "수학 일차함수 개념")
+
+        assert self.mock_retriever.retrieve_documents.call_count == 2
+
+    def test_question_cache_requires_same_sources(self):
+        """근거 문서가 같을 때만 캐시된 문제를 재사용하는지 테스트"""
+        generator = QuestionGenerator(
+            llm_client=self.mock_llm_client,
+            retriever=self.mock_retriever,
+            question_cache=True
+        )
+        self.mock_llm_client.model_name = "gpt-5-mini"
+        self.mock_retriever.embeddings_manager = Mock()
+        self.mock_retriever.embeddings_manager.generate_single_embedding.return_value = [1.0, 0.0]
+        self.mock_retriever.format_context.return_value = "테스트 컨텍스트"
+        self.mock_llm_client.generate_structured_response.return_value = {
+            "title": "기울기 구하기",
+            "description": "일차함수의 기울기를 묻는 문제",
+            "content": "일차함수 y = 2x + 3에서 기울기는?",
+            "options": ["1", "2", "3", "4", "5"],
+            "correct_answer": 2,
+            "explanation": "y = ax + b에서 a가 기울기입니다.",
+            "hints": ["y = ax + b 형태를 떠올려 보세요."],
+            "tags": ["일차함수"]
+        }
+
+        self.mock_retriever.retrieve_documents.return_value = [Document(content="기울기 설명", metadata={})]
+        generator.generate_question("수학", "일차함수", "medium", custom_query="수학 일차함수 개념")
+        generator.generate_question("수학", "일차함수", "medium", custom_query="수학 일차함수 개념")
+
+        assert self.mock_llm_client.generate_structured_response.call_count == 1
+        assert len(generator.question_history) == 2
+
+        # 다른 근거 문서로 만든 프롬프트는 임베딩이 같아도 재사용하지 않음
+        self.mock_retriever.retrieve_documents.return_value = [Document(content="절편 설명", metadata={})]
+        generator.generate_question("수학", "일차함수", "medium", custom_query="수학 일차함수 예제")
+
+        assert self.mock_llm_client.generate_structured_response.call_count == 2
+
+    def test_generate_batch_questions_uses_question_cache(self):
+        """문제 캐시를 쓰면 동기 배치 생성도 캐시를 조회/저장하는 문제별 경로를 사용하는지 테스트"""
+        generator = QuestionGenerator(
+            llm_client=self.mock_llm_client,
+            retriever=self.mock_retriever,
+            question_cache=True
+        )
+        self.mock_llm_client.model_name = "gpt-5-mini"
+        self.mock_retriever.embeddings_manager = Mock()
+        self.mock_retriever.embeddings_manager.generate_single_embedding.return_value = [1.0, 0.0]
+        self.mock_retriever.retrieve_documents.return_value = [Document(content="기울기 설명", metadata={})]
+        self.mock_retriever.format_context.return_value = "테스트 컨텍스트"
+        self.mock_llm_client.generate_structured_response_async = AsyncMock(return_value={
+            "title": "기울기 구하기",
+            "description": "일차함수의 기울기를 묻는 문제",
+            "content": "일차함수 y = 2x + 3에서 기울기는?",
+            "options": ["1", "2", "3", "4", "5"],
+            "correct_answer": 2,
+            "explanation": "y = ax + b에서 a가 기울기입니다.",
+            "hints": ["y = ax + b 형태를 떠올려 보세요."],
+            "tags": ["일차함수"]
+        })
+
+        first = generator.generate_batch_questions("수학", "일차함수", count=2)
+        calls_after_first = self.mock_llm_client.generate_structured_response_async.await_count
+        second = generator.generate_batch_questions("수학", "일차함수", count=2)
+
+        assert len(first) == len(second) == 2
+        self.mock_llm_client.generate_structured_responses_batch.assert_not_called()
+        # 두 번째 배치는 모두 캐시에서 재사용
+        assert self.mock_llm_client.generate_structured_response_async.await_count == calls_after_first
+
     def test_add_to_history(self):
         """히스토리 추가 테스트"""
         question = {
@@ -383,6 +755,20 @@ class TestQuestionGenerator:
         # 가장 오래된 것이 제거되고 최근 1000개만 남아야 함
         assert self.generator.question_history[0]["id"] == 1
 
+    def test_statistics_after_eviction(self):
+        """히스토리에서 제거된 문제가 통계에서도 빠지는지 테스트"""
+        self.generator._add_to_history({"subject": "과학", "difficulty": "hard", "unit": "광합성", "createdAt": "t0"})
+        for i in range(1000):
+            self.generator._add_to_history({"subject": "수학", "difficulty": "easy", "unit": "일차함수", "createdAt": f"t{i + 1}"})
+
+        stats = self.generator.get_question_statistics()
+
+        assert stats['total_questions'] == 1000
+        assert stats['by_subject'] == {"수학": 1000}
+        assert stats['by_difficulty'] == {"easy": 1000}
+        assert stats['generation_times'][0] == "t1"
+        assert len(stats['generation_times']) == 1000
+
     def test_generate_question_with_hint(self):
         """hint 필드가 포함된 문제 생성 테스트"""
         # Mock 설정
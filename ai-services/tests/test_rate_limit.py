@@ -0,0 +1,48 @@
+from unittest.mock import patch
+
+from src.utils.rate_limit import RateLimiter
+
+
+class TestRateLimiter:
+    """RateLimiter 테스트 클래스"""
+
+    def setup_method(self):
+        """각 테스트 메서드 실행 전 초기화"""
+        self.now = 1000.0
+        self.time_patcher = patch('src.utils.rate_limit.time')
+        mock_time = self.time_patcher.start()
+        mock_time.monotonic.side_effect = lambda: self.now
+        self.mock_sleep = mock_time.sleep
+
+    def teardown_method(self):
+        """각 테스트 메서드 실행 후 정리"""
+        self.time_patcher.stop()
+
+    def test_no_wait_within_limits(self):
+        """한도 안의 요청은 대기 없이 통과하는지 테스트"""
+        limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=6000)
+
+        waits = [limiter.acquire(tokens=100) for _ in range(60)]
+
+        assert waits == [0.0] * 60
+        self.mock_sleep.assert_not_called()
+
+    def test_waits_when_request_limit_exceeded(self):
+        """분당 요청 수를 넘으면 초과분만큼 대기하는지 테스트"""
+        limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=1_000_000)
+        for _ in range(60):
+            limiter.acquire()
+
+        assert limiter.acquire() == 1.0
+        self.mock_sleep.assert_called_once_with(1.0)
+
+    def test_waits_when_token_limit_exceeded(self):
+        """분당 토큰 수를 넘으면 토큰 비율에 맞춰 대기하는지 테스트"""
+        limiter = RateLimiter(requests_per_minute=3000, tokens_per_minute=6000)
+        limiter.acquire(tokens=6000)
+
+        assert limiter.acquire(tokens=300) == 3.0
+
+        # 시간이 지나면 다시 바로 통과
+        self.now += 120.0
+        assert limiter.acquire(tokens=300) == 0.0
@@ -0,0 +1,78 @@
+import pytest
+from unittest.mock import patch
+
+from src.rag.document_processor import Document
+from src.rag.re_ranker import ReRanker
+
+
+class TestReRankerBackend:
+    """ReRanker 모델 실행 방식 테스트 클래스"""
+
+    @patch('src.rag.re_ranker.CrossEncoder')
+    def test_onnx_backend_loads_quantized_model(self, mock_cross_encoder):
+        """onnx 선택 시 INT8 양자화 ONNX 파일로 모델을 불러오는지 테스트"""
+        re_ranker = ReRanker(backend='onnx')
+
+        assert re_ranker.backend == 'onnx'
+        call_kwargs = mock_cross_encoder.call_args.kwargs
+        assert call_kwargs['backend'] == 'onnx'
+        assert 'int8' in call_kwargs['model_kwargs']['file_name']
+
+    @patch('src.rag.re_ranker.CrossEncoder')
+    def test_onnx_backend_falls_back_to_torch(self, mock_cross_encoder):
+        """ONNX 모델을 불러오지 못하면 PyTorch 모델로 대체하는지 테스트"""
+        mock_cross_encoder.side_effect = [ImportError("optimum is not installed"), mock_cross_encoder.return_value]
+
+        re_ranker = ReRanker(backend='onnx')
+
+        assert re_ranker.backend == 'torch'
+        assert mock_cross_encoder.call_count == 2
+        assert mock_cross_encoder.call_args.kwargs == {}
+
+    def test_unsupported_backend(self):
+        """지원하지 않는 실행 방식은 오류가 나는지 테스트"""
+        with pytest.raises(ValueError):
+            ReRanker(backend='tensorrt')
+
+
+class TestReRankerScoreCache:
+    """ReRanker 점수 캐시 테스트 클래스"""
+
+    def setup_method(self):
+        """각 테스트 메서드 실행 전 초기화"""
+        with patch('src.rag.re_ranker.CrossEncoder') as mock_cross_encoder:
+            self.re_ranker = ReRanker()
+        self.mock_model = mock_cross_encoder.return_value
+        self.mock_model.predict.side_effect = lambda pairs: [float(len(content)) for _, content in pairs]
+
+    def test_rerank_scores_only_new_pairs(self):
+        """같은 쿼리로 다시 재순위화하면 새 문서만 모델로 계산하는지 테스트"""
+        docs = [Document(content=text, metadata={}) for text in ["가", "가나다", "가나"]]
+
+        first = self.re_ranker.rerank("기울기", docs, top_k=2)
+        second = self.re_ranker.rerank("기울기", docs + [Document(content="가나다라", metadata={})])
+
+        assert [doc.content for doc in first] == ["가나다", "가나"]
+        assert [doc.content for doc in second] == ["가나다라", "가나다", "가나", "가"]
+        assert self.mock_model.predict.call_args_list[1].args[0] == [["기울기", "가나다라"]]
+
+    def test_duplicate_contents_scored_once(self):
+        """한 번의 호출에서 내용이 같은 문서는 한 번만 계산하는지 테스트"""
+        docs = [Document(content=text, metadata={}) for text in ["가나", "가", "가나"]]
+
+        ranked = self.re_ranker.rerank("기울기", docs)
+
+        assert [doc.content for doc in ranked] == ["가나", "가나", "가"]
+        assert self.mock_model.predict.call_args.args[0] == [["기울기", "가나"], ["기울기", "가"]]
+
+    def test_top_k_keeps_input_order_for_ties(self):
+        """상위 k개만 고를 때도 점수가 같은 문서는 원래 순서를 유지하는지 테스트"""
+        docs = [Document(content=text, metadata={'rank': i})
+                for i, text in enumerate(["가", "다라", "마바", "사", "아자차"])]
+
+        ranked = self.re_ranker.rerank("기울기", docs, top_k=2)
+        ranked_all = self.re_ranker.rerank("기울기", docs)
+
+        assert [doc.metadata['rank'] for doc in ranked] == [4, 1]
+        assert [doc.metadata['rank'] for doc in ranked_all] == [4, 1, 2, 0, 3]
+        assert self.re_ranker.rerank("기울기", docs, top_k=0) == []
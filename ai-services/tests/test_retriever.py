@@ -0,0 +1,70 @@
+from unittest.mock import patch, MagicMock
+
+from src.rag.document_processor import Document, compute_content_hash
+from src.rag.retriever import RAGRetriever
+
+
+class TestRAGRetriever:
+    """RAGRetriever 테스트 클래스"""
+
+    def setup_method(self):
+        """각 테스트 메서드 실행 전 초기화"""
+        with patch('src.rag.retriever.ReRanker'):
+            self.retriever = RAGRetriever(
+                vector_store=MagicMock(),
+                embeddings_manager=MagicMock()
+            )
+
+    def test_remove_duplicates_keeps_first(self):
+        """내용이 같은 문서는 처음 나온 것만 남기는지 테스트"""
+        docs = [
+            Document(content="광합성", metadata={'rank': 0}),
+            Document(content="호흡", metadata={'rank': 1}),
+            Document(content="광합성", metadata={'rank': 2}),
+        ]
+
+        unique_docs = self.retriever._remove_duplicates(docs)
+
+        assert [doc.metadata['rank'] for doc in unique_docs] == [0, 1]
+        # 해시가 없던 문서에는 계산한 해시를 저장
+        assert docs[0].metadata['content_hash'] == compute_content_hash("광합성")
+
+    def test_remove_duplicates_uses_stored_hash(self):
+        """저장된 content_hash가 있으면 다시 계산하지 않고 사용하는지 테스트"""
+        docs = [
+            Document(content="가", metadata={'content_hash': 'same'}),
+            Document(content="나", metadata={'content_hash': 'same'}),
+        ]
+
+        with patch('src.rag.retriever.compute_content_hash') as mock_hash:
+            unique_docs = self.retriever._remove_duplicates(docs)
+
+        mock_hash.assert_not_called()
+        assert len(unique_docs) == 1
+
+    def test_retrieve_documents_reranks_unique_candidates(self):
+        """재순위화에 중복 없는 후보만 전달되는지 테스트"""
+        self.retriever.embeddings_manager.generate_single_embedding.return_value = [0.1, 0.2]
+        self.retriever.vector_store.similarity_search_by_embedding.return_value = [
+            Document(content="광합성", metadata={}),
+            Document(content="광합성", metadata={}),
+        ]
+        self.retriever.re_ranker.rerank.side_effect = lambda query, docs, top_k: docs[:top_k]
+
+        result = self.retriever.retrieve_documents("광합성", k=3)
+
+        assert len(result) == 1
+        assert len(self.retriever.re_ranker.rerank.call_args.args[1]) == 1
+
+    def test_retrieve_documents_reuses_query_embedding(self):
+        """미리 계산한 쿼리 임베딩을 주면 임베딩을 다시 요청하지 않는지 테스트"""
+        self.retriever.vector_store.similarity_search_by_embedding.return_value = [
+            Document(content="광합성", metadata={}),
+        ]
+        self.retriever.re_ranker.rerank.side_effect = lambda query, docs, top_k: docs[:top_k]
+
+        self.retriever.retrieve_documents("광합성", query_embedding=[0.3, 0.4])
+
+        self.retriever.embeddings_manager.generate_single_embedding.assert_not_called()
+        search_kwargs = self.retriever.vector_store.similarity_search_by_embedding.call_args.kwargs
+        assert search_kwargs['query_embedding'] == [0.3, 0.4]
@@ -4,6 +4,8 @@ import shutil
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
+import numpy as np
+
 from src.rag.vector_store import VectorStore
 from src.rag.document_processor import Document
 
@@ -87,6 +89,39 @@ class TestVectorStore:
         with pytest.raises(ValueError):
             self.vector_store.add_documents(documents, embeddings)
 
+    def test_add_documents_np(self):
+        """numpy 배열 임베딩 일괄 추가 테스트"""
+        embeddings = np.full((3, 1536), 0.1, dtype=np.float32)
+        embeddings[1] = 0.2
+        embeddings[2] = 0.3
+
+        success = self.vector_store.add_documents_np(
+            ids=["doc_0", "doc_1", "doc_2"],
+            embeddings=embeddings,
+            metadatas=[{"subject": "수학", "unit": "일차함수", "chunk_index": i} for i in range(3)],
+            documents=["문서 0", "문서 1", "문서 2"]
+        )
+        assert success is True
+
+        info = self.vector_store.get_collection_info()
+        assert info['total_documents'] == 3
+
+        results = self.vector_store.similarity_search_by_embedding(
+            query_embedding=[0.3] * 1536,
+            k=1
+        )
+        assert results[0].content == "문서 2"
+
+    def test_add_documents_np_shape_mismatch(self):
+        """numpy 배열 임베딩 개수 불일치 테스트"""
+        with pytest.raises(ValueError):
+            self.vector_store.add_documents_np(
+                ids=["doc_0"],
+                embeddings=np.zeros((2, 1536), dtype=np.float32),
+                metadatas=[{}],
+                documents=["문서 0"]
+            )
+
     def test_similarity_search_by_embedding(self):
         """임베딩 기반 유사도 검색 테스트"""
         # 먼저 문서 추가
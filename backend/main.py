@@ -89,7 +89,7 @@ async def generate_question_endpoint(request: QuestionRequest) -> List[Dict[str,
     try:
         logger.info(f"Received request to generate {request.count} question(s) for {request.subject} - {request.unit}")
         
-        questions = pipeline.generate_questions(
+        questions = await pipeline.generate_questions_async(
             subject=request.subject,
             unit=request.unit,
             difficulty=request.difficulty,